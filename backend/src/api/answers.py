@@ -1,21 +1,20 @@
 """Answer submission routes — Career DNA and Company DNA."""
 
 import json
-import uuid
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import TypeAdapter
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_storage
 from src.models.questionnaire import Answer, SubmitAnswersRequest
-from src.models.dna_score import DNAScoreResponse, DimensionScores
+from src.models.dna_score import DNAScoreResponse, DimensionScores, encode_dna
 from src.services.scoring import calculate_career_dna
 from src.services.company_scoring import calculate_company_dna
 from src.services.aggregation import aggregate_company_scores
 from src.services.cas import calculate_cas
+from src.services.dna_cache import dna_cache, get_dna
+from src.services.incremental import enqueue_rescore
+from src.repositories.base import Storage
 
 _answer_list_adapter = TypeAdapter(list[Answer])
 
@@ -28,45 +27,27 @@ def _scores_to_json(scores: DimensionScores) -> str:
 
 
 async def _save_dna_score(
-    db: aiosqlite.Connection,
+    storage: Storage,
     entity_type: str,
     entity_id: str,
     scores: DimensionScores,
     consistency: float,
 ) -> None:
     """Upsert a DNA score record — replace if the entity already has one."""
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    # Delete existing score for this entity to keep only the latest
-    await db.execute(
-        "DELETE FROM dna_scores WHERE entity_type = ? AND entity_id = ?",
-        (entity_type, entity_id),
-    )
-    await db.execute(
-        """
-        INSERT INTO dna_scores (id, entity_type, entity_id, scores, consistency, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (str(uuid.uuid4()), entity_type, entity_id, _scores_to_json(scores), consistency, now),
+    await storage.save_dna_score(
+        entity_type, entity_id, _scores_to_json(scores), encode_dna(scores),
+        consistency,
     )
+    dna_cache.invalidate(entity_type, entity_id)
 
 
 async def _update_company_aggregate(
-    db: aiosqlite.Connection,
+    storage: Storage,
     company_id: str,
 ) -> None:
     """Re-aggregate company DNA from all respondents and update CAS."""
     # Fetch all individual company_answers for this company
-    cursor = await db.execute(
-        """
-        SELECT ca.answers, u.role
-        FROM company_answers ca
-        JOIN users u ON u.id = ca.user_id
-        WHERE ca.company_id = ?
-        """,
-        (company_id,),
-    )
-    rows = await cursor.fetchall()
+    rows = await storage.list_company_answers(company_id)
 
     if not rows:
         return
@@ -95,35 +76,27 @@ async def _update_company_aggregate(
     cas_result = calculate_cas(hr_scores, employee_scores)
 
     # Save aggregated company score (consistency = CAS / 100)
-    await _save_dna_score(db, "company", company_id, aggregated, cas_result.score / 100.0)
-    await db.commit()
+    await _save_dna_score(storage, "company", company_id, aggregated, cas_result.score / 100.0)
+    enqueue_rescore("company", company_id)
 
 
 @router.post("/career-dna", response_model=DNAScoreResponse)
 async def submit_career_dna(
     body: SubmitAnswersRequest,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Submit Career DNA answers and receive computed scores."""
     # Calculate scores
     scores, consistency = calculate_career_dna(body.answers)
 
-    now = datetime.now(tz=timezone.utc).isoformat()
-
     # Save raw answers
     answers_json = json.dumps([a.model_dump() for a in body.answers])
-    await db.execute(
-        """
-        INSERT INTO career_answers (id, user_id, answers, created_at)
-        VALUES (?, ?, ?, ?)
-        """,
-        (str(uuid.uuid4()), user_id, answers_json, now),
-    )
+    await storage.add_career_answers(user_id, answers_json)
 
     # Save DNA score
-    await _save_dna_score(db, "candidate", user_id, scores, consistency)
-    await db.commit()
+    await _save_dna_score(storage, "candidate", user_id, scores, consistency)
+    enqueue_rescore("candidate", user_id)
 
     return DNAScoreResponse(
         entity_type="candidate",
@@ -137,14 +110,11 @@ async def submit_career_dna(
 async def submit_company_dna(
     body: SubmitAnswersRequest,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Submit Company DNA answers and receive computed scores."""
     # Verify user is HR and has a company
-    cursor = await db.execute(
-        "SELECT role, company_id FROM users WHERE id = ?", (user_id,)
-    )
-    user_row = await cursor.fetchone()
+    user_row = await storage.get_user(user_id)
 
     if not user_row or user_row["role"] != "hr":
         raise HTTPException(
@@ -162,36 +132,22 @@ async def submit_company_dna(
     # Calculate individual scores
     individual_scores = calculate_company_dna(body.answers)
 
-    now = datetime.now(tz=timezone.utc).isoformat()
-
     # Save raw answers
     answers_json = json.dumps([a.model_dump() for a in body.answers])
-    await db.execute(
-        """
-        INSERT INTO company_answers (id, user_id, company_id, answers, created_at)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (str(uuid.uuid4()), user_id, company_id, answers_json, now),
-    )
-    await db.commit()
+    await storage.add_company_answers(user_id, company_id, answers_json)
 
     # Re-aggregate company scores (handles CAS too)
-    await _update_company_aggregate(db, company_id)
+    await _update_company_aggregate(storage, company_id)
 
     # Fetch updated company score for response
-    cursor = await db.execute(
-        "SELECT scores, consistency FROM dna_scores WHERE entity_type = 'company' AND entity_id = ?",
-        (company_id,),
-    )
-    score_row = await cursor.fetchone()
+    dna = await get_dna(storage, "company", company_id)
 
-    if score_row:
-        aggregated = DimensionScores.model_validate_json(score_row["scores"])
+    if dna:
         return DNAScoreResponse(
             entity_type="company",
             entity_id=company_id,
-            scores=aggregated,
-            consistency=score_row["consistency"],
+            scores=dna.scores,
+            consistency=dna.consistency,
         )
 
     # Fallback: return individual scores
@@ -1,22 +1,20 @@
 """Authentication routes — register, login, current user."""
 
-import uuid
 from datetime import datetime, timezone, timedelta
 
 import bcrypt as _bcrypt
 from fastapi import APIRouter, Depends, HTTPException, status
 from jose import jwt
 
-import aiosqlite
-
 from src.core.config import settings
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_storage
 from src.models.user import (
     TokenResponse,
     UserCreate,
     UserLogin,
     UserResponse,
 )
+from src.repositories.base import Storage
 
 router = APIRouter()
 
@@ -30,7 +28,7 @@ def _create_token(user_id: str) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def _user_response(row: aiosqlite.Row) -> UserResponse:
+def _user_response(row: dict) -> UserResponse:
     """Build a UserResponse from a database row."""
     return UserResponse(
         id=row["id"],
@@ -42,34 +40,22 @@ def _user_response(row: aiosqlite.Row) -> UserResponse:
 
 
 @router.post("/register", response_model=TokenResponse)
-async def register(body: UserCreate, db: aiosqlite.Connection = Depends(get_db)):
+async def register(body: UserCreate, storage: Storage = Depends(get_storage)):
     """Register a new candidate or HR user."""
     # Check duplicate email
-    cursor = await db.execute(
-        "SELECT id FROM users WHERE email = ?", (body.email,)
-    )
-    if await cursor.fetchone():
+    if await storage.get_user_by_email(body.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
 
-    user_id = str(uuid.uuid4())
     password_hash = _bcrypt.hashpw(body.password.encode(), _bcrypt.gensalt()).decode()
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    await db.execute(
-        """
-        INSERT INTO users (id, email, name, role, password_hash, company_id, created_at)
-        VALUES (?, ?, ?, ?, ?, NULL, ?)
-        """,
-        (user_id, body.email, body.name, body.role.value, password_hash, now),
+    user_id = await storage.create_user(
+        body.email, body.name, body.role.value, password_hash,
     )
-    await db.commit()
 
     # Fetch back for response
-    cursor = await db.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-    row = await cursor.fetchone()
+    row = await storage.get_user(user_id)
 
     return TokenResponse(
         access_token=_create_token(user_id),
@@ -78,12 +64,9 @@ async def register(body: UserCreate, db: aiosqlite.Connection = Depends(get_db))
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(body: UserLogin, db: aiosqlite.Connection = Depends(get_db)):
+async def login(body: UserLogin, storage: Storage = Depends(get_storage)):
     """Authenticate and return a JWT token."""
-    cursor = await db.execute(
-        "SELECT * FROM users WHERE email = ?", (body.email,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_user_by_email(body.email)
 
     if not row or not _bcrypt.checkpw(body.password.encode(), row["password_hash"].encode()):
         raise HTTPException(
@@ -100,11 +83,10 @@ async def login(body: UserLogin, db: aiosqlite.Connection = Depends(get_db)):
 @router.get("/me", response_model=UserResponse)
 async def me(
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Return the currently authenticated user's profile."""
-    cursor = await db.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-    row = await cursor.fetchone()
+    row = await storage.get_user(user_id)
 
     if not row:
         raise HTTPException(
@@ -1,16 +1,20 @@
 """Chat routes — AI conversational profiling."""
 
+import asyncio
 import json
-import uuid
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from openai import OpenAIError
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_llm, get_storage
+from src.core.llm import LLMClient
 from src.models.chat import ChatHistoryResponse, ChatMessageRequest, ChatMessageResponse
-from src.services.chat_service import chat_completion
+from src.repositories.base import Storage
+from src.services.chat_context import ChatContext, load_context, refresh_summary
+from src.services.chat_service import ChatReply, chat_completion, stream_chat_completion
 
 router = APIRouter()
 
@@ -18,71 +22,90 @@ router = APIRouter()
 @router.post("/profile", response_model=ChatMessageResponse)
 async def send_message(
     body: ChatMessageRequest,
+    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
+    llm: LLMClient | None = Depends(get_llm),
 ):
     """Send a message and get AI response with entity extraction."""
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    # Save user message
-    user_msg_id = str(uuid.uuid4())
-    await db.execute(
-        """INSERT INTO chat_messages (id, user_id, role, content, created_at)
-           VALUES (?, ?, 'user', ?, ?)""",
-        (user_msg_id, user_id, body.content, now),
-    )
-
-    # Build conversation history
-    cursor = await db.execute(
-        """SELECT role, content FROM chat_messages
-           WHERE user_id = ? ORDER BY created_at ASC""",
-        (user_id,),
-    )
-    rows = await cursor.fetchall()
-    messages = [{"role": r["role"], "content": r["content"]} for r in rows]
+    context = await _add_user_message(storage, user_id, body.content)
 
     # Get AI response
-    response_text, entities = await chat_completion(messages)
-
-    # Save assistant message
-    assistant_msg_id = str(uuid.uuid4())
-    now2 = datetime.now(tz=timezone.utc).isoformat()
-    await db.execute(
-        """INSERT INTO chat_messages
-           (id, user_id, role, content, extracted_entities, created_at)
-           VALUES (?, ?, 'assistant', ?, ?, ?)""",
-        (assistant_msg_id, user_id, response_text,
-         json.dumps(entities) if entities else None, now2),
+    response_text, entities = await chat_completion(
+        context.messages, llm, context.summary,
     )
 
-    # Update profile with extracted entities
-    if entities and "entities" in entities:
-        await _merge_entities_to_profile(db, user_id, entities["entities"])
+    saved = await _save_reply(storage, user_id, response_text, entities)
+    if llm and context.fold_due:
+        background_tasks.add_task(refresh_summary, storage, llm, user_id, context)
+    return saved
 
-    await db.commit()
 
-    return ChatMessageResponse(
-        id=assistant_msg_id,
-        user_id=user_id,
-        role="assistant",
-        content=response_text,
-        extracted_entities=entities,
-        created_at=now2,
+@router.post("/profile/stream")
+async def stream_message(
+    body: ChatMessageRequest,
+    user_id: str = Depends(get_current_user_id),
+    storage: Storage = Depends(get_storage),
+    llm: LLMClient | None = Depends(get_llm),
+):
+    """Send a message and stream the AI response as Server-Sent Events.
+
+    ``delta`` events carry the visible reply as it is generated
+    (``{"content": ...}``; the entity block is never sent). Once the reply
+    is complete it is saved and its entities merged, and a ``done`` event
+    carries the saved ``ChatMessageResponse`` — its ``content`` is the final
+    text. A failed completion ends the stream with an ``error`` event. A
+    reply cut short by an error or a client disconnect is saved with the
+    text shown so far, so the user's message is not left unanswered.
+    """
+    context = await _add_user_message(storage, user_id, body.content)
+    background_tasks = BackgroundTasks()
+    if llm and context.fold_due:
+        background_tasks.add_task(refresh_summary, storage, llm, user_id, context)
+
+    async def events() -> AsyncIterator[str]:
+        reply = ChatReply()
+        complete = False
+        try:
+            async for delta in stream_chat_completion(
+                context.messages, llm, reply, context.summary,
+            ):
+                yield _sse("delta", {"content": delta})
+            complete = True
+        except OpenAIError as exc:
+            logger.warning("Chat stream for user {} failed: {}", user_id, exc)
+            yield _sse("error", {"detail": "AI response failed"})
+        finally:
+            if complete:
+                response_text, entities = reply.result()
+            else:
+                # Cut short by an error or a disconnect: keep what was shown
+                response_text, entities = reply.received(), None
+            if complete or response_text:
+                # Shielded: a disconnect cancels this generator, not the save
+                saved = await asyncio.shield(
+                    _save_reply(storage, user_id, response_text, entities)
+                )
+
+        if complete:
+            yield _sse("done", saved.model_dump(mode="json"))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # No caching, and no buffering in the nginx proxy
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=background_tasks,
     )
 
 
 @router.get("/history", response_model=ChatHistoryResponse)
 async def get_chat_history(
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Get all chat messages for the current user."""
-    cursor = await db.execute(
-        """SELECT id, user_id, role, content, extracted_entities, created_at
-           FROM chat_messages WHERE user_id = ? ORDER BY created_at ASC""",
-        (user_id,),
-    )
-    rows = await cursor.fetchall()
+    rows = await storage.list_chat_messages(user_id)
 
     messages = [
         ChatMessageResponse(
@@ -101,34 +124,48 @@ async def get_chat_history(
     return ChatHistoryResponse(messages=messages, total=len(messages))
 
 
-async def _merge_entities_to_profile(
-    db: aiosqlite.Connection,
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _add_user_message(
+    storage: Storage,
     user_id: str,
-    entities: dict,
-) -> None:
-    """Merge extracted entities into the user's profile."""
-    now = datetime.now(tz=timezone.utc).isoformat()
+    content: str,
+) -> ChatContext:
+    """Save the user's message; return the context to send to the model.
+
+    Only the rolling summary and the messages it does not cover yet are
+    loaded — the summary itself is refreshed after the reply
+    (``refresh_summary``).
+    """
+    await storage.add_chat_message(user_id, "user", content)
+    return await load_context(storage, user_id)
 
-    cursor = await db.execute(
-        "SELECT id, skills FROM user_profiles WHERE user_id = ?", (user_id,)
+
+async def _save_reply(
+    storage: Storage,
+    user_id: str,
+    response_text: str,
+    entities: dict | None,
+) -> ChatMessageResponse:
+    """Save the assistant's reply and merge its entities into the profile."""
+    assistant_msg_id, now = await storage.add_chat_message(
+        user_id, "assistant", response_text,
+        json.dumps(entities) if entities else None,
+    )
+
+    # Update profile with extracted skills
+    if entities and "entities" in entities:
+        new_skills = entities["entities"].get("skills", [])
+        if new_skills:
+            await storage.save_profile(user_id, {}, add_skills=new_skills)
+
+    return ChatMessageResponse(
+        id=assistant_msg_id,
+        user_id=user_id,
+        role="assistant",
+        content=response_text,
+        extracted_entities=entities,
+        created_at=now,
     )
-    row = await cursor.fetchone()
-
-    new_skills = entities.get("skills", [])
-    if not new_skills:
-        return
-
-    if row:
-        existing_skills = json.loads(row["skills"]) if row["skills"] else []
-        merged = list(set(existing_skills + new_skills))
-        await db.execute(
-            "UPDATE user_profiles SET skills = ?, updated_at = ? WHERE user_id = ?",
-            (json.dumps(merged), now, user_id),
-        )
-    else:
-        profile_id = str(uuid.uuid4())
-        await db.execute(
-            """INSERT INTO user_profiles (id, user_id, skills, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?)""",
-            (profile_id, user_id, json.dumps(new_skills), now, now),
-        )
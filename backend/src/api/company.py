@@ -1,16 +1,12 @@
 """Company management routes — create, invite employees, query CAS."""
 
 import json
-import uuid
-from datetime import datetime, timezone
 
 import bcrypt as _bcrypt
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import TypeAdapter
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_storage
 from src.models.company import (
     CASResponse,
     CompanyCreate,
@@ -20,6 +16,7 @@ from src.models.company import (
 from src.models.dna_score import DimensionScores
 from src.models.match import CompanyMatchResponse, MatchStatus
 from src.models.questionnaire import Answer
+from src.repositories.base import Storage
 from src.services.company_scoring import calculate_company_dna
 from src.services.cas import calculate_cas
 
@@ -32,14 +29,11 @@ _answer_list_adapter = TypeAdapter(list[Answer])
 async def create_company(
     body: CompanyCreate,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Create a new company profile (HR only)."""
     # Verify role
-    cursor = await db.execute(
-        "SELECT role, company_id FROM users WHERE id = ?", (user_id,)
-    )
-    user_row = await cursor.fetchone()
+    user_row = await storage.get_user(user_id)
 
     if not user_row or user_row["role"] != "hr":
         raise HTTPException(
@@ -52,24 +46,11 @@ async def create_company(
             detail="User already belongs to a company",
         )
 
-    company_id = str(uuid.uuid4())
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    await db.execute(
-        """
-        INSERT INTO companies (id, name, industry, size, created_at)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (company_id, body.name, body.industry, body.size, now),
+    # Creates the company and links the user to it
+    company_id = await storage.create_company(
+        body.name, body.industry, body.size, user_id,
     )
 
-    # Link user to company
-    await db.execute(
-        "UPDATE users SET company_id = ? WHERE id = ?",
-        (company_id, user_id),
-    )
-    await db.commit()
-
     return CompanyResponse(
         id=company_id,
         name=body.name,
@@ -83,17 +64,14 @@ async def invite_employee(
     company_id: str,
     body: InviteRequest,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Invite an employee to fill the Company DNA survey.
 
     Demo simplification: creates a user account directly (no email).
     """
     # Verify caller is HR for this company
-    cursor = await db.execute(
-        "SELECT role, company_id FROM users WHERE id = ?", (user_id,)
-    )
-    user_row = await cursor.fetchone()
+    user_row = await storage.get_user(user_id)
 
     if not user_row or user_row["role"] != "hr" or user_row["company_id"] != company_id:
         raise HTTPException(
@@ -102,28 +80,17 @@ async def invite_employee(
         )
 
     # Check if email already exists
-    cursor = await db.execute(
-        "SELECT id FROM users WHERE email = ?", (body.email,)
-    )
-    if await cursor.fetchone():
+    if await storage.get_user_by_email(body.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
 
     # Create employee account with a default password
-    new_user_id = str(uuid.uuid4())
-    now = datetime.now(tz=timezone.utc).isoformat()
     default_password = _bcrypt.hashpw(b"welcome123", _bcrypt.gensalt()).decode()
-
-    await db.execute(
-        """
-        INSERT INTO users (id, email, name, role, password_hash, company_id, created_at)
-        VALUES (?, ?, ?, 'hr', ?, ?, ?)
-        """,
-        (new_user_id, body.email, body.name, default_password, company_id, now),
+    new_user_id = await storage.create_user(
+        body.email, body.name, "hr", default_password, company_id,
     )
-    await db.commit()
 
     return {
         "user_id": new_user_id,
@@ -135,13 +102,10 @@ async def invite_employee(
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(
     company_id: str,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Retrieve a company's public profile."""
-    cursor = await db.execute(
-        "SELECT * FROM companies WHERE id = ?", (company_id,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_company(company_id)
 
     if not row:
         raise HTTPException(
@@ -160,30 +124,18 @@ async def get_company(
 @router.get("/{company_id}/cas", response_model=CASResponse)
 async def get_cas(
     company_id: str,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Retrieve the Culture Authenticity Score for a company."""
     # Verify company exists
-    cursor = await db.execute(
-        "SELECT id FROM companies WHERE id = ?", (company_id,)
-    )
-    if not await cursor.fetchone():
+    if not await storage.get_company(company_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Company not found",
         )
 
     # Re-derive CAS from company_answers
-    cursor = await db.execute(
-        """
-        SELECT ca.answers, u.role
-        FROM company_answers ca
-        JOIN users u ON u.id = ca.user_id
-        WHERE ca.company_id = ?
-        """,
-        (company_id,),
-    )
-    rows = await cursor.fetchall()
+    rows = await storage.list_company_answers(company_id)
 
     if not rows:
         return CASResponse(
@@ -222,14 +174,11 @@ async def get_cas(
 async def get_company_matches(
     company_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Retrieve all matches for a company, ordered by score descending."""
     # Verify caller is HR for this company
-    cursor = await db.execute(
-        "SELECT role, company_id FROM users WHERE id = ?", (user_id,)
-    )
-    user_row = await cursor.fetchone()
+    user_row = await storage.get_user(user_id)
 
     if (
         not user_row
@@ -241,18 +190,7 @@ async def get_company_matches(
             detail="Only HR of this company can view matches",
         )
 
-    cursor = await db.execute(
-        """
-        SELECT m.id, m.candidate_id, m.company_id, m.score,
-               m.dimension_scores, m.report, m.status, u.name as candidate_name
-        FROM matches m
-        JOIN users u ON u.id = m.candidate_id
-        WHERE m.company_id = ?
-        ORDER BY m.score DESC
-        """,
-        (company_id,),
-    )
-    rows = await cursor.fetchall()
+    rows = await storage.list_company_matches(company_id)
 
     return [
         CompanyMatchResponse(
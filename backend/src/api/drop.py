@@ -4,9 +4,7 @@ import json
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_storage
 from src.models.dna_score import DimensionScores
 from src.models.match import (
     CompanyDropResponse,
@@ -15,6 +13,7 @@ from src.models.match import (
     MatchResponse,
     MatchStatus,
 )
+from src.repositories.base import Storage
 from src.services.drop import (
     generate_candidate_drop,
     generate_company_drop,
@@ -68,83 +67,35 @@ def _build_company_match(match_data: dict) -> CompanyMatchResponse:
     )
 
 
-async def _enrich_candidate_matches(
-    db: aiosqlite.Connection, matches: list[dict],
-) -> list[dict]:
-    """Add company_name and role_title to each match."""
-    for match in matches:
-        cursor = await db.execute(
-            "SELECT name FROM companies WHERE id = ?",
-            (match["company_id"],),
-        )
-        row = await cursor.fetchone()
-        match["company_name"] = row["name"] if row else "Unknown"
-
-        if match.get("role_id"):
-            cursor = await db.execute(
-                "SELECT title FROM roles WHERE id = ?",
-                (match["role_id"],),
-            )
-            row = await cursor.fetchone()
-            match["role_title"] = row["title"] if row else None
-    return matches
-
-
-async def _enrich_company_matches(
-    db: aiosqlite.Connection, matches: list[dict],
-) -> list[dict]:
-    """Add candidate_name and role_title to each match."""
-    for match in matches:
-        cursor = await db.execute(
-            "SELECT name FROM users WHERE id = ?",
-            (match["candidate_id"],),
-        )
-        row = await cursor.fetchone()
-        match["candidate_name"] = row["name"] if row else "Unknown"
-
-        if match.get("role_id"):
-            cursor = await db.execute(
-                "SELECT title FROM roles WHERE id = ?",
-                (match["role_id"],),
-            )
-            row = await cursor.fetchone()
-            match["role_title"] = row["title"] if row else None
-    return matches
-
-
 @router.get("/drops/current", response_model=DropResponse)
 async def candidate_current_drop(
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Get the current week's drop for the authenticated candidate."""
-    cursor = await db.execute(
-        "SELECT role FROM users WHERE id = ?", (user_id,)
-    )
-    user_row = await cursor.fetchone()
+    user_row = await storage.get_user(user_id)
     if not user_row or user_row["role"] != "candidate":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only candidates can receive candidate drops",
         )
 
-    drop_data = await get_current_drop(db, user_id, "candidate")
+    drop_data = await get_current_drop(storage, user_id, "candidate")
 
     if not drop_data:
         try:
-            await generate_candidate_drop(db, user_id)
+            await generate_candidate_drop(storage, user_id)
         except ValueError as exc:
             raise HTTPException(status_code=404, detail=str(exc))
-        drop_data = await get_current_drop(db, user_id, "candidate")
+        drop_data = await get_current_drop(storage, user_id, "candidate")
 
     if not drop_data:
         raise HTTPException(status_code=404, detail="No matches available")
 
-    enriched = await _enrich_candidate_matches(db, drop_data["matches"])
     return DropResponse(
         id=drop_data["id"],
         week=drop_data["week"],
-        matches=[_build_match_response(m) for m in enriched],
+        matches=[_build_match_response(m) for m in drop_data["matches"]],
         revealed_at=drop_data.get("revealed_at"),
     )
 
@@ -152,13 +103,10 @@ async def candidate_current_drop(
 @router.get("/drops/company/current", response_model=CompanyDropResponse)
 async def company_current_drop(
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Get the current week's drop for the authenticated HR user's company."""
-    cursor = await db.execute(
-        "SELECT role, company_id FROM users WHERE id = ?", (user_id,)
-    )
-    user_row = await cursor.fetchone()
+    user_row = await storage.get_user(user_id)
     if not user_row or user_row["role"] != "hr" or not user_row["company_id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -166,22 +114,21 @@ async def company_current_drop(
         )
 
     company_id = user_row["company_id"]
-    drop_data = await get_current_drop(db, company_id, "company")
+    drop_data = await get_current_drop(storage, company_id, "company")
 
     if not drop_data:
         try:
-            await generate_company_drop(db, company_id)
+            await generate_company_drop(storage, company_id)
         except ValueError as exc:
             raise HTTPException(status_code=404, detail=str(exc))
-        drop_data = await get_current_drop(db, company_id, "company")
+        drop_data = await get_current_drop(storage, company_id, "company")
 
     if not drop_data:
         raise HTTPException(status_code=404, detail="No matches available")
 
-    enriched = await _enrich_company_matches(db, drop_data["matches"])
     return CompanyDropResponse(
         id=drop_data["id"],
         week=drop_data["week"],
-        matches=[_build_company_match(m) for m in enriched],
+        matches=[_build_company_match(m) for m in drop_data["matches"]],
         revealed_at=drop_data.get("revealed_at"),
     )
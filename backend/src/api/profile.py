@@ -1,20 +1,17 @@
 """User profile routes — view and update candidate profiles."""
 
 import json
-import uuid
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_storage
 from src.models.profile import ProfileResponse, ProfileUpdate
+from src.repositories.base import Storage
 
 router = APIRouter()
 
 
-def _row_to_response(row: aiosqlite.Row) -> ProfileResponse:
+def _row_to_response(row: dict) -> ProfileResponse:
     """Convert a database row to a ProfileResponse."""
     return ProfileResponse(
         id=row["id"],
@@ -39,13 +36,10 @@ def _row_to_response(row: aiosqlite.Row) -> ProfileResponse:
 @router.get("/{user_id}", response_model=ProfileResponse)
 async def get_profile(
     user_id: str,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Get a user's profile."""
-    cursor = await db.execute(
-        "SELECT * FROM user_profiles WHERE user_id = ?", (user_id,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_profile(user_id)
     if not row:
         raise HTTPException(status_code=404, detail="Profile not found")
     return _row_to_response(row)
@@ -55,71 +49,18 @@ async def get_profile(
 async def update_profile(
     body: ProfileUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Update the authenticated user's profile (upsert)."""
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    # Check if profile exists
-    cursor = await db.execute(
-        "SELECT id FROM user_profiles WHERE user_id = ?", (user_id,)
-    )
-    existing = await cursor.fetchone()
-
-    if existing:
-        updates: list[str] = []
-        values: list = []
-
-        for field, col in [
-            ("title", "title"), ("bio", "bio"),
-            ("location", "location"), ("remote_preference", "remote_preference"),
-        ]:
-            val = getattr(body, field)
-            if val is not None:
-                updates.append(f"{col} = ?")
-                values.append(val)
-
-        if body.years_experience is not None:
-            updates.append("years_experience = ?")
-            values.append(body.years_experience)
-        if body.skills is not None:
-            updates.append("skills = ?")
-            values.append(json.dumps(body.skills))
-        if body.education is not None:
-            updates.append("education = ?")
-            values.append(json.dumps(body.education))
-        if body.salary_expectation is not None:
-            updates.append("salary_expectation = ?")
-            values.append(json.dumps(body.salary_expectation))
-
-        updates.append("updated_at = ?")
-        values.append(now)
-        values.append(user_id)
-
-        await db.execute(
-            f"UPDATE user_profiles SET {', '.join(updates)} WHERE user_id = ?",
-            values,
-        )
-    else:
-        profile_id = str(uuid.uuid4())
-        await db.execute(
-            """
-            INSERT INTO user_profiles
-                (id, user_id, title, years_experience, skills, education,
-                 bio, location, remote_preference, salary_expectation,
-                 created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                profile_id, user_id,
-                body.title, body.years_experience,
-                json.dumps(body.skills) if body.skills else None,
-                json.dumps(body.education) if body.education else None,
-                body.bio, body.location, body.remote_preference,
-                json.dumps(body.salary_expectation) if body.salary_expectation else None,
-                now, now,
-            ),
-        )
-
-    await db.commit()
-    return await get_profile(user_id, db)
+    fields: dict = {}
+    for field in ("title", "years_experience", "bio", "location", "remote_preference"):
+        val = getattr(body, field)
+        if val is not None:
+            fields[field] = val
+    for field in ("skills", "education", "salary_expectation"):
+        val = getattr(body, field)
+        if val is not None:
+            fields[field] = json.dumps(val)
+
+    await storage.save_profile(user_id, fields)
+    return await get_profile(user_id, storage)
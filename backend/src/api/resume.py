@@ -1,15 +1,13 @@
 """Resume upload routes — PDF upload and AI parsing."""
 
 import json
-import uuid
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_llm, get_storage
+from src.core.llm import LLMClient
 from src.models.profile import ProfileResponse
+from src.repositories.base import Storage
 from src.services.resume_service import extract_text_from_pdf, parse_resume_text
 
 router = APIRouter()
@@ -19,7 +17,8 @@ router = APIRouter()
 async def upload_resume(
     file: UploadFile = File(...),
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
+    llm: LLMClient | None = Depends(get_llm),
 ):
     """Upload a resume file, extract text, parse with AI, update profile."""
     if not file.filename:
@@ -40,69 +39,24 @@ async def upload_resume(
         raise HTTPException(status_code=400, detail="Could not extract text from file")
 
     # Parse with AI
-    parsed = await parse_resume_text(resume_text)
-
-    # Update profile
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    cursor = await db.execute(
-        "SELECT id, skills FROM user_profiles WHERE user_id = ?", (user_id,)
+    parsed = await parse_resume_text(resume_text, llm)
+
+    # Update profile; parsed skills are merged into the existing ones
+    fields: dict = {"resume_text": resume_text[:10000]}
+    if parsed.get("title"):
+        fields["title"] = parsed["title"]
+    if parsed.get("years_experience"):
+        fields["years_experience"] = parsed["years_experience"]
+    if parsed.get("education"):
+        fields["education"] = json.dumps(parsed["education"])
+    if parsed.get("bio"):
+        fields["bio"] = parsed["bio"]
+    await storage.save_profile(
+        user_id, fields, add_skills=parsed.get("skills", []),
     )
-    existing = await cursor.fetchone()
-
-    if existing:
-        # Merge skills
-        old_skills = json.loads(existing["skills"]) if existing["skills"] else []
-        new_skills = parsed.get("skills", [])
-        merged_skills = list(set(old_skills + new_skills))
-
-        updates = ["resume_text = ?", "skills = ?", "updated_at = ?"]
-        values = [resume_text[:10000], json.dumps(merged_skills), now]
-
-        if parsed.get("title"):
-            updates.append("title = ?")
-            values.append(parsed["title"])
-        if parsed.get("years_experience"):
-            updates.append("years_experience = ?")
-            values.append(parsed["years_experience"])
-        if parsed.get("education"):
-            updates.append("education = ?")
-            values.append(json.dumps(parsed["education"]))
-        if parsed.get("bio"):
-            updates.append("bio = ?")
-            values.append(parsed["bio"])
-
-        values.append(user_id)
-        await db.execute(
-            f"UPDATE user_profiles SET {', '.join(updates)} WHERE user_id = ?",
-            values,
-        )
-    else:
-        profile_id = str(uuid.uuid4())
-        await db.execute(
-            """INSERT INTO user_profiles
-               (id, user_id, title, years_experience, skills, education,
-                bio, resume_text, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                profile_id, user_id,
-                parsed.get("title"),
-                parsed.get("years_experience"),
-                json.dumps(parsed.get("skills", [])),
-                json.dumps(parsed.get("education", [])),
-                parsed.get("bio"),
-                resume_text[:10000],
-                now, now,
-            ),
-        )
-
-    await db.commit()
 
     # Return updated profile
-    cursor = await db.execute(
-        "SELECT * FROM user_profiles WHERE user_id = ?", (user_id,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_profile(user_id)
     return ProfileResponse(
         id=row["id"],
         user_id=row["user_id"],
@@ -1,20 +1,18 @@
 """Role management routes — CRUD for open positions."""
 
 import json
-import uuid
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-import aiosqlite
-
-from src.core.deps import get_db, get_current_user_id
+from src.core.deps import get_current_user_id, get_storage
 from src.models.role import RoleCreate, RoleResponse, RoleUpdate, SalaryRange
+from src.repositories.base import Storage
+from src.services.incremental import enqueue_rescore
 
 router = APIRouter()
 
 
-def _row_to_response(row: aiosqlite.Row, company_name: str = "") -> RoleResponse:
+def _row_to_response(row: dict, company_name: str = "") -> RoleResponse:
     """Convert a database row to a RoleResponse."""
     salary = json.loads(row["salary_range"]) if row["salary_range"] else None
     return RoleResponse(
@@ -34,12 +32,9 @@ def _row_to_response(row: aiosqlite.Row, company_name: str = "") -> RoleResponse
     )
 
 
-async def _get_user_company(db: aiosqlite.Connection, user_id: str) -> str:
+async def _get_user_company(storage: Storage, user_id: str) -> str:
     """Get the company_id for an HR user, raise 403 if not HR."""
-    cursor = await db.execute(
-        "SELECT role, company_id FROM users WHERE id = ?", (user_id,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_user(user_id)
     if not row or row["role"] != "hr" or not row["company_id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -52,86 +47,48 @@ async def _get_user_company(db: aiosqlite.Connection, user_id: str) -> str:
 async def create_role(
     body: RoleCreate,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Create a new open role for the user's company."""
-    company_id = await _get_user_company(db, user_id)
-
-    role_id = str(uuid.uuid4())
-    now = datetime.now(tz=timezone.utc).isoformat()
-
-    await db.execute(
-        """
-        INSERT INTO roles (id, company_id, title, level, skills, nice_to_have,
-                          salary_range, location, remote_policy, description, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            role_id,
-            company_id,
-            body.title,
-            body.level,
-            json.dumps(body.skills),
-            json.dumps(body.nice_to_have),
-            json.dumps(body.salary_range.model_dump()) if body.salary_range else None,
-            body.location,
-            body.remote_policy,
-            body.description,
-            now,
-        ),
-    )
-    await db.commit()
-
-    # Fetch company name
-    cursor = await db.execute(
-        "SELECT name FROM companies WHERE id = ?", (company_id,)
+    company_id = await _get_user_company(storage, user_id)
+
+    role_id = await storage.create_role(
+        company_id,
+        {
+            "title": body.title,
+            "level": body.level,
+            "skills": json.dumps(body.skills),
+            "nice_to_have": json.dumps(body.nice_to_have),
+            "salary_range": (
+                json.dumps(body.salary_range.model_dump()) if body.salary_range else None
+            ),
+            "location": body.location,
+            "remote_policy": body.remote_policy,
+            "description": body.description,
+        },
     )
-    comp = await cursor.fetchone()
+    enqueue_rescore("role", role_id)
 
-    cursor = await db.execute("SELECT * FROM roles WHERE id = ?", (role_id,))
-    row = await cursor.fetchone()
-    return _row_to_response(row, comp["name"] if comp else "")
+    return await get_role(role_id, storage)
 
 
 @router.get("", response_model=list[RoleResponse])
 async def list_roles(
     company_id: str | None = None,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """List roles, optionally filtered by company."""
-    if company_id:
-        cursor = await db.execute(
-            """SELECT r.*, c.name as company_name FROM roles r
-               JOIN companies c ON c.id = r.company_id
-               WHERE r.company_id = ? AND r.is_active = 1
-               ORDER BY r.created_at DESC""",
-            (company_id,),
-        )
-    else:
-        cursor = await db.execute(
-            """SELECT r.*, c.name as company_name FROM roles r
-               JOIN companies c ON c.id = r.company_id
-               WHERE r.is_active = 1
-               ORDER BY r.created_at DESC""",
-        )
-
-    rows = await cursor.fetchall()
+    rows = await storage.list_active_roles(company_id)
     return [_row_to_response(r, r["company_name"]) for r in rows]
 
 
 @router.get("/{role_id}", response_model=RoleResponse)
 async def get_role(
     role_id: str,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Get a single role by ID."""
-    cursor = await db.execute(
-        """SELECT r.*, c.name as company_name FROM roles r
-           JOIN companies c ON c.id = r.company_id
-           WHERE r.id = ?""",
-        (role_id,),
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_role(role_id)
     if not row:
         raise HTTPException(status_code=404, detail="Role not found")
     return _row_to_response(row, row["company_name"])
@@ -142,69 +99,49 @@ async def update_role(
     role_id: str,
     body: RoleUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Update an existing role."""
-    company_id = await _get_user_company(db, user_id)
+    company_id = await _get_user_company(storage, user_id)
 
     # Verify role belongs to company
-    cursor = await db.execute(
-        "SELECT company_id FROM roles WHERE id = ?", (role_id,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_role(role_id)
     if not row or row["company_id"] != company_id:
         raise HTTPException(status_code=404, detail="Role not found")
 
-    updates: list[str] = []
-    values: list = []
-    for field, col in [
-        ("title", "title"), ("level", "level"),
-        ("location", "location"), ("remote_policy", "remote_policy"),
-        ("description", "description"),
-    ]:
+    updates: dict = {}
+    for field in ("title", "level", "location", "remote_policy", "description"):
         val = getattr(body, field)
         if val is not None:
-            updates.append(f"{col} = ?")
-            values.append(val)
+            updates[field] = val
 
     if body.skills is not None:
-        updates.append("skills = ?")
-        values.append(json.dumps(body.skills))
+        updates["skills"] = json.dumps(body.skills)
     if body.nice_to_have is not None:
-        updates.append("nice_to_have = ?")
-        values.append(json.dumps(body.nice_to_have))
+        updates["nice_to_have"] = json.dumps(body.nice_to_have)
     if body.salary_range is not None:
-        updates.append("salary_range = ?")
-        values.append(json.dumps(body.salary_range.model_dump()))
+        updates["salary_range"] = json.dumps(body.salary_range.model_dump())
     if body.is_active is not None:
-        updates.append("is_active = ?")
-        values.append(int(body.is_active))
+        updates["is_active"] = int(body.is_active)
 
+    await storage.update_role(role_id, updates)
     if updates:
-        values.append(role_id)
-        await db.execute(
-            f"UPDATE roles SET {', '.join(updates)} WHERE id = ?", values
-        )
-        await db.commit()
+        enqueue_rescore("role", role_id)
 
-    return await get_role(role_id, db)
+    return await get_role(role_id, storage)
 
 
 @router.delete("/{role_id}", status_code=204)
 async def deactivate_role(
     role_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Soft-delete a role by setting is_active = 0."""
-    company_id = await _get_user_company(db, user_id)
+    company_id = await _get_user_company(storage, user_id)
 
-    cursor = await db.execute(
-        "SELECT company_id FROM roles WHERE id = ?", (role_id,)
-    )
-    row = await cursor.fetchone()
+    row = await storage.get_role(role_id)
     if not row or row["company_id"] != company_id:
         raise HTTPException(status_code=404, detail="Role not found")
 
-    await db.execute("UPDATE roles SET is_active = 0 WHERE id = ?", (role_id,))
-    await db.commit()
+    await storage.update_role(role_id, {"is_active": 0})
@@ -1,13 +1,11 @@
 """DNA score query routes — retrieve candidate and company profiles."""
 
-import json
-
 from fastapi import APIRouter, Depends, HTTPException, status
 
-import aiosqlite
-
-from src.core.deps import get_db
-from src.models.dna_score import DNAScoreResponse, DimensionScores
+from src.core.deps import get_storage
+from src.models.dna_score import DNAScoreResponse
+from src.repositories.base import Storage
+from src.services.dna_cache import get_dna
 
 router = APIRouter()
 
@@ -15,58 +13,42 @@ router = APIRouter()
 @router.get("/candidate/{candidate_id}", response_model=DNAScoreResponse)
 async def get_candidate_score(
     candidate_id: str,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Retrieve a candidate's Career DNA score profile."""
-    cursor = await db.execute(
-        """
-        SELECT entity_type, entity_id, scores, consistency
-        FROM dna_scores
-        WHERE entity_type = 'candidate' AND entity_id = ?
-        """,
-        (candidate_id,),
-    )
-    row = await cursor.fetchone()
+    dna = await get_dna(storage, "candidate", candidate_id)
 
-    if not row:
+    if not dna:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate score not found",
         )
 
     return DNAScoreResponse(
-        entity_type=row["entity_type"],
-        entity_id=row["entity_id"],
-        scores=DimensionScores.model_validate_json(row["scores"]),
-        consistency=row["consistency"],
+        entity_type="candidate",
+        entity_id=candidate_id,
+        scores=dna.scores,
+        consistency=dna.consistency,
     )
 
 
 @router.get("/company/{company_id}", response_model=DNAScoreResponse)
 async def get_company_score(
     company_id: str,
-    db: aiosqlite.Connection = Depends(get_db),
+    storage: Storage = Depends(get_storage),
 ):
     """Retrieve a company's aggregated DNA score profile."""
-    cursor = await db.execute(
-        """
-        SELECT entity_type, entity_id, scores, consistency
-        FROM dna_scores
-        WHERE entity_type = 'company' AND entity_id = ?
-        """,
-        (company_id,),
-    )
-    row = await cursor.fetchone()
+    dna = await get_dna(storage, "company", company_id)
 
-    if not row:
+    if not dna:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Company score not found",
         )
 
     return DNAScoreResponse(
-        entity_type=row["entity_type"],
-        entity_id=row["entity_id"],
-        scores=DimensionScores.model_validate_json(row["scores"]),
-        consistency=row["consistency"],
+        entity_type="company",
+        entity_id=company_id,
+        scores=dna.scores,
+        consistency=dna.consistency,
     )
@@ -0,0 +1,88 @@
+"""Benchmark — sharded matching run scaling across worker counts.
+
+Scores a synthetic population with ``sharded_top_k`` at 1/2/4/8 workers and
+reports wall time, throughput and speed-up over one worker::
+
+    python -m src.benchmarks.sharded_matching --candidates 200000 --roles 2000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.models.dna_score import DIMENSIONS
+from src.services.sharded_matching import sharded_top_k
+
+_SKILLS = ["python", "go", "rust", "typescript", "react", "sql", "kubernetes", "ml"]
+_CITIES = ["上海", "北京", "深圳", "杭州"]
+
+
+def synthetic_population(
+    n_candidates: int,
+    n_roles: int,
+    seed: int = 0,
+) -> tuple[list[dict], list[dict], np.ndarray, np.ndarray, np.ndarray]:
+    """Random candidates / roles shaped like the matching API's inputs."""
+    rng = np.random.default_rng(seed)
+    dims = len(DIMENSIONS)
+    candidate_dna = np.round(rng.uniform(0, 100, (n_candidates, dims)), 2)
+    role_dna = np.round(rng.uniform(0, 100, (n_roles, dims)), 2)
+    consistency = np.round(rng.uniform(0.4, 1.0, n_candidates), 3)
+
+    def skills(count: int) -> list[list[str]]:
+        picks = rng.integers(0, len(_SKILLS), (count, 3))
+        return [[_SKILLS[k] for k in row] for row in picks]
+
+    cities = rng.integers(0, len(_CITIES), n_candidates + n_roles)
+    policies = rng.choice(["remote", "hybrid", "onsite"], n_roles)
+    candidates = [
+        {"skills": s, "location": _CITIES[c]}
+        for s, c in zip(skills(n_candidates), cities[:n_candidates])
+    ]
+    roles = [
+        {"skills": s[:2], "location": _CITIES[c], "remote_policy": str(p)}
+        for s, c, p in zip(skills(n_roles), cities[n_candidates:], policies)
+    ]
+    return candidates, roles, candidate_dna, consistency, role_dna
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--roles", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--per-candidate", type=int, default=3)
+    parser.add_argument("--per-role", type=int, default=5)
+    parser.add_argument("--shard-size", type=int, default=None)
+    args = parser.parse_args()
+
+    population = synthetic_population(args.candidates, args.roles)
+    pairs = args.candidates * args.roles
+    print(
+        f"{args.candidates:,} candidates x {args.roles:,} roles = {pairs:,} pairs "
+        f"({os.cpu_count()} CPUs)"
+    )
+    print(f"{'workers':>7}  {'seconds':>8}  {'pairs/sec':>12}  {'speed-up':>8}  selected")
+
+    baseline = None
+    for workers in args.workers:
+        started = time.perf_counter()
+        result = sharded_top_k(
+            *population,
+            per_candidate=args.per_candidate,
+            per_role=args.per_role,
+            workers=workers,
+            shard_size=args.shard_size,
+        )
+        seconds = time.perf_counter() - started
+        baseline = baseline or seconds
+        print(
+            f"{workers:>7}  {seconds:>8.2f}  {pairs / seconds:>12,.0f}  "
+            f"{baseline / seconds:>7.2f}x  {len(result.rows):,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,61 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "./data/talentdrop.db"
+    db_read_pool_size: int = 4
+    postgres_pool_size: int = 10
     jwt_secret: str = "demo-secret-key"
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 1440  # 24 hours
 
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
+    # Empty for api.openai.com; set for an OpenAI-compatible server
+    openai_base_url: str = ""
+    # Shared LLM HTTP client: connection pool, keep-alive and timeouts (seconds)
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 60.0
+    llm_connect_timeout: float = 5.0
+    llm_timeout: float = 60.0
+    # Persistent LLM response cache (resume parsing, match reports)
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 30 * 24 * 3600
+    llm_cache_max_bytes: int = 64 * 1024 * 1024
     openai_embedding_model: str = "text-embedding-3-large"
 
     lightrag_working_dir: str = "./data/lightrag"
 
     log_dir: str = "./logs"
 
+    bulk_insert_chunk_size: int = 1000
+    # Matches kept per candidate / per role by a top-K matching run
+    # (a candidate drop shows 3, a company drop 5 per role)
+    matching_top_k_per_candidate: int = 3
+    matching_top_k_per_role: int = 5
+    # Worker processes for a sharded matching run
+    matching_workers: int = 4
+    # Drop slots per candidate / per role, allocated by stable assignment
+    drop_slots_per_candidate: int = 3
+    drop_slots_per_role: int = 5
+    # Weekly cycle (matching run, then drops): UTC weekday (0 = Monday) and HH:MM
+    weekly_run_enabled: bool = True
+    weekly_run_weekday: int = 0
+    weekly_run_time: str = "03:00"
+    weekly_run_lease_seconds: int = 3600
+    # Parsed DNA scores kept in memory (entries), and how long one is served
+    # before it is re-read — writes from other server processes show up then
+    dna_cache_size: int = 10_000
+    dna_cache_ttl_seconds: float = 30.0
+    # LLM reports for drop matches: parallel requests, retries per report
+    # and the token budget all requests share
+    llm_report_concurrency: int = 4
+    llm_report_max_retries: int = 3
+    llm_report_tokens_per_minute: int = 60_000
+    # Profile chat context: the last N turns are sent verbatim, older ones
+    # as a rolling summary, folded in every M turns
+    chat_context_turns: int = 6
+    chat_summary_every_turns: int = 4
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
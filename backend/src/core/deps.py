@@ -1,36 +1,105 @@
+
 import aiosqlite
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
 from src.core.config import settings
+from src.core.llm import LLMClient
+from src.core.llm_cache import LLMCache
+from src.core.pool import DatabasePool
+from src.repositories.base import Storage
 
 security = HTTPBearer()
 
-_db_connection: aiosqlite.Connection | None = None
+_pool: DatabasePool | None = None
+_storage: Storage | None = None
+_llm: LLMClient | None = None
+
+
+def is_postgres_url(database_url: str) -> bool:
+    return database_url.startswith(("postgres://", "postgresql://"))
 
 
-async def get_db() -> aiosqlite.Connection:
-    global _db_connection
-    if _db_connection is None:
+def get_pool() -> DatabasePool:
+    if _pool is None:
         raise HTTPException(status_code=500, detail="Database not initialized")
-    return _db_connection
+    return _pool
 
 
-async def init_db(db_path: str) -> aiosqlite.Connection:
-    global _db_connection
-    _db_connection = await aiosqlite.connect(db_path)
-    _db_connection.row_factory = aiosqlite.Row
-    await _db_connection.execute("PRAGMA journal_mode=WAL")
-    await _db_connection.execute("PRAGMA foreign_keys=ON")
-    return _db_connection
+async def init_db(db_path: str, readers: int | None = None) -> aiosqlite.Connection:
+    global _pool
+    _pool = DatabasePool(
+        db_path,
+        readers=settings.db_read_pool_size if readers is None else readers,
+    )
+    await _pool.open()
+    return _pool.writer
 
 
 async def close_db() -> None:
-    global _db_connection
-    if _db_connection:
-        await _db_connection.close()
-        _db_connection = None
+    global _pool
+    if _pool:
+        await _pool.close()
+        _pool = None
+
+
+async def get_storage() -> Storage:
+    """The repository layer for the configured ``database_url`` backend."""
+    if _storage is None:
+        raise HTTPException(status_code=500, detail="Storage not initialized")
+    return _storage
+
+
+async def init_storage(database_url: str) -> Storage:
+    """Open the storage backend selected by ``database_url``.
+
+    A ``postgres://`` / ``postgresql://`` URL selects PostgreSQL (and creates
+    its schema); anything else is a SQLite path, served by the pool from
+    ``init_db`` — call that first.
+    """
+    global _storage
+    if is_postgres_url(database_url):
+        from src.repositories.postgres import PostgresStorage
+
+        storage = await PostgresStorage.connect(
+            database_url, max_size=settings.postgres_pool_size,
+        )
+        await storage.create_schema()
+        _storage = storage
+    else:
+        from src.repositories.sqlite import SQLiteStorage
+
+        _storage = SQLiteStorage(get_pool())
+    return _storage
+
+
+async def close_storage() -> None:
+    global _storage
+    if _storage:
+        await _storage.close()
+        _storage = None
+
+
+def get_llm() -> LLMClient | None:
+    """The shared LLM client; None without an API key (services fall back)."""
+    return _llm
+
+
+def init_llm(storage: Storage | None = None) -> LLMClient | None:
+    """Create the shared LLM client, caching responses on ``storage`` if given."""
+    global _llm
+    if settings.openai_api_key:
+        cache = LLMCache(storage) if storage and settings.llm_cache_enabled else None
+        _llm = LLMClient(settings.openai_api_key, settings.openai_base_url, cache)
+    return _llm
+
+
+async def close_llm() -> None:
+    global _llm
+    if _llm:
+        await _llm.close()
+        _llm = None
 
 
 async def get_current_user_id(
@@ -0,0 +1,162 @@
+"""Shared LLM client — one pooled ``AsyncOpenAI`` for the whole application.
+
+Chat, resume parsing and match reports all call the model through the same
+client, so they share one httpx connection pool (and its keep-alive TLS
+connections) instead of building a new one per call. Every call is timed
+under an operation name for ``metrics()``. Calls made with ``cache=True``
+are answered from the ``LLMCache`` when the same request was seen before.
+"""
+
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from src.core.config import settings
+from src.core.llm_cache import LLMCache
+
+# Latency samples kept per operation for the percentiles
+_SAMPLES = 512
+
+
+@dataclass
+class LatencyStats:
+    """Call counters and recent latencies for one operation."""
+
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=_SAMPLES))
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.calls += 1
+        self.errors += 0 if ok else 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent)
+
+        def pct(q: float) -> float:
+            return round(recent[int(q * (len(recent) - 1))] * 1000, 1) if recent else 0.0
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total / self.calls * 1000, 1) if self.calls else 0.0,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class LLMClient:
+    """``AsyncOpenAI`` on one pooled httpx client, with per-operation latency.
+
+    Created once in ``lifespan`` (see ``init_llm``) when an API key is
+    configured; services take it as an argument and fall back to their
+    offline behaviour when it is None.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        cache: LLMCache | None = None,
+    ) -> None:
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                settings.llm_timeout, connect=settings.llm_connect_timeout,
+            ),
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key, base_url=base_url or None, http_client=self._http,
+        )
+        # Same connection pool, for callers that retry on their own
+        self._no_retry = self.client.with_options(max_retries=0)
+        self._stats: dict[str, LatencyStats] = defaultdict(LatencyStats)
+        self.cache = cache
+
+    async def chat(
+        self,
+        operation: str,
+        *,
+        cache: bool = False,
+        retries: bool = True,
+        before_send: Callable[[], Awaitable[None]] | None = None,
+        **params,
+    ) -> ChatCompletion:
+        """``chat.completions.create`` with ``settings.openai_model``, timed under ``operation``.
+
+        Args:
+            operation: Metrics label, e.g. ``"chat"`` or ``"report"``.
+            cache: Answer from (and store into) the response cache.
+            retries: False to skip the client's built-in retries.
+            before_send: Awaited just before a request actually goes out —
+                not on cache hits (e.g. to reserve rate-limit budget).
+            **params: Passed to ``chat.completions.create``.
+        """
+        params = {"model": settings.openai_model, **params}
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            cached = await self.cache.get(params)
+            if cached is not None:
+                return cached
+
+        if before_send is not None:
+            await before_send()
+        client = self.client if retries else self._no_retry
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = await client.chat.completions.create(**params)
+            ok = True
+        finally:
+            self._stats[operation].record(time.perf_counter() - started, ok)
+
+        if use_cache:
+            await self.cache.put(params, response)
+        return response
+
+    async def stream(self, operation: str, **params) -> AsyncIterator[str]:
+        """Streamed ``chat.completions.create``: yields the content deltas.
+
+        Timed under ``operation`` from the request to the last chunk.
+        """
+        started = time.perf_counter()
+        ok = False
+        try:
+            stream = await self.client.chat.completions.create(
+                model=settings.openai_model, stream=True, **params,
+            )
+            async with stream:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            ok = True
+        finally:
+            self._stats[operation].record(time.perf_counter() - started, ok)
+
+    async def close(self) -> None:
+        if self.cache is not None:
+            await self.cache.flush()
+        await self.client.close()
+        await self._http.aclose()
+
+    def metrics(self) -> dict:
+        """Per-operation call counts and latencies, and the response cache."""
+        return {
+            "calls": {name: stats.snapshot() for name, stats in self._stats.items()},
+            "cache": self.cache.metrics() if self.cache else None,
+        }
@@ -0,0 +1,112 @@
+"""LLM response cache — content-addressed, persisted in the ``llm_cache`` table.
+
+Identical requests (the same resume uploaded again, the same DNA pair
+reported again after a rerun) are answered from the stored response. The key
+is a hash of everything that shapes the answer: model, messages (system
+prompt included), temperature and max tokens. Entries expire after
+``llm_cache_ttl_seconds``; beyond ``llm_cache_max_bytes`` the least recently
+used are evicted. Hits only read the table: their access times are kept in
+memory and written in one batch every ``_FLUSH_EVERY`` hits, before each
+eviction, and on shutdown.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from openai.types.chat import ChatCompletion
+
+from src.core.config import settings
+from src.repositories.base import Storage
+
+# Eviction runs after this many stores
+_EVICT_EVERY = 50
+# Access times are written after this many hits
+_FLUSH_EVERY = 100
+
+
+def cache_key(params: dict) -> str:
+    """Hash of the request parameters that determine a completion."""
+    payload = json.dumps(
+        [
+            params.get("model"),
+            params.get("messages"),
+            params.get("temperature"),
+            params.get("max_tokens"),
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """Read-through cache of chat completions on ``storage``."""
+
+    def __init__(self, storage: Storage) -> None:
+        self._storage = storage
+        self._stores = 0
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self._size: dict | None = None
+        # key -> (last used at, hits) not yet written
+        self._used: dict[str, tuple[str, int]] = {}
+
+    async def get(self, params: dict) -> ChatCompletion | None:
+        key = cache_key(params)
+        now = datetime.now(tz=timezone.utc)
+        ttl = timedelta(seconds=settings.llm_cache_ttl_seconds)
+        row = await self._storage.get_llm_response(key, (now - ttl).isoformat())
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.tokens_saved += row["total_tokens"]
+        _, hits = self._used.get(key, ("", 0))
+        self._used[key] = (now.isoformat(), hits + 1)
+        if len(self._used) >= _FLUSH_EVERY:
+            await self.flush()
+        return ChatCompletion.model_validate_json(row["response"])
+
+    async def put(self, params: dict, response: ChatCompletion) -> None:
+        await self._storage.save_llm_response(
+            cache_key(params),
+            params["model"],
+            response.model_dump_json(),
+            response.usage.total_tokens if response.usage else 0,
+        )
+        self._stores += 1
+        if self._stores % _EVICT_EVERY == 1:
+            await self.evict()
+
+    async def flush(self) -> None:
+        """Write the access times of the hits since the last flush."""
+        used, self._used = self._used, {}
+        await self._storage.mark_llm_responses_used(
+            [(used_at, hits, key) for key, (used_at, hits) in used.items()],
+        )
+
+    async def evict(self) -> None:
+        """Drop expired entries and trim the cache to ``llm_cache_max_bytes``."""
+        # Least recently used must see the latest hits
+        await self.flush()
+        ttl = timedelta(seconds=settings.llm_cache_ttl_seconds)
+        expired_before = (datetime.now(tz=timezone.utc) - ttl).isoformat()
+        self._size = await self._storage.evict_llm_responses(
+            expired_before, settings.llm_cache_max_bytes,
+        )
+        logger.debug("LLM cache after eviction: {}", self._size)
+
+    def metrics(self) -> dict:
+        """Hit / miss counters, tokens saved, and the size at the last eviction."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "tokens_saved": self.tokens_saved,
+            "entries": self._size["entries"] if self._size else None,
+            "bytes": self._size["bytes"] if self._size else None,
+        }
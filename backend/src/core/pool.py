@@ -0,0 +1,122 @@
+"""SQLite connection pool — N read-only WAL readers plus one dedicated writer."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import aiosqlite
+
+
+@dataclass
+class WaitStats:
+    """Checkout wait-time counters for one side of the pool."""
+
+    checkouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        avg = self.total_wait / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "avg_wait_ms": round(avg * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+async def _connect(database: str, *, read_only: bool) -> aiosqlite.Connection:
+    """Open a connection with the pragmas every pooled connection needs."""
+    if read_only:
+        conn = await aiosqlite.connect(f"file:{database}?mode=ro", uri=True)
+        await conn.execute("PRAGMA query_only=ON")
+    else:
+        conn = await aiosqlite.connect(database)
+        await conn.execute("PRAGMA journal_mode=WAL")
+    conn.row_factory = aiosqlite.Row
+    await conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class DatabasePool:
+    """Readers run concurrently (each aiosqlite connection owns a thread);
+    writes go through a single connection.
+
+    ``read()`` checks a reader out of an idle queue. ``write()`` is the
+    write queue: a FIFO lock around the writer for write transactions that
+    must not interleave — every ``SQLiteStorage`` transaction, including
+    matching jobs and background rescoring. Only the seed script and
+    migrations use ``writer`` directly, before the server starts.
+    """
+
+    def __init__(self, database: str, readers: int = 4) -> None:
+        self.database = database
+        # An in-memory database is private to its connection — no readers
+        self._reader_count = 0 if database == ":memory:" else max(0, readers)
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._write_lock = asyncio.Lock()
+        self.read_stats = WaitStats()
+        self.write_stats = WaitStats()
+
+    @property
+    def writer(self) -> aiosqlite.Connection:
+        if self._writer is None:
+            raise RuntimeError("Database pool is not open")
+        return self._writer
+
+    async def open(self) -> None:
+        # The writer goes first: it creates the file and switches it to WAL
+        self._writer = await _connect(self.database, read_only=False)
+        for _ in range(self._reader_count):
+            conn = await _connect(self.database, read_only=True)
+            self._readers.append(conn)
+            self._idle.put_nowait(conn)
+
+    async def close(self) -> None:
+        for conn in self._readers:
+            await conn.close()
+        self._readers.clear()
+        self._idle = asyncio.Queue()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Check out a read-only connection (the writer if there are no readers)."""
+        if not self._readers:
+            yield self.writer
+            return
+
+        started = time.perf_counter()
+        conn = await self._idle.get()
+        self.read_stats.record(time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the writer exclusively, queueing behind other write jobs."""
+        started = time.perf_counter()
+        async with self._write_lock:
+            self.write_stats.record(time.perf_counter() - started)
+            yield self.writer
+
+    def metrics(self) -> dict:
+        """Pool size and checkout wait-time metrics."""
+        return {
+            "readers": len(self._readers),
+            "readers_idle": self._idle.qsize(),
+            "read": self.read_stats.snapshot(),
+            "write": self.write_stats.snapshot(),
+        }
@@ -0,0 +1,18 @@
+"""Drop weeks — labels and boundaries of the weekly cycle (UTC, weeks start Monday)."""
+
+from datetime import datetime, timedelta, timezone
+
+
+def week_label(now: datetime | None = None) -> str:
+    """Label of the drop week containing ``now`` (default: the current time).
+
+    Stored as ``matches.drop_week`` and ``drops.week``, e.g. ``2026-W41``.
+    """
+    return (now or datetime.now(tz=timezone.utc)).strftime("%Y-W%W")
+
+
+def week_start(now: datetime | None = None) -> datetime:
+    """Monday 00:00 UTC of the week containing ``now``."""
+    now = (now or datetime.now(tz=timezone.utc)).astimezone(timezone.utc)
+    monday = now - timedelta(days=now.weekday())
+    return monday.replace(hour=0, minute=0, second=0, microsecond=0)
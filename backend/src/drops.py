@@ -0,0 +1,32 @@
+"""Generate this week's drops for every candidate and company in one batch."""
+
+import asyncio
+from pathlib import Path
+
+from src.core.config import settings
+from src.core.deps import close_db, close_storage, init_db, init_storage, is_postgres_url
+from src.models.database import create_tables
+from src.services.drop import generate_weekly_drops
+
+
+async def generate() -> None:
+    if not is_postgres_url(settings.database_url):
+        Path(settings.database_url).parent.mkdir(parents=True, exist_ok=True)
+        db = await init_db(settings.database_url, readers=0)
+        await create_tables(db)
+    storage = await init_storage(settings.database_url)
+
+    try:
+        created = await generate_weekly_drops(storage)
+    finally:
+        await close_storage()
+        await close_db()
+
+    print(
+        f"Generated drops: {created['candidate_drops']} candidates, "
+        f"{created['company_drops']} companies"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(generate())
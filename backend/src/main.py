@@ -1,14 +1,33 @@
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from loguru import logger
 
 from src.core.config import settings
-from src.core.deps import close_db, init_db
+from src.core.deps import (
+    close_db,
+    close_llm,
+    close_storage,
+    get_llm,
+    get_storage,
+    init_db,
+    init_llm,
+    init_storage,
+    is_postgres_url,
+)
 from src.core.logging import setup_logging
 from src.core.middleware import setup_middleware
 from src.models.database import create_tables
+from src.repositories.base import Storage
+from src.services.dna_cache import dna_cache
+from src.services.incremental import (
+    get_rescore_queue,
+    start_rescore_worker,
+    stop_rescore_worker,
+)
+from src.services.matching_jobs import start_job_runner, stop_job_runner
+from src.services.scheduler import get_scheduler, start_scheduler, stop_scheduler
 
 
 @asynccontextmanager
@@ -16,17 +35,32 @@ async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("Starting TalentDrop backend")
 
-    # Ensure data directory exists
-    db_path = Path(settings.database_url)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if not is_postgres_url(settings.database_url):
+        # Ensure data directory exists
+        db_path = Path(settings.database_url)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Initialize database
+        db = await init_db(settings.database_url)
+        await create_tables(db)
 
-    # Initialize database
-    db = await init_db(settings.database_url)
-    await create_tables(db)
+    storage = await init_storage(settings.database_url)
     logger.info("Database initialized")
 
+    llm = init_llm(storage)
+
+    start_rescore_worker(storage)
+    runner = await start_job_runner(storage)
+    if settings.weekly_run_enabled:
+        await start_scheduler(storage, runner, llm)
+
     yield
 
+    await stop_scheduler()
+    await stop_job_runner()
+    await stop_rescore_worker()
+    await close_llm()
+    await close_storage()
     await close_db()
     logger.info("TalentDrop backend stopped")
 
@@ -70,5 +104,15 @@ app.include_router(graph_router, prefix="/api/graph", tags=["graph"])
 
 
 @app.get("/api/health")
-async def health():
-    return {"status": "ok"}
+async def health(storage: Storage = Depends(get_storage)):
+    queue = get_rescore_queue()
+    scheduler = get_scheduler()
+    llm = get_llm()
+    return {
+        "status": "ok",
+        "db_pool": storage.metrics(),
+        "rescore_queue": queue.metrics() if queue else None,
+        "weekly_cycle": scheduler.metrics() if scheduler else None,
+        "dna_cache": dna_cache.metrics(),
+        "llm": llm.metrics() if llm else None,
+    }
@@ -2,9 +2,11 @@
 
 import aiosqlite
 
+from src.models.migrations import apply_migrations
+
 
 async def create_tables(db: aiosqlite.Connection) -> None:
-    """Create all application tables if they do not exist."""
+    """Create all application tables if they do not exist, then migrate."""
 
     await db.execute("""
         CREATE TABLE IF NOT EXISTS companies (
@@ -145,3 +147,4 @@ async def create_tables(db: aiosqlite.Connection) -> None:
     """)
 
     await db.commit()
+    await apply_migrations(db)
@@ -1,5 +1,8 @@
 """DNA scoring models — the 8-dimension Career / Company DNA profile."""
 
+from collections.abc import Sequence
+
+import numpy as np
 from pydantic import BaseModel
 
 
@@ -29,6 +32,37 @@ class DimensionScores(BaseModel):
     execution: float
 
 
+# ── Compact encoding ────────────────────────────────────────────────
+
+DNA_VECTOR_DTYPE = np.dtype("<i2")
+"""Compact DNA vector: one little-endian int16 per dimension, in hundredths.
+
+Scores are 0–100 with at most two decimals, so the 16-byte encoding is exact
+and decodes to the same floats as the JSON text.
+"""
+
+
+def encode_dna(scores: DimensionScores) -> bytes:
+    """Pack a profile into its 16-byte compact vector, in ``DIMENSIONS`` order."""
+    values = np.array([getattr(scores, dim) for dim in DIMENSIONS], dtype=np.float64)
+    return np.rint(values * 100).astype(DNA_VECTOR_DTYPE).tobytes()
+
+
+def decode_dna(vector: bytes) -> DimensionScores:
+    """Unpack a compact vector back into a profile."""
+    values = np.frombuffer(vector, dtype=DNA_VECTOR_DTYPE) / 100
+    return DimensionScores(**dict(zip(DIMENSIONS, values.tolist())))
+
+
+def unpack_dna(vectors: Sequence[bytes]) -> np.ndarray:
+    """Read compact vectors into an (N, 8) float64 matrix without parsing.
+
+    The matrix matches ``pack_dna`` over the decoded profiles.
+    """
+    raw = np.frombuffer(b"".join(vectors), dtype=DNA_VECTOR_DTYPE)
+    return raw.reshape(len(vectors), len(DIMENSIONS)) / 100
+
+
 class DNAScoreResponse(BaseModel):
     """API response carrying a computed DNA profile."""
 
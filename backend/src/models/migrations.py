@@ -0,0 +1,295 @@
+"""Versioned schema migrations, tracked with SQLite's ``PRAGMA user_version``.
+
+``create_tables`` builds the base schema; every later change is appended to
+``MIGRATIONS`` with the next version number and applied exactly once. A step
+is a SQL statement, or an async callable for data that SQL cannot rewrite.
+Run ``python -m src.models.migrations`` to migrate the configured database;
+``tests/test_query_plans.py`` checks that the queries it serves use indexes.
+"""
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+
+import aiosqlite
+from loguru import logger
+
+from src.models.dna_score import DimensionScores, encode_dna
+
+Step = str | Callable[[aiosqlite.Connection], Awaitable[None]]
+
+
+async def _pack_dna_vectors(db: aiosqlite.Connection) -> None:
+    """Backfill ``dna_scores.vector`` from the JSON scores."""
+    cursor = await db.execute("SELECT id, scores FROM dna_scores WHERE vector IS NULL")
+    rows = await cursor.fetchall()
+    await db.executemany(
+        "UPDATE dna_scores SET vector = ? WHERE id = ?",
+        [
+            (encode_dna(DimensionScores.model_validate_json(row[1])), row[0])
+            for row in rows
+        ],
+    )
+
+
+# Of duplicate pairs, keeps the match someone acted on or that is in a drop,
+# else the one with the lowest id
+DEDUPE_MATCHES = """
+    DELETE FROM matches
+    WHERE candidate_action IS NULL AND company_action IS NULL
+      AND id NOT IN (SELECT match_id FROM drop_matches)
+      AND EXISTS (
+          SELECT 1 FROM matches o
+          WHERE o.drop_week = matches.drop_week
+            AND o.candidate_id = matches.candidate_id
+            AND o.role_id = matches.role_id
+            AND o.id != matches.id
+            AND (o.candidate_action IS NOT NULL OR o.company_action IS NOT NULL
+                 OR o.id IN (SELECT match_id FROM drop_matches)
+                 OR o.id < matches.id)
+      )
+"""
+
+
+MIGRATIONS: list[tuple[int, str, tuple[Step, ...]]] = [
+    (
+        1,
+        "indexes for hot query patterns",
+        (
+            "CREATE INDEX IF NOT EXISTS idx_dna_scores_entity "
+            "ON dna_scores (entity_type, entity_id)",
+            "CREATE INDEX IF NOT EXISTS idx_matches_candidate_status "
+            "ON matches (candidate_id, status, candidate_action, score)",
+            "CREATE INDEX IF NOT EXISTS idx_matches_company_role_status "
+            "ON matches (company_id, role_id, status, company_action, score)",
+            "CREATE INDEX IF NOT EXISTS idx_matches_week_pair "
+            "ON matches (drop_week, candidate_id, role_id)",
+            "CREATE INDEX IF NOT EXISTS idx_matches_role "
+            "ON matches (role_id)",
+            "CREATE INDEX IF NOT EXISTS idx_drops_target "
+            "ON drops (target_id, target_type, revealed_at)",
+            "CREATE INDEX IF NOT EXISTS idx_chat_messages_user_created "
+            "ON chat_messages (user_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_company_answers_company "
+            "ON company_answers (company_id)",
+            "CREATE INDEX IF NOT EXISTS idx_roles_company_active "
+            "ON roles (company_id, is_active)",
+        ),
+    ),
+    (
+        2,
+        "cache key for lazily generated match reports",
+        ("ALTER TABLE matches ADD COLUMN report_key TEXT",),
+    ),
+    (
+        3,
+        "persisted matching jobs",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS matching_jobs (
+                id            TEXT PRIMARY KEY,
+                mode          TEXT NOT NULL,
+                status        TEXT NOT NULL DEFAULT 'queued',
+                drop_week     TEXT NOT NULL,
+                pairs_total   INTEGER NOT NULL DEFAULT 0,
+                pairs_scored  INTEGER NOT NULL DEFAULT 0,
+                l1_passed     INTEGER NOT NULL DEFAULT 0,
+                rows_written  INTEGER NOT NULL DEFAULT 0,
+                error         TEXT,
+                created_at    TEXT NOT NULL,
+                started_at    TEXT,
+                finished_at   TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_matching_jobs_status "
+            "ON matching_jobs (status, created_at)",
+        ),
+    ),
+    (
+        4,
+        "pending match pool for stable drop assignment",
+        (
+            "CREATE INDEX IF NOT EXISTS idx_matches_status_score "
+            "ON matches (status, score)",
+        ),
+    ),
+    (
+        5,
+        "drop_matches table replacing drops.match_ids",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS drop_matches (
+                drop_id   TEXT NOT NULL,
+                match_id  TEXT NOT NULL,
+                rank      INTEGER NOT NULL,
+                PRIMARY KEY (drop_id, rank),
+                FOREIGN KEY (drop_id)  REFERENCES drops (id),
+                FOREIGN KEY (match_id) REFERENCES matches (id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_drop_matches_match "
+            "ON drop_matches (match_id)",
+            # Backfill in array order; ids of matches that no longer exist are dropped
+            "INSERT INTO drop_matches (drop_id, match_id, rank) "
+            "SELECT d.id, j.value, j.key FROM drops d, json_each(d.match_ids) j "
+            "WHERE j.value IN (SELECT id FROM matches)",
+            "ALTER TABLE drops DROP COLUMN match_ids",
+        ),
+    ),
+    (
+        6,
+        "scheduled job leases and last-run state",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS scheduled_jobs (
+                name              TEXT PRIMARY KEY,
+                last_week         TEXT,
+                last_status       TEXT,
+                last_started_at   TEXT,
+                last_finished_at  TEXT,
+                last_error        TEXT,
+                last_result       TEXT,
+                lease_owner       TEXT,
+                lease_expires_at  TEXT
+            )
+            """,
+        ),
+    ),
+    (
+        7,
+        "compact DNA vectors next to the JSON scores",
+        (
+            "ALTER TABLE dna_scores ADD COLUMN vector BLOB",
+            _pack_dna_vectors,
+        ),
+    ),
+    (
+        8,
+        "content-addressed LLM response cache",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key           TEXT PRIMARY KEY,
+                model         TEXT NOT NULL,
+                response      TEXT NOT NULL,
+                total_tokens  INTEGER NOT NULL DEFAULT 0,
+                size          INTEGER NOT NULL,
+                hits          INTEGER NOT NULL DEFAULT 0,
+                created_at    TEXT NOT NULL,
+                last_used_at  TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used "
+            "ON llm_cache (last_used_at)",
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_created "
+            "ON llm_cache (created_at)",
+        ),
+    ),
+    (
+        9,
+        "last chat message covered by the rolling chat summary",
+        ("ALTER TABLE user_profiles ADD COLUMN chat_summary_until TEXT",),
+    ),
+    (
+        10,
+        "per-role L1 funnel recorded by matching jobs",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS role_funnels (
+                role_id           TEXT PRIMARY KEY,
+                total_candidates  INTEGER NOT NULL,
+                l1_passed         INTEGER NOT NULL,
+                job_id            TEXT NOT NULL,
+                updated_at        TEXT NOT NULL,
+                FOREIGN KEY (role_id) REFERENCES roles (id)
+            )
+            """,
+        ),
+    ),
+    (
+        11,
+        "weekly drop slot assignment stored on matches",
+        (
+            "ALTER TABLE matches ADD COLUMN drop_slot INTEGER",
+            "CREATE INDEX IF NOT EXISTS idx_matches_week_slot "
+            "ON matches (drop_week, drop_slot, score)",
+        ),
+    ),
+    (
+        12,
+        "one match per candidate and role each week; roles' weekly matches",
+        (
+            DEDUPE_MATCHES,
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_matches_week_pair "
+            "ON matches (drop_week, candidate_id, role_id)",
+            "DROP INDEX IF EXISTS idx_matches_week_pair",
+            "CREATE INDEX IF NOT EXISTS idx_matches_role_week "
+            "ON matches (role_id, drop_week, score)",
+            "DROP INDEX IF EXISTS idx_matches_role",
+        ),
+    ),
+    (
+        13,
+        "drops by week",
+        (
+            "CREATE INDEX IF NOT EXISTS idx_drops_week "
+            "ON drops (week, target_type, target_id)",
+        ),
+    ),
+]
+"""(version, description, statements) — append only, never edit a shipped entry."""
+
+
+async def schema_version(db: aiosqlite.Connection) -> int:
+    """Return the schema version recorded in the database file."""
+    cursor = await db.execute("PRAGMA user_version")
+    row = await cursor.fetchone()
+    return row[0]
+
+
+async def apply_migrations(db: aiosqlite.Connection) -> int:
+    """Apply every migration newer than the stored version.
+
+    Each migration runs in its own transaction together with the
+    ``user_version`` bump, so a failure leaves the previous version intact.
+
+    Returns:
+        The schema version after migrating.
+    """
+    version = await schema_version(db)
+    for target, description, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        await db.execute("BEGIN")
+        try:
+            for statement in statements:
+                if callable(statement):
+                    await statement(db)
+                else:
+                    await db.execute(statement)
+            await db.execute(f"PRAGMA user_version = {target}")
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        logger.info("Applied migration {}: {}", target, description)
+        version = target
+    return version
+
+
+async def _main() -> int:
+    from src.core.config import settings
+    from src.core.deps import close_db, init_db
+    from src.models.database import create_tables
+
+    db = await init_db(settings.database_url, readers=0)
+    try:
+        await create_tables(db)
+        print(f"Schema version: {await schema_version(db)}")
+    finally:
+        await close_db()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,47 @@
+"""Generate LLM reports for the matches in this week's (or a given week's) drops."""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from src.core.config import settings
+from src.core.deps import (
+    close_db,
+    close_llm,
+    close_storage,
+    init_db,
+    init_llm,
+    init_storage,
+    is_postgres_url,
+)
+from src.models.database import create_tables
+from src.services.report_pipeline import generate_drop_reports
+
+
+async def generate(week: str | None) -> None:
+    if not is_postgres_url(settings.database_url):
+        Path(settings.database_url).parent.mkdir(parents=True, exist_ok=True)
+        db = await init_db(settings.database_url, readers=0)
+        await create_tables(db)
+    storage = await init_storage(settings.database_url)
+    llm = init_llm(storage)
+
+    try:
+        stats = await generate_drop_reports(storage, llm, week)
+    finally:
+        await close_llm()
+        await close_storage()
+        await close_db()
+
+    print(
+        f"Reports for {stats['matches']} drop matches: {stats['generated']} "
+        f"generated ({stats['cached']} from cache), {stats['fallback']} "
+        f"template fallbacks, {stats['current']} already current "
+        f"({stats['tokens']} tokens)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--week", help="drop week label, e.g. 2026-W42")
+    asyncio.run(generate(parser.parse_args().week))
@@ -0,0 +1,764 @@
+"""Backend-neutral repository layer over the core tables.
+
+SQL is written once, with ``?`` placeholders, against the subset of SQL that
+SQLite and PostgreSQL share. A backend only supplies the four primitives
+(``fetchone`` / ``fetchall`` / ``execute`` / ``executemany``) and a
+``transaction()`` that runs them on one connection.
+"""
+
+import json
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+
+
+def _now() -> str:
+    return datetime.now(tz=timezone.utc).isoformat()
+
+
+class Executor(ABC):
+    """The query primitives shared by a storage backend and its transactions."""
+
+    @abstractmethod
+    async def fetchone(self, sql: str, params: Sequence = ()) -> dict | None: ...
+
+    @abstractmethod
+    async def fetchall(self, sql: str, params: Sequence = ()) -> list[dict]: ...
+
+    @abstractmethod
+    async def execute(self, sql: str, params: Sequence = ()) -> None: ...
+
+    @abstractmethod
+    async def executemany(self, sql: str, rows: Sequence[Sequence]) -> None: ...
+
+
+class Storage(Executor):
+    """Repository methods for users, roles, DNA scores, answers, profiles, chat,
+    matches and drops.
+
+    Also holds the LLM response cache (see ``core.llm_cache``).
+
+    Statements executed directly on a ``Storage`` commit immediately;
+    statements inside ``transaction()`` commit together.
+    """
+
+    @abstractmethod
+    def transaction(self) -> AbstractAsyncContextManager[Executor]: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    def metrics(self) -> dict: ...
+
+    # ── users / companies ───────────────────────────────────────────
+
+    async def get_user(self, user_id: str) -> dict | None:
+        return await self.fetchone("SELECT * FROM users WHERE id = ?", (user_id,))
+
+    async def get_user_by_email(self, email: str) -> dict | None:
+        return await self.fetchone("SELECT * FROM users WHERE email = ?", (email,))
+
+    async def create_user(
+        self,
+        email: str,
+        name: str,
+        role: str,
+        password_hash: str,
+        company_id: str | None = None,
+    ) -> str:
+        user_id = str(uuid.uuid4())
+        await self.execute(
+            """
+            INSERT INTO users (id, email, name, role, password_hash, company_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (user_id, email, name, role, password_hash, company_id, _now()),
+        )
+        return user_id
+
+    async def get_company(self, company_id: str) -> dict | None:
+        return await self.fetchone(
+            "SELECT * FROM companies WHERE id = ?", (company_id,)
+        )
+
+    async def create_company(
+        self, name: str, industry: str, size: str, owner_id: str,
+    ) -> str:
+        """Create a company and link its creating HR user to it."""
+        company_id = str(uuid.uuid4())
+        async with self.transaction() as tx:
+            await tx.execute(
+                """
+                INSERT INTO companies (id, name, industry, size, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (company_id, name, industry, size, _now()),
+            )
+            await tx.execute(
+                "UPDATE users SET company_id = ? WHERE id = ?",
+                (company_id, owner_id),
+            )
+        return company_id
+
+    # ── roles ───────────────────────────────────────────────────────
+
+    async def create_role(self, company_id: str, fields: dict) -> str:
+        """Insert a role; ``fields`` holds the already-serialized column values."""
+        role_id = str(uuid.uuid4())
+        columns = ["id", "company_id", *fields, "created_at"]
+        values = [role_id, company_id, *fields.values(), _now()]
+        await self.execute(
+            f"INSERT INTO roles ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            values,
+        )
+        return role_id
+
+    async def get_role(self, role_id: str) -> dict | None:
+        """A role joined with its company name."""
+        return await self.fetchone(
+            """SELECT r.*, c.name AS company_name FROM roles r
+               JOIN companies c ON c.id = r.company_id
+               WHERE r.id = ?""",
+            (role_id,),
+        )
+
+    async def list_active_roles(self, company_id: str | None = None) -> list[dict]:
+        """Active roles (optionally of one company), newest first."""
+        if company_id:
+            return await self.fetchall(
+                """SELECT r.*, c.name AS company_name FROM roles r
+                   JOIN companies c ON c.id = r.company_id
+                   WHERE r.company_id = ? AND r.is_active = 1
+                   ORDER BY r.created_at DESC""",
+                (company_id,),
+            )
+        return await self.fetchall(
+            """SELECT r.*, c.name AS company_name FROM roles r
+               JOIN companies c ON c.id = r.company_id
+               WHERE r.is_active = 1
+               ORDER BY r.created_at DESC""",
+        )
+
+    async def update_role(self, role_id: str, fields: dict) -> None:
+        """Update the given (already-serialized) columns of a role."""
+        if not fields:
+            return
+        assignments = ", ".join(f"{col} = ?" for col in fields)
+        await self.execute(
+            f"UPDATE roles SET {assignments} WHERE id = ?",
+            [*fields.values(), role_id],
+        )
+
+    # ── DNA scores ──────────────────────────────────────────────────
+
+    async def get_dna_score(self, entity_type: str, entity_id: str) -> dict | None:
+        return await self.fetchone(
+            """
+            SELECT entity_type, entity_id, scores, consistency
+            FROM dna_scores
+            WHERE entity_type = ? AND entity_id = ?
+            """,
+            (entity_type, entity_id),
+        )
+
+    async def save_dna_score(
+        self,
+        entity_type: str,
+        entity_id: str,
+        scores_json: str,
+        vector: bytes,
+        consistency: float,
+    ) -> None:
+        """Replace the entity's DNA score — only the latest one is kept.
+
+        ``vector`` is the same score in the compact ``encode_dna`` form.
+        """
+        async with self.transaction() as tx:
+            await tx.execute(
+                "DELETE FROM dna_scores WHERE entity_type = ? AND entity_id = ?",
+                (entity_type, entity_id),
+            )
+            await tx.execute(
+                """
+                INSERT INTO dna_scores
+                    (id, entity_type, entity_id, scores, vector, consistency, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (str(uuid.uuid4()), entity_type, entity_id, scores_json, vector,
+                 consistency, _now()),
+            )
+
+    # ── answers ─────────────────────────────────────────────────────
+
+    async def add_career_answers(self, user_id: str, answers_json: str) -> None:
+        await self.execute(
+            """
+            INSERT INTO career_answers (id, user_id, answers, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (str(uuid.uuid4()), user_id, answers_json, _now()),
+        )
+
+    async def add_company_answers(
+        self, user_id: str, company_id: str, answers_json: str,
+    ) -> None:
+        await self.execute(
+            """
+            INSERT INTO company_answers (id, user_id, company_id, answers, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (str(uuid.uuid4()), user_id, company_id, answers_json, _now()),
+        )
+
+    async def list_company_answers(self, company_id: str) -> list[dict]:
+        """Every respondent's raw answers for a company, with their user role."""
+        return await self.fetchall(
+            """
+            SELECT ca.answers, u.role
+            FROM company_answers ca
+            JOIN users u ON u.id = ca.user_id
+            WHERE ca.company_id = ?
+            """,
+            (company_id,),
+        )
+
+    # ── profiles ────────────────────────────────────────────────────
+
+    async def get_profile(self, user_id: str) -> dict | None:
+        return await self.fetchone(
+            "SELECT * FROM user_profiles WHERE user_id = ?", (user_id,)
+        )
+
+    async def save_profile(
+        self,
+        user_id: str,
+        fields: dict,
+        add_skills: Sequence[str] | None = None,
+    ) -> None:
+        """Create the user's profile or update the given columns of it.
+
+        ``fields`` holds the already-serialized column values. ``add_skills``
+        are merged into the stored skills (read in the same transaction)
+        instead of replacing them.
+        """
+        now = _now()
+        async with self.transaction() as tx:
+            if add_skills is not None:
+                row = await tx.fetchone(
+                    "SELECT skills FROM user_profiles WHERE user_id = ?", (user_id,)
+                )
+                stored = json.loads(row["skills"]) if row and row["skills"] else []
+                merged = list(set(stored + list(add_skills)))
+                fields = {**fields, "skills": json.dumps(merged)}
+            columns = ["id", "user_id", *fields, "created_at", "updated_at"]
+            assignments = "".join(f"{col} = excluded.{col}, " for col in fields)
+            await tx.execute(
+                f"INSERT INTO user_profiles ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT (user_id) DO UPDATE SET {assignments}"
+                "updated_at = excluded.updated_at",
+                [str(uuid.uuid4()), user_id, *fields.values(), now, now],
+            )
+
+    # ── chat messages ───────────────────────────────────────────────
+
+    async def add_chat_message(
+        self,
+        user_id: str,
+        role: str,
+        content: str,
+        extracted_entities: str | None = None,
+    ) -> tuple[str, str]:
+        """Append a chat message; returns ``(message_id, created_at)``."""
+        message_id = str(uuid.uuid4())
+        created_at = _now()
+        await self.execute(
+            """INSERT INTO chat_messages
+               (id, user_id, role, content, extracted_entities, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (message_id, user_id, role, content, extracted_entities, created_at),
+        )
+        return message_id, created_at
+
+    async def list_chat_messages(self, user_id: str) -> list[dict]:
+        """A user's full conversation, oldest first."""
+        return await self.fetchall(
+            """SELECT id, user_id, role, content, extracted_entities, created_at
+               FROM chat_messages WHERE user_id = ? ORDER BY created_at ASC""",
+            (user_id,),
+        )
+
+    async def list_recent_chat_messages(
+        self, user_id: str, after: str | None, limit: int,
+    ) -> list[dict]:
+        """The newest ``limit`` messages created after ``after``, oldest first."""
+        rows = await self.fetchall(
+            """SELECT role, content, created_at FROM chat_messages
+               WHERE user_id = ? AND created_at > ?
+               ORDER BY created_at DESC LIMIT ?""",
+            (user_id, after or "", limit),
+        )
+        return rows[::-1]
+
+    async def list_chat_messages_after(
+        self, user_id: str, after: str | None, limit: int,
+    ) -> list[dict]:
+        """The oldest ``limit`` messages created after ``after``, oldest first."""
+        return await self.fetchall(
+            """SELECT role, content, created_at FROM chat_messages
+               WHERE user_id = ? AND created_at > ?
+               ORDER BY created_at ASC LIMIT ?""",
+            (user_id, after or "", limit),
+        )
+
+    async def get_chat_summary(self, user_id: str) -> dict | None:
+        """``chat_summary`` and ``chat_summary_until`` (the last message it covers)."""
+        return await self.fetchone(
+            "SELECT chat_summary, chat_summary_until FROM user_profiles "
+            "WHERE user_id = ?",
+            (user_id,),
+        )
+
+    async def save_chat_summary(
+        self, user_id: str, summary: str, until: str, covered: str | None = None,
+    ) -> bool:
+        """Store the rolling chat summary, creating the profile if needed.
+
+        Only replaces a summary that still ends at ``covered`` (the point it
+        was folded from), so two overlapping refreshes cannot fold the same
+        messages twice.
+
+        Returns:
+            Whether the summary was stored.
+        """
+        now = _now()
+        # RETURNING reports whether the row was written; run in a transaction
+        # so it goes to the writer
+        async with self.transaction() as tx:
+            saved = await tx.fetchall(
+                """
+                INSERT INTO user_profiles
+                    (id, user_id, chat_summary, chat_summary_until, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    chat_summary = excluded.chat_summary,
+                    chat_summary_until = excluded.chat_summary_until,
+                    updated_at = excluded.updated_at
+                WHERE COALESCE(user_profiles.chat_summary_until, '') = ?
+                RETURNING user_id
+                """,
+                (str(uuid.uuid4()), user_id, summary, until, now, now, covered or ""),
+            )
+        return len(saved) == 1
+
+    # ── matches ─────────────────────────────────────────────────────
+
+    async def get_match(self, match_id: str) -> dict | None:
+        """A match joined with its candidate and company names and role title."""
+        return await self.fetchone(
+            """
+            SELECT m.*, u.name AS candidate_name, c.name AS company_name,
+                   r.title AS role_title
+            FROM matches m
+            LEFT JOIN users u ON u.id = m.candidate_id
+            LEFT JOIN companies c ON c.id = m.company_id
+            LEFT JOIN roles r ON r.id = m.role_id
+            WHERE m.id = ?
+            """,
+            (match_id,),
+        )
+
+    async def get_match_report_inputs(self, match_id: str) -> dict | None:
+        """A match with everything its report is built from.
+
+        Adds ``candidate_name`` / ``company_name`` and both sides' current DNA
+        (``candidate_scores`` + ``consistency``, ``company_scores``; NULL when
+        the score is missing) to the match's score, report and report key.
+        """
+        return await self.fetchone(
+            """
+            SELECT m.id, m.score, m.dimension_scores, m.report, m.report_key,
+                   u.name AS candidate_name, c.name AS company_name,
+                   cd.scores AS candidate_scores, cd.consistency,
+                   kd.scores AS company_scores
+            FROM matches m
+            JOIN users u ON u.id = m.candidate_id
+            LEFT JOIN companies c ON c.id = m.company_id
+            LEFT JOIN dna_scores cd
+                ON cd.entity_type = 'candidate' AND cd.entity_id = m.candidate_id
+            LEFT JOIN dna_scores kd
+                ON kd.entity_type = 'company' AND kd.entity_id = m.company_id
+            WHERE m.id = ?
+            """,
+            (match_id,),
+        )
+
+    async def save_match_report(
+        self, match_id: str, report: str, report_key: str,
+    ) -> None:
+        """Cache a generated report together with the key of its inputs."""
+        await self.save_match_reports([(match_id, report, report_key)])
+
+    async def save_match_reports(self, reports: Sequence[tuple[str, str, str]]) -> None:
+        """Cache several ``(match_id, report, report_key)`` at once."""
+        await self.executemany(
+            "UPDATE matches SET report = ?, report_key = ? WHERE id = ?",
+            [(report, key, match_id) for match_id, report, key in reports],
+        )
+
+    async def get_drop_report_inputs(self, week: str) -> list[dict]:
+        """Report inputs of every match in ``week``'s drops, for LLM reports.
+
+        The ``get_match_report_inputs`` columns plus the candidate's profile
+        (``candidate_title`` / ``candidate_skills`` / ``candidate_bio``) and
+        the role (``role_title`` / ``role_skills`` / ``role_description``).
+        """
+        return await self.fetchall(
+            """
+            SELECT m.id, m.score, m.dimension_scores, m.report, m.report_key,
+                   u.name AS candidate_name, c.name AS company_name,
+                   cd.scores AS candidate_scores, cd.consistency,
+                   kd.scores AS company_scores,
+                   p.title AS candidate_title, p.skills AS candidate_skills,
+                   p.bio AS candidate_bio,
+                   r.title AS role_title, r.skills AS role_skills,
+                   r.description AS role_description
+            FROM matches m
+            JOIN users u ON u.id = m.candidate_id
+            LEFT JOIN companies c ON c.id = m.company_id
+            LEFT JOIN roles r ON r.id = m.role_id
+            LEFT JOIN user_profiles p ON p.user_id = m.candidate_id
+            LEFT JOIN dna_scores cd
+                ON cd.entity_type = 'candidate' AND cd.entity_id = m.candidate_id
+            LEFT JOIN dna_scores kd
+                ON kd.entity_type = 'company' AND kd.entity_id = m.company_id
+            WHERE m.id IN (
+                SELECT dm.match_id
+                FROM drops d
+                JOIN drop_matches dm ON dm.drop_id = d.id
+                WHERE d.week = ?
+            )
+            ORDER BY m.score DESC
+            """,
+            (week,),
+        )
+
+    async def set_match_action(
+        self, match_id: str, side: str, action: str, status: str,
+    ) -> None:
+        """Record a candidate or company action and the derived status."""
+        column = {"candidate": "candidate_action", "company": "company_action"}[side]
+        await self.execute(
+            f"UPDATE matches SET {column} = ?, status = ? WHERE id = ?",
+            (action, status, match_id),
+        )
+
+    async def list_company_matches(self, company_id: str) -> list[dict]:
+        """Every match of a company with the candidate's name, best first."""
+        return await self.fetchall(
+            """
+            SELECT m.id, m.candidate_id, m.company_id, m.score,
+                   m.dimension_scores, m.report, m.status,
+                   u.name AS candidate_name
+            FROM matches m
+            JOIN users u ON u.id = m.candidate_id
+            WHERE m.company_id = ?
+            ORDER BY m.score DESC
+            """,
+            (company_id,),
+        )
+
+    async def get_role_funnel(self, role_id: str) -> dict:
+        """``total_candidates`` / ``l1_passed`` of a role's last matching job.
+
+        Roles no job has covered yet fall back to the candidate count and
+        the role's stored matches.
+        """
+        funnel = await self.fetchone(
+            "SELECT total_candidates, l1_passed FROM role_funnels WHERE role_id = ?",
+            (role_id,),
+        )
+        if funnel:
+            return funnel
+        candidates = await self.fetchone(
+            "SELECT COUNT(*) AS n FROM users WHERE role = 'candidate'",
+        )
+        matches = await self.fetchone(
+            "SELECT COUNT(*) AS n FROM matches WHERE role_id = ?", (role_id,),
+        )
+        return {"total_candidates": candidates["n"], "l1_passed": matches["n"]}
+
+    async def pending_matches(self, week: str) -> list[dict]:
+        """Every match of ``week`` neither side has acted on yet, best first."""
+        return await self.fetchall(
+            """
+            SELECT id, candidate_id, company_id, role_id, score
+            FROM matches
+            WHERE drop_week = ? AND status = 'pending'
+            ORDER BY score DESC
+            """,
+            (week,),
+        )
+
+    async def save_drop_slots(self, week: str, match_ids: Sequence[str]) -> None:
+        """Record ``week``'s drop slot assignment: ``match_ids`` get a slot.
+
+        Every other match of the week is marked as assigned without one.
+        """
+        async with self.transaction() as tx:
+            await tx.execute(
+                "UPDATE matches SET drop_slot = 0 WHERE drop_week = ?", (week,),
+            )
+            await tx.executemany(
+                "UPDATE matches SET drop_slot = 1 WHERE id = ?",
+                [(match_id,) for match_id in match_ids],
+            )
+
+    async def unassigned_matches(self, week: str) -> list[dict]:
+        """Pending matches of ``week`` added since its assignment, best first."""
+        return await self.fetchall(
+            """
+            SELECT id, candidate_id, company_id, role_id, score
+            FROM matches
+            WHERE drop_week = ? AND drop_slot IS NULL AND status = 'pending'
+            ORDER BY score DESC
+            """,
+            (week,),
+        )
+
+    async def held_drop_slots(
+        self,
+        week: str,
+        candidate_ids: Sequence[str],
+        role_keys: Sequence[str],
+    ) -> list[dict]:
+        """``week``'s slots held by any of ``candidate_ids`` or ``role_keys``.
+
+        A role key is the role id, or the company id of a match without a
+        role. Each row has ``candidate_id`` and ``role_key``.
+        """
+        candidates = ", ".join("?" for _ in candidate_ids)
+        roles = ", ".join("?" for _ in role_keys)
+        return await self.fetchall(
+            f"""
+            SELECT candidate_id, COALESCE(role_id, company_id) AS role_key
+            FROM matches
+            WHERE drop_week = ? AND drop_slot = 1
+              AND (candidate_id IN ({candidates})
+                   OR COALESCE(role_id, company_id) IN ({roles}))
+            """,
+            (week, *candidate_ids, *role_keys),
+        )
+
+    async def place_drop_slots(
+        self, match_ids: Sequence[str], slotted: Sequence[str],
+    ) -> None:
+        """Mark unassigned ``match_ids`` as assigned; those in ``slotted`` get a slot."""
+        chosen = set(slotted)
+        async with self.transaction() as tx:
+            await tx.executemany(
+                "UPDATE matches SET drop_slot = ? WHERE id = ? AND drop_slot IS NULL",
+                [(1 if match_id in chosen else 0, match_id) for match_id in match_ids],
+            )
+
+    async def list_drop_slots(
+        self,
+        week: str,
+        candidate_id: str | None = None,
+        company_id: str | None = None,
+    ) -> list[dict]:
+        """Pending matches holding one of ``week``'s drop slots, best first.
+
+        Optionally narrowed to one candidate or to one company.
+        """
+        sql = """
+            SELECT id, candidate_id, company_id, role_id, score
+            FROM matches
+            WHERE drop_week = ? AND drop_slot = 1 AND status = 'pending'
+        """
+        params: list = [week]
+        if candidate_id is not None:
+            sql += " AND candidate_id = ?"
+            params.append(candidate_id)
+        if company_id is not None:
+            sql += " AND company_id = ?"
+            params.append(company_id)
+        return await self.fetchall(sql + " ORDER BY score DESC", params)
+
+    # ── drops ───────────────────────────────────────────────────────
+
+    async def create_drop(
+        self,
+        week: str,
+        target_type: str,
+        target_id: str,
+        match_ids: Sequence[str],
+        revealed_at: str | None,
+    ) -> str:
+        """Create a drop of ``match_ids``, in display order."""
+        [drop_id] = await self.create_drops(
+            week, [(target_type, target_id, match_ids)], revealed_at,
+        )
+        return drop_id
+
+    async def create_drops(
+        self,
+        week: str,
+        drops: Sequence[tuple[str, str, Sequence[str]]],
+        revealed_at: str | None,
+    ) -> list[str]:
+        """Create ``(target_type, target_id, match_ids)`` drops in one transaction.
+
+        Drops and their matches are each written with one ``executemany``.
+        """
+        drop_ids = [str(uuid.uuid4()) for _ in drops]
+        created_at = _now()
+        async with self.transaction() as tx:
+            await tx.executemany(
+                """
+                INSERT INTO drops (id, week, target_type, target_id,
+                                  revealed_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (drop_id, week, target_type, target_id, revealed_at, created_at)
+                    for drop_id, (target_type, target_id, _) in zip(drop_ids, drops)
+                ],
+            )
+            await tx.executemany(
+                "INSERT INTO drop_matches (drop_id, match_id, rank) VALUES (?, ?, ?)",
+                [
+                    (drop_id, match_id, rank)
+                    for drop_id, (_, _, match_ids) in zip(drop_ids, drops)
+                    for rank, match_id in enumerate(match_ids)
+                ],
+            )
+        return drop_ids
+
+    async def week_drop_targets(self, week: str) -> set[tuple[str, str]]:
+        """``(target_type, target_id)`` of every drop already created for ``week``."""
+        rows = await self.fetchall(
+            "SELECT target_type, target_id FROM drops WHERE week = ?", (week,),
+        )
+        return {(r["target_type"], r["target_id"]) for r in rows}
+
+    async def get_latest_drop_matches(
+        self, target_id: str, target_type: str,
+    ) -> list[dict]:
+        """The target's most recent drop, hydrated in one query.
+
+        One row per match in drop order, each carrying the drop's
+        ``drop_id`` / ``week`` / ``revealed_at`` and everything a drop
+        response shows, plus the report inputs (see services.report_cache).
+        A drop without matches yields a single row with ``id`` NULL; no
+        drop, no rows.
+        """
+        return await self.fetchall(
+            """
+            WITH latest AS (
+                SELECT id, week, revealed_at
+                FROM drops
+                WHERE target_id = ? AND target_type = ?
+                ORDER BY revealed_at DESC
+                LIMIT 1
+            )
+            SELECT d.id AS drop_id, d.week, d.revealed_at,
+                   m.id, m.candidate_id, m.company_id, m.role_id, m.score,
+                   m.dimension_scores, m.status, m.candidate_action,
+                   m.company_action, m.report, m.report_key,
+                   u.name AS candidate_name, c.name AS company_name,
+                   r.title AS role_title,
+                   cd.scores AS candidate_scores, cd.consistency,
+                   kd.scores AS company_scores
+            FROM latest d
+            LEFT JOIN drop_matches dm ON dm.drop_id = d.id
+            LEFT JOIN matches m ON m.id = dm.match_id
+            LEFT JOIN users u ON u.id = m.candidate_id
+            LEFT JOIN companies c ON c.id = m.company_id
+            LEFT JOIN roles r ON r.id = m.role_id
+            LEFT JOIN dna_scores cd
+                ON cd.entity_type = 'candidate' AND cd.entity_id = m.candidate_id
+            LEFT JOIN dna_scores kd
+                ON kd.entity_type = 'company' AND kd.entity_id = m.company_id
+            ORDER BY dm.rank
+            """,
+            (target_id, target_type),
+        )
+
+    # ── LLM response cache ──────────────────────────────────────────
+
+    async def get_llm_response(self, key: str, not_before: str) -> dict | None:
+        """A cached response created at or after ``not_before``.
+
+        Read-only; hits are recorded in batches with ``mark_llm_responses_used``.
+        """
+        return await self.fetchone(
+            """
+            SELECT response, total_tokens FROM llm_cache
+            WHERE key = ? AND created_at >= ?
+            """,
+            (key, not_before),
+        )
+
+    async def mark_llm_responses_used(
+        self, uses: Sequence[tuple[str, int, str]],
+    ) -> None:
+        """Record ``(last_used_at, hits, key)`` batches of cache hits."""
+        if uses:
+            await self.executemany(
+                "UPDATE llm_cache SET last_used_at = ?, hits = hits + ? WHERE key = ?",
+                uses,
+            )
+
+    async def save_llm_response(
+        self, key: str, model: str, response: str, total_tokens: int,
+    ) -> None:
+        """Store (or replace) the response for ``key``."""
+        now = _now()
+        await self.execute(
+            """
+            INSERT INTO llm_cache
+                (key, model, response, total_tokens, size, hits,
+                 created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                model = excluded.model, response = excluded.response,
+                total_tokens = excluded.total_tokens, size = excluded.size,
+                created_at = excluded.created_at,
+                last_used_at = excluded.last_used_at
+            """,
+            (key, model, response, total_tokens, len(response.encode()), now, now),
+        )
+
+    async def evict_llm_responses(self, expired_before: str, max_bytes: int) -> dict:
+        """Drop expired responses, then the least recently used beyond ``max_bytes``.
+
+        Returns:
+            ``{"entries": n, "bytes": n}`` left in the cache.
+        """
+        async with self.transaction() as tx:
+            await tx.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (expired_before,),
+            )
+            await tx.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (
+                            ORDER BY last_used_at DESC, key
+                        ) AS running
+                        FROM llm_cache
+                    ) ranked
+                    WHERE running > ?
+                )
+                """,
+                (max_bytes,),
+            )
+            return await tx.fetchone(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes "
+                "FROM llm_cache",
+            )
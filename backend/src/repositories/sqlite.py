@@ -0,0 +1,73 @@
+"""SQLite storage backend — reads on the pooled readers, writes on the writer."""
+
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+from src.core.pool import DatabasePool
+from src.repositories.base import Executor, Storage
+
+
+class _ConnectionExecutor(Executor):
+    """Run statements on one aiosqlite connection without committing."""
+
+    def __init__(self, conn: aiosqlite.Connection) -> None:
+        self._conn = conn
+
+    async def fetchone(self, sql: str, params: Sequence = ()) -> dict | None:
+        cursor = await self._conn.execute(sql, params)
+        row = await cursor.fetchone()
+        return dict(row) if row else None
+
+    async def fetchall(self, sql: str, params: Sequence = ()) -> list[dict]:
+        cursor = await self._conn.execute(sql, params)
+        return [dict(row) for row in await cursor.fetchall()]
+
+    async def execute(self, sql: str, params: Sequence = ()) -> None:
+        await self._conn.execute(sql, params)
+
+    async def executemany(self, sql: str, rows: Sequence[Sequence]) -> None:
+        await self._conn.executemany(sql, rows)
+
+
+class SQLiteStorage(Storage):
+    """Storage on top of the ``DatabasePool`` created by ``init_db``."""
+
+    def __init__(self, pool: DatabasePool) -> None:
+        self._pool = pool
+
+    async def fetchone(self, sql: str, params: Sequence = ()) -> dict | None:
+        async with self._pool.read() as conn:
+            return await _ConnectionExecutor(conn).fetchone(sql, params)
+
+    async def fetchall(self, sql: str, params: Sequence = ()) -> list[dict]:
+        async with self._pool.read() as conn:
+            return await _ConnectionExecutor(conn).fetchall(sql, params)
+
+    async def execute(self, sql: str, params: Sequence = ()) -> None:
+        async with self.transaction() as tx:
+            await tx.execute(sql, params)
+
+    async def executemany(self, sql: str, rows: Sequence[Sequence]) -> None:
+        async with self.transaction() as tx:
+            await tx.executemany(sql, rows)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Executor]:
+        # Queue behind background write jobs so their transactions never
+        # get committed or rolled back halfway by a request
+        async with self._pool.write() as writer:
+            try:
+                yield _ConnectionExecutor(writer)
+            except BaseException:
+                await writer.rollback()
+                raise
+            await writer.commit()
+
+    async def close(self) -> None:
+        # The pool is owned (and closed) by src.core.deps
+        return None
+
+    def metrics(self) -> dict:
+        return {"backend": "sqlite", **self._pool.metrics()}
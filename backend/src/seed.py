@@ -8,51 +8,60 @@ from datetime import datetime, timezone
 import bcrypt as _bcrypt
 
 from src.core.config import settings
-from src.core.deps import init_db, close_db
+from src.core.deps import (
+    close_db,
+    close_storage,
+    init_db,
+    init_storage,
+    is_postgres_url,
+)
+from src.core.week import week_label
 from src.models.database import create_tables
+from src.models.dna_score import encode_dna
+from src.repositories.base import Executor
 from src.data.seed_data import (
     SEED_COMPANIES,
     SEED_CANDIDATES,
     SEED_ROLES,
     SEED_PROFILES,
 )
+from src.services.bulk_writer import MatchWriter
 from src.services.matching import run_matching
-from src.services.report import generate_simple_report
 
 
-async def _seed_companies(db, now: str, default_hash: str) -> None:
+async def _seed_companies(db: Executor, now: str, default_hash: str) -> None:
     """Insert companies, their DNA scores, and HR users."""
     for comp in SEED_COMPANIES:
         await db.execute(
-            "INSERT OR IGNORE INTO companies (id, name, industry, size, created_at) "
-            "VALUES (?, ?, ?, ?, ?)",
+            "INSERT INTO companies (id, name, industry, size, created_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
             (comp["id"], comp["name"], comp["industry"], comp["size"], now),
         )
         await db.execute(
-            "INSERT OR IGNORE INTO dna_scores "
-            "(id, entity_type, entity_id, scores, consistency, created_at) "
-            "VALUES (?, 'company', ?, ?, ?, ?)",
-            (f"score-{comp['id']}", comp["id"],
-             comp["scores"].model_dump_json(), 1.0, now),
+            "INSERT INTO dna_scores "
+            "(id, entity_type, entity_id, scores, vector, consistency, created_at) "
+            "VALUES (?, 'company', ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+            (f"score-{comp['id']}", comp["id"], comp["scores"].model_dump_json(),
+             encode_dna(comp["scores"]), 1.0, now),
         )
         hr_id = f"hr-{comp['id']}"
         await db.execute(
-            "INSERT OR IGNORE INTO users "
+            "INSERT INTO users "
             "(id, email, name, role, password_hash, company_id, created_at) "
-            "VALUES (?, ?, ?, 'hr', ?, ?, ?)",
+            "VALUES (?, ?, ?, 'hr', ?, ?, ?) ON CONFLICT DO NOTHING",
             (hr_id, f"hr@{comp['id']}.example.com",
              f"HR at {comp['name']}", default_hash, comp["id"], now),
         )
 
 
-async def _seed_roles(db, now: str) -> None:
+async def _seed_roles(db: Executor, now: str) -> None:
     """Insert open roles for each company."""
     for role in SEED_ROLES:
         await db.execute(
-            "INSERT OR IGNORE INTO roles "
+            "INSERT INTO roles "
             "(id, company_id, title, level, skills, nice_to_have, "
             "salary_range, location, remote_policy, description, created_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
             (
                 role["id"], role["company_id"], role["title"], role["level"],
                 json.dumps(role["skills"]), json.dumps(role["nice_to_have"]),
@@ -62,31 +71,31 @@ async def _seed_roles(db, now: str) -> None:
         )
 
 
-async def _seed_candidates(db, now: str, default_hash: str) -> None:
+async def _seed_candidates(db: Executor, now: str, default_hash: str) -> None:
     """Insert candidates, their DNA scores, and profiles."""
     for cand in SEED_CANDIDATES:
         await db.execute(
-            "INSERT OR IGNORE INTO users "
+            "INSERT INTO users "
             "(id, email, name, role, password_hash, company_id, created_at) "
-            "VALUES (?, ?, ?, 'candidate', ?, NULL, ?)",
+            "VALUES (?, ?, ?, 'candidate', ?, NULL, ?) ON CONFLICT DO NOTHING",
             (cand["id"], cand["email"], cand["name"], default_hash, now),
         )
         await db.execute(
-            "INSERT OR IGNORE INTO dna_scores "
-            "(id, entity_type, entity_id, scores, consistency, created_at) "
-            "VALUES (?, 'candidate', ?, ?, ?, ?)",
-            (f"score-{cand['id']}", cand["id"],
-             cand["scores"].model_dump_json(), cand["consistency"], now),
+            "INSERT INTO dna_scores "
+            "(id, entity_type, entity_id, scores, vector, consistency, created_at) "
+            "VALUES (?, 'candidate', ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+            (f"score-{cand['id']}", cand["id"], cand["scores"].model_dump_json(),
+             encode_dna(cand["scores"]), cand["consistency"], now),
         )
 
     # Insert profiles
     for prof in SEED_PROFILES:
         profile_id = str(uuid.uuid4())
         await db.execute(
-            "INSERT OR IGNORE INTO user_profiles "
+            "INSERT INTO user_profiles "
             "(id, user_id, title, years_experience, skills, education, "
             "bio, location, remote_preference, created_at, updated_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
             (
                 profile_id, prof["user_id"], prof["title"],
                 prof["years_experience"], json.dumps(prof["skills"]),
@@ -96,7 +105,7 @@ async def _seed_candidates(db, now: str, default_hash: str) -> None:
         )
 
 
-async def _seed_matches(db, now: str, week_label: str) -> None:
+async def _seed_matches(db: Executor, now: str, week_label: str) -> None:
     """Generate all candidate x role matches."""
     # Build company scores lookup
     company_scores: dict[str, dict] = {}
@@ -106,55 +115,49 @@ async def _seed_matches(db, now: str, week_label: str) -> None:
             "scores": comp["scores"],
         }
 
-    for cand in SEED_CANDIDATES:
-        for role in SEED_ROLES:
-            comp = company_scores[role["company_id"]]
-            result = run_matching(
-                candidate_id=cand["id"],
-                candidate_scores=cand["scores"],
-                candidate_consistency=cand["consistency"],
-                company_id=role["company_id"],
-                company_scores=comp["scores"],
-            )
-            dim_dict = result.dimension_scores.model_dump()
-            report = generate_simple_report(
-                candidate_name=cand["name"],
-                company_name=comp["name"],
-                match_score=result.score,
-                dimension_scores=dim_dict,
-                candidate_dna=cand["scores"],
-                company_dna=comp["scores"],
-                consistency=cand["consistency"],
-            )
-            match_id = str(uuid.uuid4())
-            await db.execute(
-                "INSERT OR IGNORE INTO matches "
-                "(id, candidate_id, company_id, role_id, score, "
-                "dimension_scores, report, status, drop_week, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?)",
-                (
-                    match_id, cand["id"], role["company_id"], role["id"],
-                    result.score, json.dumps(dim_dict), report,
-                    week_label, now,
-                ),
-            )
+    async with MatchWriter(db, label="seed matches") as writer:
+        for cand in SEED_CANDIDATES:
+            for role in SEED_ROLES:
+                comp = company_scores[role["company_id"]]
+                result = run_matching(
+                    candidate_id=cand["id"],
+                    candidate_scores=cand["scores"],
+                    candidate_consistency=cand["consistency"],
+                    company_id=role["company_id"],
+                    company_scores=comp["scores"],
+                )
+                dim_dict = result.dimension_scores.model_dump()
+                await writer.add(
+                    candidate_id=cand["id"],
+                    company_id=role["company_id"],
+                    role_id=role["id"],
+                    score=result.score,
+                    dimension_scores=dim_dict,
+                    report=None,
+                    drop_week=week_label,
+                    created_at=now,
+                )
 
 
 async def seed() -> None:
-    db = await init_db(settings.database_url)
-    await create_tables(db)
+    if not is_postgres_url(settings.database_url):
+        db = await init_db(settings.database_url, readers=0)
+        await create_tables(db)
+    # Creates the schema on PostgreSQL
+    storage = await init_storage(settings.database_url)
 
     now = datetime.now(tz=timezone.utc).isoformat()
     default_hash = _bcrypt.hashpw(b"demo123", _bcrypt.gensalt()).decode()
-    week_label = datetime.now(tz=timezone.utc).strftime("%Y-W%W")
-
-    await _seed_companies(db, now, default_hash)
-    await _seed_roles(db, now)
-    await _seed_candidates(db, now, default_hash)
-    await _seed_matches(db, now, week_label)
 
-    await db.commit()
-    await close_db()
+    try:
+        async with storage.transaction() as tx:
+            await _seed_companies(tx, now, default_hash)
+            await _seed_roles(tx, now)
+            await _seed_candidates(tx, now, default_hash)
+            await _seed_matches(tx, now, week_label())
+    finally:
+        await close_storage()
+        await close_db()
 
     print(
         f"Seeded: {len(SEED_COMPANIES)} companies, "
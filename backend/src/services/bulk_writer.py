@@ -0,0 +1,123 @@
+"""Bulk writer for generated matches — chunked inserts in the caller's transaction."""
+
+import json
+import time
+import uuid
+from dataclasses import dataclass
+
+from loguru import logger
+
+from src.core.config import settings
+from src.repositories.base import Executor
+
+_INSERT_MATCH = """
+    INSERT INTO matches
+        (id, candidate_id, company_id, role_id, score,
+         dimension_scores, report, status, drop_week, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?)
+    ON CONFLICT DO NOTHING
+"""
+
+
+@dataclass(frozen=True)
+class WriteStats:
+    """Throughput summary of a finished bulk write."""
+
+    rows: int
+    chunks: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class MatchWriter:
+    """Buffer match rows and flush them with ``executemany`` in chunks.
+
+    All chunks go into the transaction of ``db``, which commits them — or
+    rolls every row back on failure. A pair that already has a match that
+    week (one written concurrently, say) is skipped::
+
+        async with storage.transaction() as tx:
+            async with MatchWriter(tx) as writer:
+                await writer.add(candidate_id=..., ...)
+        writer.stats.rows_per_sec
+    """
+
+    def __init__(
+        self,
+        db: Executor,
+        chunk_size: int | None = None,
+        label: str = "matches",
+    ) -> None:
+        self._db = db
+        self._chunk_size = max(1, chunk_size or settings.bulk_insert_chunk_size)
+        self._label = label
+        self._buffer: list[tuple] = []
+        self._rows = 0
+        self._chunks = 0
+        self._started = time.perf_counter()
+        self.stats: WriteStats | None = None
+
+    async def __aenter__(self) -> "MatchWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # The enclosing transaction rolls back what was flushed
+            self._buffer.clear()
+            return
+        await self.close()
+
+    @property
+    def rows_written(self) -> int:
+        """Rows flushed to the database so far (excludes the open buffer)."""
+        return self._rows
+
+    async def add(
+        self,
+        *,
+        candidate_id: str,
+        company_id: str,
+        role_id: str | None,
+        score: int,
+        dimension_scores: dict[str, float],
+        report: str | None,
+        drop_week: str,
+        created_at: str,
+        match_id: str | None = None,
+    ) -> str:
+        """Queue one pending match; flushes when the buffer reaches a chunk."""
+        match_id = match_id or str(uuid.uuid4())
+        self._buffer.append((
+            match_id, candidate_id, company_id, role_id, score,
+            json.dumps(dimension_scores), report, drop_week, created_at,
+        ))
+        if len(self._buffer) >= self._chunk_size:
+            await self.flush()
+        return match_id
+
+    async def flush(self) -> None:
+        """Write the buffered rows."""
+        if not self._buffer:
+            return
+        await self._db.executemany(_INSERT_MATCH, self._buffer)
+        self._rows += len(self._buffer)
+        self._chunks += 1
+        self._buffer.clear()
+
+    async def close(self) -> WriteStats:
+        """Flush the remaining rows and log write throughput."""
+        await self.flush()
+        self.stats = WriteStats(
+            rows=self._rows,
+            chunks=self._chunks,
+            seconds=time.perf_counter() - self._started,
+        )
+        logger.info(
+            "Bulk insert {}: {} rows in {} chunks, {:.2f}s ({:.0f} rows/sec)",
+            self._label, self.stats.rows, self.stats.chunks,
+            self.stats.seconds, self.stats.rows_per_sec,
+        )
+        return self.stats
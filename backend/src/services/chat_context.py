@@ -0,0 +1,140 @@
+"""Chat context — the recent turns verbatim, everything older as a rolling summary.
+
+Each profile chat turn sends the model ``user_profiles.chat_summary`` plus
+the messages it does not cover yet — the last ``chat_context_turns`` turns
+and at most one fold more — so its cost no longer grows with the
+conversation. ``chat_summary_until`` marks the last message the summary
+covers. Once ``chat_summary_every_turns`` turns have scrolled out of the
+window past it, they are folded into the summary in one short call.
+"""
+
+from dataclasses import dataclass
+
+from loguru import logger
+from openai import OpenAIError
+
+from src.core.config import settings
+from src.core.llm import LLMClient
+from src.repositories.base import Storage
+
+SUMMARY_PROMPT = """你负责维护职遇（TalentDrop）AI 职业顾问与候选人对话的摘要。
+
+把新的对话内容合并进已有摘要，保留对了解候选人有用的信息：职位与工作经历、
+技能、职业价值观、工作偏好、期望的环境与团队，以及尚未聊到的话题。
+用第三人称、简洁的要点书写，不超过 300 字，只输出摘要本身。"""
+
+_SPEAKERS = {"user": "候选人", "assistant": "顾问"}
+
+
+@dataclass
+class ChatContext:
+    """What one chat turn sends the model, and whether a fold is due."""
+
+    summary: str | None
+    messages: list[dict[str, str]]
+    # The last message the summary covers
+    summary_until: str | None = None
+    # Set once unsummarized messages have scrolled out of the window
+    fold_due: bool = False
+
+
+async def load_context(storage: Storage, user_id: str) -> ChatContext:
+    """The summary and the messages it does not cover yet, for ``user_id``'s next turn.
+
+    Reads at most window + one fold of messages, however long the
+    conversation; once that many are waiting, ``fold_due`` is set. If the
+    summary fell further behind (no LLM configured, failed refreshes) the
+    newest of them are sent, and the older ones wait for
+    ``refresh_summary`` to fold them in.
+    """
+    window, fold = _sizes()
+
+    profile = await storage.get_chat_summary(user_id)
+    summary = profile["chat_summary"] if profile else None
+    until = profile["chat_summary_until"] if profile else None
+    rows = await storage.list_recent_chat_messages(user_id, until, window + fold)
+
+    return ChatContext(
+        summary=summary,
+        messages=[{"role": r["role"], "content": r["content"]} for r in rows],
+        summary_until=until,
+        fold_due=_fold_ready(rows, window, fold),
+    )
+
+
+async def refresh_summary(
+    storage: Storage,
+    llm: LLMClient,
+    user_id: str,
+    context: ChatContext,
+) -> None:
+    """Fold the messages past the window into the user's chat summary.
+
+    One fold at a time, oldest first, until less than a fold is left past
+    the window, so a summary that fell behind catches up. A failed call
+    leaves the summary where it got to; the fold is retried on a later turn.
+    Each fold is saved only if no overlapping refresh moved the summary
+    meanwhile; the one that lost stops there.
+    """
+    if not context.fold_due:
+        return
+
+    window, fold = _sizes()
+    summary, until = context.summary, context.summary_until
+    while True:
+        rows = await storage.list_chat_messages_after(user_id, until, window + fold)
+        if not _fold_ready(rows, window, fold):
+            return
+        summary = await _fold(llm, user_id, summary, rows[:fold])
+        if not summary:
+            return
+        folded = rows[fold - 1]["created_at"]
+        if not await storage.save_chat_summary(user_id, summary, folded, until):
+            logger.debug("Chat summary for user {} already refreshed", user_id)
+            return
+        until = folded
+
+
+def _sizes() -> tuple[int, int]:
+    """``(window, fold)`` in messages: the turns sent verbatim, and folded at once."""
+    return (
+        2 * max(1, settings.chat_context_turns),
+        2 * max(1, settings.chat_summary_every_turns),
+    )
+
+
+def _fold_ready(rows: list[dict], window: int, fold: int) -> bool:
+    """Whether a full fold of ``rows`` has scrolled out of the window."""
+    return len(rows) >= window + fold
+
+
+async def _fold(
+    llm: LLMClient,
+    user_id: str,
+    summary: str | None,
+    messages: list[dict],
+) -> str | None:
+    """``summary`` with ``messages`` merged in; None if the call failed."""
+    transcript = "\n".join(
+        f"{_SPEAKERS.get(m['role'], m['role'])}：{m['content']}"
+        for m in messages
+    )
+    try:
+        response = await llm.chat(
+            "chat_summary",
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"已有摘要：\n{summary or '（无）'}\n\n"
+                    f"新的对话：\n{transcript}",
+                },
+            ],
+            temperature=0.3,
+            max_tokens=500,
+        )
+    except OpenAIError as exc:
+        logger.warning("Chat summary for user {} failed: {}", user_id, exc)
+        return None
+
+    return (response.choices[0].message.content or "").strip() or None
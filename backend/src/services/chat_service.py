@@ -1,10 +1,9 @@
 """AI chat service — conversational profiling with entity extraction."""
 
 import json
+from collections.abc import AsyncIterator
 
-from openai import AsyncOpenAI
-
-from src.core.config import settings
+from src.core.llm import LLMClient
 
 SYSTEM_PROMPT = """你是职遇（TalentDrop）的 AI 职业顾问。你的目标是通过自然对话了解候选人的背景信息。
 
@@ -26,27 +25,38 @@ SYSTEM_PROMPT = """你是职遇（TalentDrop）的 AI 职业顾问。你的目
 ```
 如果本轮对话没有新实体，返回空数组即可。"""
 
+# Where the entity block starts in a reply (see SYSTEM_PROMPT)
+_ENTITY_MARKERS = ('{"entities"', "```json")
+
 
-def _get_client() -> AsyncOpenAI:
-    return AsyncOpenAI(api_key=settings.openai_api_key)
+def _prompt_messages(
+    messages: list[dict[str, str]],
+    summary: str | None,
+) -> list[dict[str, str]]:
+    """System prompt, the summary of earlier turns (if any), then ``messages``."""
+    prompt = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if summary:
+        prompt.append({"role": "system", "content": f"此前对话的摘要：\n{summary}"})
+    return prompt + messages
 
 
 async def chat_completion(
     messages: list[dict[str, str]],
+    llm: LLMClient | None,
+    summary: str | None = None,
 ) -> tuple[str, dict | None]:
     """Send messages to OpenAI and return (response_text, extracted_entities).
 
-    Falls back to a mock response if no API key is configured.
+    ``messages`` are the recent turns; ``summary`` covers the ones before
+    them (see ``chat_context``). Falls back to a mock response if no API key
+    is configured (``llm`` None).
     """
-    if not settings.openai_api_key:
+    if llm is None:
         return _mock_response(messages)
 
-    client = _get_client()
-    full_messages = [{"role": "system", "content": SYSTEM_PROMPT}] + messages
-
-    response = await client.chat.completions.create(
-        model=settings.openai_model,
-        messages=full_messages,
+    response = await llm.chat(
+        "chat",
+        messages=_prompt_messages(messages, summary),
         temperature=0.7,
         max_tokens=800,
     )
@@ -58,6 +68,103 @@ async def chat_completion(
     return clean_text, entities
 
 
+class ChatReply:
+    """A reply read as it streams: the visible text, then the entity block.
+
+    ``feed`` returns the part of each delta that can be shown. Text that
+    could still turn into the entity block (a partial marker, or whitespace
+    that may precede one) is held back; everything from the first marker on
+    is hidden. ``flush`` releases what was held back once the stream ends;
+    ``result`` parses the complete reply like ``chat_completion``.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._shown = 0
+        self._hidden = False
+
+    def feed(self, delta: str) -> str:
+        self._text += delta
+        if self._hidden:
+            return ""
+
+        starts = [
+            i for i in (self._text.find(m, self._shown) for m in _ENTITY_MARKERS)
+            if i != -1
+        ]
+        if starts:
+            end = min(starts)
+            self._hidden = True
+        else:
+            end = len(self._text) - _partial_marker(self._text)
+
+        return self._show(end)
+
+    def flush(self) -> str:
+        """The held-back text, when the reply ended without an entity block."""
+        return "" if self._hidden else self._show(len(self._text))
+
+    def _show(self, end: int) -> str:
+        visible = self._text[self._shown:end].rstrip()
+        self._shown += len(visible)
+        return visible
+
+    def received(self) -> str:
+        """The text shown so far, for a reply that was cut short."""
+        return self._text[:self._shown].strip()
+
+    def result(self) -> tuple[str, dict | None]:
+        """``(response_text, extracted_entities)`` of the complete reply."""
+        return _strip_entity_json(self._text), _extract_entities(self._text)
+
+
+def _partial_marker(text: str) -> int:
+    """Length of the longest suffix of ``text`` that begins an entity marker."""
+    longest = max(len(m) for m in _ENTITY_MARKERS) - 1
+    for n in range(min(longest, len(text)), 0, -1):
+        if any(m.startswith(text[-n:]) for m in _ENTITY_MARKERS):
+            return n
+    return 0
+
+
+async def stream_chat_completion(
+    messages: list[dict[str, str]],
+    llm: LLMClient | None,
+    reply: ChatReply,
+    summary: str | None = None,
+) -> AsyncIterator[str]:
+    """Stream the visible part of the AI response as it is generated.
+
+    Every delta goes through ``reply``, whose ``result()`` gives
+    ``(response_text, extracted_entities)`` once the stream is exhausted.
+    ``messages`` and ``summary`` as for ``chat_completion``. Without an LLM
+    client the mock response is sent in one piece.
+    """
+    if llm is None:
+        text, entities = _mock_response(messages)
+        if entities:
+            text += f"\n\n```json\n{json.dumps(entities, ensure_ascii=False)}\n```"
+        deltas = _single(text)
+    else:
+        deltas = llm.stream(
+            "chat_stream",
+            messages=_prompt_messages(messages, summary),
+            temperature=0.7,
+            max_tokens=800,
+        )
+
+    async for delta in deltas:
+        visible = reply.feed(delta)
+        if visible:
+            yield visible
+    if rest := reply.flush():
+        yield rest
+
+
+async def _single(text: str) -> AsyncIterator[str]:
+    yield text
+
+
 def _extract_entities(text: str) -> dict | None:
     """Try to extract JSON entity block from response."""
     try:
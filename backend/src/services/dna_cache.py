@@ -0,0 +1,165 @@
+"""DNA score cache — parsed DNA vectors, read through and invalidated on write.
+
+``dna_scores`` is read on nearly every hot path (matching inputs, score and
+graph routes) and each read re-parses the stored JSON. This bounded LRU keeps
+the parsed ``DimensionScores`` per ``(entity_type, entity_id)`` so repeated
+lookups skip both the query and the parse. ``_save_dna_score`` invalidates
+the entry it replaces. A write the cache never saw (the seed script, another
+server process) is picked up when the entry expires after
+``dna_cache_ttl_seconds``, and at once by rows read through a join, which
+are checked against the cached JSON.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from src.core.config import settings
+from src.models.dna_score import DimensionScores
+from src.repositories.base import Storage
+
+
+@dataclass(frozen=True)
+class CachedDNA:
+    """One entity's parsed DNA score."""
+
+    scores: DimensionScores
+    consistency: float
+    raw: str  # the stored JSON, to validate against rows read elsewhere
+    loaded_at: float  # time.monotonic() of the read it came from
+
+
+class DNACache:
+    """Bounded LRU of parsed DNA scores keyed by ``(entity_type, entity_id)``.
+
+    Entries older than ``ttl`` seconds are re-read rather than served.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], CachedDNA] = OrderedDict()
+        # Bumped on every invalidation: a load that overlapped one may have
+        # read the old row, so it is returned but not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key: tuple[str, str]) -> CachedDNA | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.monotonic() - entry.loaded_at > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _store(self, key: tuple[str, str], entry: CachedDNA) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        entity_type: str,
+        entity_id: str,
+        load: Callable[[], Awaitable[dict | None]],
+    ) -> CachedDNA | None:
+        """The entity's DNA score, loading ``scores`` / ``consistency`` on a miss.
+
+        Returns:
+            The parsed score, or None when the entity has none.
+        """
+        key = (entity_type, entity_id)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+
+        generation = self._generation
+        row = await load()
+        if row is None:
+            return None
+        entry = CachedDNA(
+            scores=DimensionScores.model_validate_json(row["scores"]),
+            consistency=row["consistency"],
+            raw=row["scores"],
+            loaded_at=time.monotonic(),
+        )
+        if generation == self._generation:
+            self._store(key, entry)
+        return entry
+
+    def parse(
+        self,
+        entity_type: str,
+        entity_id: str,
+        scores_json: str,
+        consistency: float,
+    ) -> DimensionScores:
+        """Parse a DNA score already read from the database, reusing the cache.
+
+        For queries that join ``dna_scores`` anyway: the row is the source of
+        truth, the cache only saves the JSON parse when it holds the same one.
+        Either way the entry is as fresh as the row.
+        """
+        key = (entity_type, entity_id)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry.raw == scores_json:
+            self.hits += 1
+            self._store(key, CachedDNA(entry.scores, consistency, scores_json, now))
+            return entry.scores
+
+        self.misses += 1
+        scores = DimensionScores.model_validate_json(scores_json)
+        self._store(key, CachedDNA(scores, consistency, scores_json, now))
+        return scores
+
+    def invalidate(self, entity_type: str, entity_id: str) -> None:
+        self._generation += 1
+        self._entries.pop((entity_type, entity_id), None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Size and hit / miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+dna_cache = DNACache(settings.dna_cache_size, settings.dna_cache_ttl_seconds)
+
+
+async def get_dna(
+    storage: Storage,
+    entity_type: str,
+    entity_id: str,
+) -> CachedDNA | None:
+    """Read-through lookup of an entity's DNA score via ``storage``."""
+    return await dna_cache.get_or_load(
+        entity_type, entity_id,
+        lambda: storage.get_dna_score(entity_type, entity_id),
+    )
+
@@ -0,0 +1,219 @@
+"""In-process DNA vector index — top-K retrieval without scoring every pair.
+
+L2 compatibility is ``(1 - L1 distance / 800) * consistency`` over the eight
+``DIMENSIONS``, so "best candidates for this company DNA" is a nearest-
+neighbour query in L1 space, weighted by each candidate's consistency. The
+index cuts the vectors into buckets by KD-tree median splits and keeps each
+bucket's bounding box and largest weight. A query bounds every bucket at
+once (L1 distance from the query to the box), scores the most promising
+buckets until it holds K results, and then only the buckets whose bound can
+still beat the K-th score. Results are exact — the same scores as the batch
+engine.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from src.models.dna_score import DIMENSIONS
+from src.services.matching import pair_compatibility
+
+# Scores are compared after rounding; keep float bounds safely on the high side
+_BOUND_SLACK = 1e-9
+
+_PROGRESS_EVERY = 256
+
+
+class DNAIndex:
+    """KD-tree buckets over (N, 8) DNA vectors with a per-vector score weight.
+
+    Args:
+        vectors: (N, 8) DNA matrix from ``pack_dna``.
+        weights: (N,) multipliers applied to each vector's compatibility —
+            the consistency for an index of candidates; ones (the default)
+            for an index of roles, where the query side supplies it.
+        bucket_size: Upper bound on vectors per bucket. Buckets are scored
+            with NumPy, so larger buckets trade a few extra scored vectors
+            for less per-bucket overhead.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        weights: np.ndarray | None = None,
+        bucket_size: int = 128,
+    ) -> None:
+        self._vectors = np.ascontiguousarray(vectors, dtype=np.float64)
+        count = self._vectors.shape[0]
+        self._weights = (
+            np.ones(count) if weights is None
+            else np.asarray(weights, dtype=np.float64)
+        )
+        self._bucket_size = max(1, bucket_size)
+        # Bucket b holds the vectors order[start[b]:end[b]]
+        self._order = np.arange(count)
+        spans: list[tuple[int, int]] = []
+        if count:
+            self._split(0, count, spans)
+        self._start = np.array([start for start, _ in spans], dtype=np.intp)
+        self._end = np.array([end for _, end in spans], dtype=np.intp)
+
+        dims = len(DIMENSIONS)
+        self._lo = np.empty((len(spans), dims))
+        self._hi = np.empty((len(spans), dims))
+        self._max_weight = np.empty(len(spans))
+        for b, (start, end) in enumerate(spans):
+            idx = self._order[start:end]
+            self._lo[b] = self._vectors[idx].min(axis=0)
+            self._hi[b] = self._vectors[idx].max(axis=0)
+            self._max_weight[b] = self._weights[idx].max()
+
+    def __len__(self) -> int:
+        return self._vectors.shape[0]
+
+    def _split(self, start: int, end: int, spans: list[tuple[int, int]]) -> None:
+        """Median-split order[start:end] on its widest dimension down to buckets."""
+        if end - start <= self._bucket_size:
+            spans.append((start, end))
+            return
+        idx = self._order[start:end]
+        points = self._vectors[idx]
+        dim = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        mid = (end - start) // 2
+        self._order[start:end] = idx[np.argpartition(points[:, dim], mid)]
+        self._split(start, start + mid, spans)
+        self._split(start + mid, end, spans)
+
+    def _bounds(self, target: np.ndarray, scale: float) -> np.ndarray:
+        """Highest score any vector of each bucket can reach, as a percentage."""
+        gap = (
+            np.maximum(self._lo - target, 0) + np.maximum(target - self._hi, 0)
+        ).sum(axis=1)
+        compat = 1.0 - gap / (100.0 * len(DIMENSIONS))
+        return compat * self._max_weight * scale * 100 + _BOUND_SLACK
+
+    def _score(
+        self,
+        buckets: np.ndarray,
+        target: np.ndarray,
+        allowed: np.ndarray | None,
+        scale: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Positions and scores of the (allowed) vectors in ``buckets``."""
+        idx = np.concatenate([
+            self._order[start:end]
+            for start, end in zip(self._start[buckets], self._end[buckets])
+        ])
+        if allowed is not None:
+            idx = idx[allowed[idx]]
+        scores = pair_compatibility(
+            self._vectors[idx], target, self._weights[idx] * scale,
+        )
+        return idx, scores
+
+    def query(
+        self,
+        target: np.ndarray,
+        k: int,
+        allowed: np.ndarray | None = None,
+        scale: float = 1.0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """The ``k`` best-scoring vectors for one DNA profile.
+
+        Args:
+            target: (8,) DNA vector of the other side.
+            k: Number of results.
+            allowed: Optional (N,) bool mask, e.g. an L1 column; vectors
+                outside it are skipped.
+            scale: Extra multiplier — the candidate's consistency when
+                querying an index of roles.
+
+        Returns:
+            ``(positions, scores)``, best first; fewer than ``k`` when fewer
+            vectors are allowed. Ties at the cut-off are broken arbitrarily.
+        """
+        if k <= 0 or not len(self):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int64)
+
+        target = np.asarray(target, dtype=np.float64)
+        bounds = self._bounds(target, scale)
+        ranked = np.argsort(-bounds)
+
+        # Most promising buckets first, doubling the batch until K results
+        found_idx: list[np.ndarray] = []
+        found_scores: list[np.ndarray] = []
+        found = taken = 0
+        batch = max(1, -(-k // self._bucket_size))
+        while found < k and taken < len(ranked):
+            idx, scores = self._score(ranked[taken:taken + batch], target, allowed, scale)
+            found_idx.append(idx)
+            found_scores.append(scores)
+            found += idx.size
+            taken += batch
+            batch *= 2
+
+        # Then every remaining bucket that could still beat the K-th score
+        if found >= k and taken < len(ranked):
+            kth = np.partition(np.concatenate(found_scores), found - k)[found - k]
+            rest = ranked[taken:]
+            rest = rest[np.rint(bounds[rest]) > kth]
+            if rest.size:
+                idx, scores = self._score(rest, target, allowed, scale)
+                found_idx.append(idx)
+                found_scores.append(scores)
+
+        idx = np.concatenate(found_idx)
+        scores = np.concatenate(found_scores)
+        top = np.argsort(-scores, kind="stable")[:k]
+        return idx[top], scores[top]
+
+
+def top_k_pairs(
+    candidate_dna: np.ndarray,
+    consistency: np.ndarray,
+    role_dna: np.ndarray,
+    eligible: np.ndarray,
+    per_candidate: int,
+    per_role: int,
+    progress: Callable[[int, int], None] | None = None,
+) -> np.ndarray:
+    """Index-backed ``select_top_k``: each candidate's and each role's best pairs.
+
+    Queries a role index once per candidate and a candidate index once per
+    role instead of scoring the full (N, M) matrix.
+
+    Args:
+        progress: Optional ``(queries_done, queries_total)`` callback, called
+            every ``_PROGRESS_EVERY`` queries and at the end. It may raise to
+            abort the selection.
+
+    Returns:
+        (N, M) bool mask of the selected eligible pairs.
+    """
+    n_candidates, n_roles = eligible.shape
+    total = (n_roles if per_role > 0 else 0) + (n_candidates if per_candidate > 0 else 0)
+    done = 0
+
+    def tick() -> None:
+        nonlocal done
+        done += 1
+        if progress is not None and (done % _PROGRESS_EVERY == 0 or done == total):
+            progress(done, total)
+
+    selected = np.zeros(eligible.shape, dtype=bool)
+    if per_role > 0:
+        candidates = DNAIndex(candidate_dna, consistency)
+        for j in range(n_roles):
+            rows, _ = candidates.query(role_dna[j], per_role, allowed=eligible[:, j])
+            selected[rows, j] = True
+            tick()
+    if per_candidate > 0:
+        roles = DNAIndex(role_dna)
+        for i in range(n_candidates):
+            cols, _ = roles.query(
+                candidate_dna[i], per_candidate,
+                allowed=eligible[i], scale=float(consistency[i]),
+            )
+            selected[i, cols] = True
+            tick()
+    return selected
@@ -1,158 +1,245 @@
 """Weekly Drop service — curate and deliver top matches to candidates and companies."""
 
 import json
-import uuid
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
 
-import aiosqlite
+import numpy as np
+
+from src.core.config import settings
+from src.core.week import week_label
+from src.repositories.base import Storage
+from src.services.report_cache import ensure_reports
+from src.services.stable_matching import deferred_acceptance
+
+
+async def allocate_drop_slots(storage: Storage, week: str) -> list[dict]:
+    """Assign ``week``'s drop slots — the L5 stable assignment — and store it.
+
+    Candidates hold at most ``drop_slots_per_candidate`` slots and roles at
+    most ``drop_slots_per_role``, so a popular role cannot flood every drop
+    while others reach nobody. Matches without a role count against their
+    company. The assignment is global, so it runs once per week (see
+    ``generate_weekly_drops``); single drops read the stored result, and
+    matches added later are slotted in by ``slot_new_matches``.
+
+    Returns:
+        The assigned match rows, best score first.
+    """
+    rows = await storage.pending_matches(week)
+    if not rows:
+        return []
+
+    candidate_pos: dict[str, int] = {}
+    role_pos: dict[str, int] = {}
+    candidates = np.array([
+        candidate_pos.setdefault(r["candidate_id"], len(candidate_pos)) for r in rows
+    ])
+    roles = np.array([
+        role_pos.setdefault(r["role_id"] or r["company_id"], len(role_pos)) for r in rows
+    ])
+    scores = np.array([r["score"] for r in rows], dtype=np.float64)
+
+    assigned = deferred_acceptance(
+        candidates,
+        roles,
+        scores,
+        candidate_capacity=settings.drop_slots_per_candidate,
+        role_capacity=settings.drop_slots_per_role,
+    )
+    slots = [row for row, keep in zip(rows, assigned.tolist()) if keep]
+    await storage.save_drop_slots(week, [r["id"] for r in slots])
+    return slots
+
+
+async def slot_new_matches(storage: Storage, week: str) -> None:
+    """Place ``week``'s matches added since its assignment into free slots.
+
+    Best score first, each takes a slot while its candidate and its role
+    still have room. Matches already assigned keep their place, so drops
+    that went out are not disturbed; the weekly run redoes the stable
+    assignment from scratch (``allocate_drop_slots``).
+    """
+    rows = await storage.unassigned_matches(week)
+    if not rows:
+        return
+
+    held = await storage.held_drop_slots(
+        week,
+        list({r["candidate_id"] for r in rows}),
+        list({r["role_id"] or r["company_id"] for r in rows}),
+    )
+    candidate_slots = Counter(h["candidate_id"] for h in held)
+    role_slots = Counter(h["role_key"] for h in held)
+    slotted: list[str] = []
+    for r in rows:
+        role_key = r["role_id"] or r["company_id"]
+        if (
+            candidate_slots[r["candidate_id"]] < settings.drop_slots_per_candidate
+            and role_slots[role_key] < settings.drop_slots_per_role
+        ):
+            candidate_slots[r["candidate_id"]] += 1
+            role_slots[role_key] += 1
+            slotted.append(r["id"])
+    await storage.place_drop_slots([r["id"] for r in rows], slotted)
+
+
+async def _week_slots(
+    storage: Storage,
+    week: str,
+    candidate_id: str | None = None,
+    company_id: str | None = None,
+) -> list[dict]:
+    """One target's share of ``week``'s stored assignment.
+
+    Matches added since the assignment was stored are slotted in first,
+    without recomputing the week.
+    """
+    await slot_new_matches(storage, week)
+    return await storage.list_drop_slots(week, candidate_id, company_id)
 
 
 async def generate_candidate_drop(
-    db: aiosqlite.Connection,
+    storage: Storage,
     candidate_id: str,
 ) -> str:
-    """Generate a weekly drop for a candidate — top 3 pending matches by score."""
-    cursor = await db.execute(
-        """
-        SELECT id FROM matches
-        WHERE candidate_id = ? AND status = 'pending'
-            AND candidate_action IS NULL
-        ORDER BY score DESC
-        LIMIT 3
-        """,
-        (candidate_id,),
-    )
-    rows = await cursor.fetchall()
+    """Generate a weekly drop for a candidate — their stably assigned matches."""
+    now = datetime.now(tz=timezone.utc)
+    week = week_label(now)
+    match_ids = [
+        r["id"] for r in await _week_slots(storage, week, candidate_id=candidate_id)
+    ]
 
-    if not rows:
+    if not match_ids:
         msg = f"No pending matches for candidate {candidate_id}"
         raise ValueError(msg)
 
-    match_ids = [row[0] for row in rows]
-    drop_id = str(uuid.uuid4())
-    now = datetime.now(tz=timezone.utc)
-    week_label = now.strftime("%Y-W%W")
-
-    await db.execute(
-        """
-        INSERT INTO drops (id, week, target_type, target_id, match_ids,
-                          revealed_at, created_at)
-        VALUES (?, ?, 'candidate', ?, ?, ?, ?)
-        """,
-        (drop_id, week_label, candidate_id,
-         json.dumps(match_ids), now.isoformat(), now.isoformat()),
+    return await storage.create_drop(
+        week, "candidate", candidate_id,
+        match_ids, now.isoformat(),
     )
-    await db.commit()
-    return drop_id
 
 
 async def generate_company_drop(
-    db: aiosqlite.Connection,
+    storage: Storage,
     company_id: str,
 ) -> str:
-    """Generate a weekly drop for a company — top 5 candidates per role."""
+    """Generate a weekly drop for a company — the stably assigned candidates per role."""
     # Get active roles for this company
-    cursor = await db.execute(
-        "SELECT id FROM roles WHERE company_id = ? AND is_active = 1",
-        (company_id,),
-    )
-    role_rows = await cursor.fetchall()
+    role_rows = await storage.list_active_roles(company_id)
 
     if not role_rows:
         msg = f"No active roles for company {company_id}"
         raise ValueError(msg)
 
+    now = datetime.now(tz=timezone.utc)
+    week = week_label(now)
+    slots = await _week_slots(storage, week, company_id=company_id)
     all_match_ids: list[str] = []
     for role_row in role_rows:
-        role_id = role_row[0]
-        cursor = await db.execute(
-            """
-            SELECT id FROM matches
-            WHERE company_id = ? AND role_id = ? AND status = 'pending'
-                AND company_action IS NULL
-            ORDER BY score DESC
-            LIMIT 5
-            """,
-            (company_id, role_id),
-        )
-        matches = await cursor.fetchall()
-        all_match_ids.extend(m[0] for m in matches)
+        all_match_ids.extend(r["id"] for r in slots if r["role_id"] == role_row["id"])
 
     if not all_match_ids:
         msg = f"No pending matches for company {company_id}"
         raise ValueError(msg)
 
-    drop_id = str(uuid.uuid4())
+    return await storage.create_drop(
+        week, "company", company_id,
+        all_match_ids, now.isoformat(),
+    )
+
+
+async def generate_weekly_drops(storage: Storage) -> dict[str, int]:
+    """Create this week's drop for every candidate and company in one pass.
+
+    Runs (and stores) the week's stable assignment and bulk-inserts every
+    drop in a single transaction. Targets that already have a drop this
+    week are skipped, so a re-run only fills the gaps.
+
+    Returns:
+        ``{"candidate_drops": n, "company_drops": n}`` created.
+    """
     now = datetime.now(tz=timezone.utc)
-    week_label = now.strftime("%Y-W%W")
-
-    await db.execute(
-        """
-        INSERT INTO drops (id, week, target_type, target_id, match_ids,
-                          revealed_at, created_at)
-        VALUES (?, ?, 'company', ?, ?, ?, ?)
-        """,
-        (drop_id, week_label, company_id,
-         json.dumps(all_match_ids), now.isoformat(), now.isoformat()),
+    week = week_label(now)
+    existing = await storage.week_drop_targets(week)
+    slots = await allocate_drop_slots(storage, week)
+
+    # Slots are best-first; candidate drops keep that order
+    by_candidate: dict[str, list[str]] = defaultdict(list)
+    for r in slots:
+        by_candidate[r["candidate_id"]].append(r["id"])
+
+    # Company drops list the active roles in order, each role best-first
+    role_order = {r["id"]: i for i, r in enumerate(await storage.list_active_roles())}
+    by_company: dict[str, list[dict]] = defaultdict(list)
+    for r in slots:
+        if r["role_id"] in role_order:
+            by_company[r["company_id"]].append(r)
+
+    drops = [
+        ("candidate", candidate_id, match_ids)
+        for candidate_id, match_ids in by_candidate.items()
+        if ("candidate", candidate_id) not in existing
+    ]
+    candidate_drops = len(drops)
+    drops.extend(
+        ("company", company_id, [
+            r["id"] for r in sorted(rows, key=lambda r: role_order[r["role_id"]])
+        ])
+        for company_id, rows in by_company.items()
+        if ("company", company_id) not in existing
     )
-    await db.commit()
-    return drop_id
+    if drops:
+        await storage.create_drops(week, drops, now.isoformat())
+
+    return {
+        "candidate_drops": candidate_drops,
+        "company_drops": len(drops) - candidate_drops,
+    }
 
 
 async def get_current_drop(
-    db: aiosqlite.Connection,
+    storage: Storage,
     target_id: str,
     target_type: str = "candidate",
 ) -> dict | None:
-    """Retrieve the most recent drop for a target (candidate or company)."""
-    cursor = await db.execute(
-        """
-        SELECT id, week, match_ids, revealed_at
-        FROM drops
-        WHERE target_id = ? AND target_type = ?
-        ORDER BY revealed_at DESC
-        LIMIT 1
-        """,
-        (target_id, target_type),
-    )
-    row = await cursor.fetchone()
-    if not row:
+    """Retrieve the most recent drop for a target (candidate or company).
+
+    Each match comes with ``company_name``, ``candidate_name``,
+    ``role_title`` and its report, from a single query.
+    """
+    rows = await storage.get_latest_drop_matches(target_id, target_type)
+    if not rows:
         return None
 
-    drop_id, week, match_ids_json, revealed_at = row
-    match_ids: list[str] = json.loads(match_ids_json)
-
-    matches: list[dict] = []
-    for mid in match_ids:
-        mcursor = await db.execute(
-            """
-            SELECT id, candidate_id, company_id, role_id, score,
-                   dimension_scores, report, status,
-                   candidate_action, company_action
-            FROM matches WHERE id = ?
-            """,
-            (mid,),
-        )
-        mrow = await mcursor.fetchone()
-        if mrow:
-            matches.append({
-                "id": mrow[0],
-                "candidate_id": mrow[1],
-                "company_id": mrow[2],
-                "role_id": mrow[3],
-                "score": mrow[4],
-                "dimension_scores": json.loads(mrow[5]) if mrow[5] else {},
-                "report": mrow[6],
-                "status": mrow[7],
-                "candidate_action": mrow[8],
-                "company_action": mrow[9],
-            })
+    matches = [row for row in rows if row["id"] is not None]
+    await ensure_reports(storage, matches)
 
     return {
-        "id": drop_id,
-        "week": week,
-        "matches": matches,
-        "revealed_at": revealed_at,
+        "id": rows[0]["drop_id"],
+        "week": rows[0]["week"],
+        "matches": [
+            {
+                "id": m["id"],
+                "candidate_id": m["candidate_id"],
+                "candidate_name": m["candidate_name"] or "Unknown",
+                "company_id": m["company_id"],
+                "company_name": m["company_name"] or "Unknown",
+                "role_id": m["role_id"],
+                "role_title": m["role_title"],
+                "score": m["score"],
+                "dimension_scores": (
+                    json.loads(m["dimension_scores"])
+                    if m["dimension_scores"] else {}
+                ),
+                "report": m["report"],
+                "status": m["status"],
+                "candidate_action": m["candidate_action"],
+                "company_action": m["company_action"],
+            }
+            for m in matches
+        ],
+        "revealed_at": rows[0]["revealed_at"],
     }
 
 
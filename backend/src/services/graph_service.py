@@ -2,11 +2,12 @@
 
 import json
 
-import aiosqlite
+from src.repositories.base import Storage
+from src.services.dna_cache import get_dna
 
 
 async def build_candidate_graph(
-    db: aiosqlite.Connection,
+    storage: Storage,
     candidate_id: str,
 ) -> dict:
     """Build a knowledge graph for a candidate's profile.
@@ -17,10 +18,7 @@ async def build_candidate_graph(
     edges: list[dict] = []
 
     # Central candidate node
-    cursor = await db.execute(
-        "SELECT name FROM users WHERE id = ?", (candidate_id,)
-    )
-    user = await cursor.fetchone()
+    user = await storage.get_user(candidate_id)
     if not user:
         return {"nodes": [], "edges": []}
 
@@ -28,13 +26,9 @@ async def build_candidate_graph(
     nodes.append({"id": candidate_id, "label": name, "type": "person", "size": 40})
 
     # DNA dimensions
-    cursor = await db.execute(
-        "SELECT scores FROM dna_scores WHERE entity_id = ? AND entity_type = 'candidate'",
-        (candidate_id,),
-    )
-    dna_row = await cursor.fetchone()
-    if dna_row:
-        scores = json.loads(dna_row["scores"])
+    dna = await get_dna(storage, "candidate", candidate_id)
+    if dna:
+        scores = dna.scores.model_dump()
         dim_labels = {
             "pace": "工作节奏", "collab": "协作模式", "decision": "决策风格",
             "expression": "表达风格", "unc": "不确定性", "growth": "成长路径",
@@ -53,10 +47,7 @@ async def build_candidate_graph(
             })
 
     # Profile skills
-    cursor = await db.execute(
-        "SELECT skills FROM user_profiles WHERE user_id = ?", (candidate_id,)
-    )
-    prof_row = await cursor.fetchone()
+    prof_row = await storage.get_profile(candidate_id)
     if prof_row and prof_row["skills"]:
         skills = json.loads(prof_row["skills"])
         for skill in skills[:10]:
@@ -70,15 +61,11 @@ async def build_candidate_graph(
 
 
 async def build_match_graph(
-    db: aiosqlite.Connection,
+    storage: Storage,
     match_id: str,
 ) -> dict:
     """Build a merged knowledge graph for a match — both candidate and company."""
-    cursor = await db.execute(
-        "SELECT candidate_id, company_id, role_id, dimension_scores FROM matches WHERE id = ?",
-        (match_id,),
-    )
-    match = await cursor.fetchone()
+    match = await storage.get_match(match_id)
     if not match:
         return {"nodes": [], "edges": []}
 
@@ -87,11 +74,11 @@ async def build_match_graph(
     role_id = match["role_id"]
 
     # Build candidate side
-    candidate_graph = await build_candidate_graph(db, candidate_id)
+    candidate_graph = await build_candidate_graph(storage, candidate_id)
 
     # Build company side
     company_nodes, company_edges = await _build_company_nodes(
-        db, company_id, role_id,
+        storage, company_id, role_id,
     )
 
     # Build match connections (dimension compatibility edges)
@@ -106,7 +93,7 @@ async def build_match_graph(
 
 
 async def _build_company_nodes(
-    db: aiosqlite.Connection,
+    storage: Storage,
     company_id: str,
     role_id: str | None,
 ) -> tuple[list[dict], list[dict]]:
@@ -114,10 +101,7 @@ async def _build_company_nodes(
     nodes: list[dict] = []
     edges: list[dict] = []
 
-    cursor = await db.execute(
-        "SELECT name FROM companies WHERE id = ?", (company_id,)
-    )
-    comp = await cursor.fetchone()
+    comp = await storage.get_company(company_id)
     if not comp:
         return nodes, edges
 
@@ -128,10 +112,7 @@ async def _build_company_nodes(
 
     # Role node
     if role_id:
-        cursor = await db.execute(
-            "SELECT title, skills FROM roles WHERE id = ?", (role_id,)
-        )
-        role = await cursor.fetchone()
+        role = await storage.get_role(role_id)
         if role:
             nodes.append({
                 "id": role_id, "label": role["title"],
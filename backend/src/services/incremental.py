@@ -0,0 +1,301 @@
+"""Incremental matcher — re-score only the slice of the pair matrix that changed.
+
+A full ``/api/matching/run`` scores every candidate against every role. When
+one side changes — a candidate's Career DNA, a company's aggregate DNA, a
+role's requirements — only that candidate's row or those roles' columns can
+move, so just that slice is re-scored, by a background worker so the request
+that caused the change does not wait for it.
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Literal
+
+import numpy as np
+from loguru import logger
+
+from src.core.config import settings
+from src.core.week import week_label
+from src.models.dna_score import unpack_dna
+from src.repositories.base import Executor, Storage
+from src.services.bulk_writer import MatchWriter
+from src.services.match_inputs import fetch_candidates, fetch_roles
+from src.services.matching import (
+    batch_l1_filter,
+    batch_l2_compatibility,
+    dimension_breakdown,
+    select_top_k,
+)
+
+RescoreKind = Literal["candidate", "company", "role"]
+
+
+def _kth_best(rows: list[dict], key: str, k: int) -> dict[str, float]:
+    """The k-th highest stored score per ``key`` (only keys with at least k rows)."""
+    grouped: dict[str, list[float]] = defaultdict(list)
+    for row in rows:
+        grouped[row[key]].append(row["score"])
+    return {
+        value: sorted(scores, reverse=True)[k - 1]
+        for value, scores in grouped.items()
+        if len(scores) >= k
+    }
+
+
+def _beats(
+    scores: np.ndarray,
+    ids: list[str],
+    thresholds: dict[str, float],
+    k: int,
+    axis: int,
+) -> np.ndarray:
+    """Pairs that would enter the other side's top K against its stored matches.
+
+    ``ids`` label the other side along ``axis`` (roles for a candidate row,
+    candidates for role columns). Sides with fewer than K stored matches
+    take any pair.
+    """
+    if k <= 0:
+        return np.zeros(scores.shape, dtype=bool)
+    limit = np.array([thresholds.get(i, -1) for i in ids], dtype=np.float64)
+    return scores > (limit[None, :] if axis == 1 else limit[:, None])
+
+
+async def rescore(
+    db: Executor,
+    kind: RescoreKind,
+    entity_id: str,
+) -> dict[str, int]:
+    """Re-score one candidate's row, or the columns of one role / company's roles.
+
+    This week's matches in the slice that neither side has acted on get the
+    new score, and give up their drop slot when it changes so the week's
+    assignment places them again. Those that no longer pass L1 are removed,
+    from any drop they are in too. Pairs that now make either side's top K
+    are added.
+
+    Returns:
+        ``{"updated": n, "removed": n, "created": n}``.
+    """
+    if kind == "candidate":
+        candidates = await fetch_candidates(db, candidate_id=entity_id)
+        roles = await fetch_roles(db)
+    elif kind == "role":
+        candidates = await fetch_candidates(db)
+        roles = await fetch_roles(db, role_id=entity_id)
+    else:
+        candidates = await fetch_candidates(db)
+        roles = await fetch_roles(db, company_id=entity_id)
+
+    if not candidates or not roles:
+        return {"updated": 0, "removed": 0, "created": 0}
+
+    now = datetime.now(tz=timezone.utc)
+    week = week_label(now)
+    per_candidate = settings.matching_top_k_per_candidate
+    per_role = settings.matching_top_k_per_role
+
+    candidate_dna = unpack_dna([c["dna"] for c in candidates])
+    role_dna = unpack_dna([r["dna"] for r in roles])
+    consistency = np.array([c["consistency"] for c in candidates], dtype=np.float64)
+    eligible = batch_l1_filter(candidates, roles)
+    score_matrix = batch_l2_compatibility(candidate_dna, role_dna, consistency)
+
+    role_ids = [r["role_id"] for r in roles]
+    if kind == "candidate":
+        # The candidate's own top K, plus roles whose stored top K it now beats
+        keep = select_top_k(score_matrix, eligible, per_candidate, 0)
+        # Only the roles the candidate passes L1 for can take it
+        open_roles = [role_ids[j] for j in np.flatnonzero(eligible[0])]
+        others = []
+        if open_roles:
+            placeholders = ", ".join("?" for _ in open_roles)
+            others = await db.fetchall(
+                "SELECT role_id, score FROM matches "
+                f"WHERE role_id IN ({placeholders}) "
+                "AND drop_week = ? AND candidate_id != ?",
+                (*open_roles, week, entity_id),
+            )
+        thresholds = _kth_best(others, "role_id", per_role)
+        keep |= eligible & _beats(score_matrix, role_ids, thresholds, per_role, axis=1)
+
+        current = await db.fetchall(
+            "SELECT id, candidate_id, role_id, score, candidate_action, company_action "
+            "FROM matches WHERE drop_week = ? AND candidate_id = ?",
+            (week, entity_id),
+        )
+    else:
+        # Each role's top K, plus candidates whose stored top K it now beats
+        keep = select_top_k(score_matrix, eligible, 0, per_role)
+        placeholders = ", ".join("?" for _ in role_ids)
+        others = await db.fetchall(
+            "SELECT candidate_id, score FROM matches "
+            f"WHERE drop_week = ? AND role_id NOT IN ({placeholders})",
+            (week, *role_ids),
+        )
+        thresholds = _kth_best(others, "candidate_id", per_candidate)
+        candidate_ids = [c["id"] for c in candidates]
+        keep |= eligible & _beats(
+            score_matrix, candidate_ids, thresholds, per_candidate, axis=0,
+        )
+
+        current = await db.fetchall(
+            "SELECT id, candidate_id, role_id, score, candidate_action, company_action "
+            f"FROM matches WHERE drop_week = ? AND role_id IN ({placeholders})",
+            (week, *role_ids),
+        )
+    existing = {(r["candidate_id"], r["role_id"]): r for r in current}
+
+    candidate_pos = {c["id"]: i for i, c in enumerate(candidates)}
+    role_pos = {role_id: j for j, role_id in enumerate(role_ids)}
+    updates: list[tuple] = []
+    removed: list[tuple[str]] = []
+    for (candidate_id, role_id), row in existing.items():
+        # A match someone already acted on keeps the score they saw
+        if row["candidate_action"] or row["company_action"]:
+            continue
+        i, j = candidate_pos.get(candidate_id), role_pos.get(role_id)
+        if i is None or j is None:
+            continue
+        if not eligible[i, j]:
+            removed.append((row["id"],))
+            continue
+        score = int(score_matrix[i, j])
+        if score != row["score"]:
+            updates.append((
+                score,
+                json.dumps(dimension_breakdown(candidate_dna[i], role_dna[j])),
+                row["id"],
+            ))
+
+    async with MatchWriter(db, label=f"rescore {kind}") as writer:
+        if updates:
+            await db.executemany(
+                "UPDATE matches SET score = ?, dimension_scores = ?, drop_slot = NULL "
+                "WHERE id = ?",
+                updates,
+            )
+        if removed:
+            await db.executemany("DELETE FROM drop_matches WHERE match_id = ?", removed)
+            await db.executemany("DELETE FROM matches WHERE id = ?", removed)
+        for i, j in np.argwhere(keep):
+            cand, role = candidates[i], roles[j]
+            if (cand["id"], role["role_id"]) in existing:
+                continue
+            await writer.add(
+                candidate_id=cand["id"],
+                company_id=role["company_id"],
+                role_id=role["role_id"],
+                score=int(score_matrix[i, j]),
+                dimension_scores=dimension_breakdown(candidate_dna[i], role_dna[j]),
+                report=None,
+                drop_week=week,
+                created_at=now.isoformat(),
+            )
+
+    return {
+        "updated": len(updates),
+        "removed": len(removed),
+        "created": writer.stats.rows,
+    }
+
+
+# ── Background queue ────────────────────────────────────────────────
+
+
+class RescoreQueue:
+    """A single background worker that applies rescore jobs in order.
+
+    A job waiting in the queue absorbs repeats of itself, so a burst of
+    changes to the same entity is re-scored once. Each job runs in one
+    storage transaction.
+    """
+
+    def __init__(self, storage: Storage) -> None:
+        self._storage = storage
+        self._queue: asyncio.Queue[tuple[RescoreKind, str]] = asyncio.Queue()
+        self._pending: set[tuple[RescoreKind, str]] = set()
+        self._task: asyncio.Task | None = None
+        self.processed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="rescore-worker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def submit(self, kind: RescoreKind, entity_id: str) -> None:
+        """Queue a rescore unless the same one is already waiting."""
+        job = (kind, entity_id)
+        if job in self._pending:
+            return
+        self._pending.add(job)
+        self._queue.put_nowait(job)
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        await self._queue.join()
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            # Leave the pending set first: a change arriving mid-job re-queues
+            self._pending.discard(job)
+            kind, entity_id = job
+            try:
+                async with self._storage.transaction() as tx:
+                    result = await rescore(tx, kind, entity_id)
+                self.processed += 1
+                logger.info(
+                    "Rescored {} {}: {} updated, {} removed, {} created",
+                    kind, entity_id,
+                    result["updated"], result["removed"], result["created"],
+                )
+            except Exception:
+                self.failed += 1
+                logger.exception("Rescore of {} {} failed", kind, entity_id)
+            finally:
+                self._queue.task_done()
+
+    def metrics(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+_queue: RescoreQueue | None = None
+
+
+def start_rescore_worker(storage: Storage) -> RescoreQueue:
+    global _queue
+    _queue = RescoreQueue(storage)
+    _queue.start()
+    return _queue
+
+
+async def stop_rescore_worker() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
+
+
+def get_rescore_queue() -> RescoreQueue | None:
+    return _queue
+
+
+def enqueue_rescore(kind: RescoreKind, entity_id: str) -> None:
+    """Schedule an incremental rescore; a no-op when no worker is running."""
+    if _queue is not None:
+        _queue.submit(kind, entity_id)
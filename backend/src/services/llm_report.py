@@ -1,10 +1,9 @@
 """LLM-driven match report generation — replaces template reports."""
 
 import json
+from collections.abc import Awaitable, Callable
 
-from openai import AsyncOpenAI
-
-from src.core.config import settings
+from src.core.llm import LLMClient
 from src.models.dna_score import DIMENSIONS, DimensionScores
 from src.services.report import generate_simple_report
 
@@ -42,14 +41,17 @@ REPORT_PROMPT = """你是职遇（TalentDrop）的匹配分析师。请根据以
 
 请用 Markdown 格式输出。"""
 
+SYSTEM_PROMPT = "你是一位专业的人才匹配分析师。"
 
-async def generate_llm_report(
+REPORT_MAX_TOKENS = 1200
+
+
+def build_report_prompt(
     candidate_name: str,
     company_name: str,
     match_score: float,
     candidate_dna: DimensionScores,
     company_dna: DimensionScores,
-    consistency: float = 0.85,
     candidate_title: str | None = None,
     candidate_skills: list[str] | None = None,
     candidate_bio: str | None = None,
@@ -57,22 +59,7 @@ async def generate_llm_report(
     role_skills: list[str] | None = None,
     role_description: str | None = None,
 ) -> str:
-    """Generate a match report using LLM.
-
-    Falls back to template report if no API key is configured.
-    """
-    if not settings.openai_api_key:
-        dim_dict = {d: getattr(candidate_dna, d) for d in DIMENSIONS}
-        return generate_simple_report(
-            candidate_name=candidate_name,
-            company_name=company_name,
-            match_score=match_score,
-            dimension_scores=dim_dict,
-            candidate_dna=candidate_dna,
-            company_dna=company_dna,
-            consistency=consistency,
-        )
-
+    """Fill ``REPORT_PROMPT`` for one match."""
     # Build dimension comparison text
     dim_lines: list[str] = []
     dim_labels = {
@@ -88,7 +75,7 @@ async def generate_llm_report(
             f"  - {dim_labels[dim]}: 候选人 {c_val} vs 企业 {j_val} (差距 {diff})"
         )
 
-    prompt = REPORT_PROMPT.format(
+    return REPORT_PROMPT.format(
         candidate_name=candidate_name,
         candidate_title=candidate_title or "未提供",
         candidate_skills=", ".join(candidate_skills) if candidate_skills else "未提供",
@@ -101,15 +88,73 @@ async def generate_llm_report(
         dimension_comparison="\n".join(dim_lines),
     )
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-    response = await client.chat.completions.create(
-        model=settings.openai_model,
+
+async def complete_report(
+    llm: LLMClient,
+    prompt: str,
+    retries: bool = True,
+    before_send: Callable[[], Awaitable[None]] | None = None,
+) -> tuple[str, int | None]:
+    """Send one report prompt, answered from the LLM cache when possible.
+
+    ``retries`` False skips the client's retries; ``before_send`` is awaited
+    only when the request is actually sent.
+
+    Returns:
+        ``(report, total_tokens)`` — tokens as reported by the API, if any.
+    """
+    response = await llm.chat(
+        "report",
+        cache=True,
+        retries=retries,
+        before_send=before_send,
         messages=[
-            {"role": "system", "content": "你是一位专业的人才匹配分析师。"},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
         temperature=0.7,
-        max_tokens=1200,
+        max_tokens=REPORT_MAX_TOKENS,
     )
+    usage = response.usage.total_tokens if response.usage else None
+    return response.choices[0].message.content or "报告生成失败", usage
+
 
-    return response.choices[0].message.content or "报告生成失败"
+async def generate_llm_report(
+    candidate_name: str,
+    company_name: str,
+    match_score: float,
+    candidate_dna: DimensionScores,
+    company_dna: DimensionScores,
+    consistency: float = 0.85,
+    candidate_title: str | None = None,
+    candidate_skills: list[str] | None = None,
+    candidate_bio: str | None = None,
+    role_title: str | None = None,
+    role_skills: list[str] | None = None,
+    role_description: str | None = None,
+    llm: LLMClient | None = None,
+) -> str:
+    """Generate a match report using LLM.
+
+    Falls back to template report if no API key is configured (``llm``
+    None). Batches of reports go through ``report_pipeline`` instead.
+    """
+    if llm is None:
+        dim_dict = {d: getattr(candidate_dna, d) for d in DIMENSIONS}
+        return generate_simple_report(
+            candidate_name=candidate_name,
+            company_name=company_name,
+            match_score=match_score,
+            dimension_scores=dim_dict,
+            candidate_dna=candidate_dna,
+            company_dna=company_dna,
+            consistency=consistency,
+        )
+
+    prompt = build_report_prompt(
+        candidate_name, company_name, match_score, candidate_dna, company_dna,
+        candidate_title, candidate_skills, candidate_bio,
+        role_title, role_skills, role_description,
+    )
+    report, _ = await complete_report(llm, prompt)
+    return report
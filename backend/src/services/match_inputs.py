@@ -0,0 +1,107 @@
+"""Matching inputs — candidates and roles with their DNA, loaded for the engine.
+
+Each entity's DNA comes back as its compact ``encode_dna`` vector, so the
+engine builds its matrices with ``unpack_dna`` instead of parsing JSON.
+"""
+
+import json
+
+from src.models.dna_score import encode_dna
+from src.repositories.base import Executor
+from src.services.dna_cache import dna_cache
+
+
+def _vector(row: dict, entity_type: str, entity_id: str) -> bytes:
+    """The row's compact DNA vector, encoded from the JSON when not stored yet."""
+    if row["vector"] is not None:
+        return row["vector"]
+    return encode_dna(
+        dna_cache.parse(entity_type, entity_id, row["scores"], row["consistency"]),
+    )
+
+
+async def fetch_candidates(
+    db: Executor,
+    candidate_id: str | None = None,
+) -> list[dict]:
+    """Fetch candidates with DNA scores and profile info (all, or just one)."""
+    sql = """
+        SELECT u.id, u.name, ds.scores, ds.vector, ds.consistency,
+               p.skills, p.location, p.remote_preference
+        FROM users u
+        JOIN dna_scores ds ON ds.entity_id = u.id AND ds.entity_type = 'candidate'
+        LEFT JOIN user_profiles p ON p.user_id = u.id
+        WHERE u.role = 'candidate'
+    """
+    params: tuple = ()
+    if candidate_id is not None:
+        sql += " AND u.id = ?"
+        params = (candidate_id,)
+
+    rows = await db.fetchall(sql, params)
+    return [
+        {
+            "id": r["id"],
+            "name": r["name"],
+            "dna": _vector(r, "candidate", r["id"]),
+            "consistency": r["consistency"],
+            "skills": json.loads(r["skills"]) if r["skills"] else None,
+            "location": r["location"],
+        }
+        for r in rows
+    ]
+
+
+async def fetch_roles(
+    db: Executor,
+    role_id: str | None = None,
+    company_id: str | None = None,
+) -> list[dict]:
+    """Fetch active roles with their company DNA scores.
+
+    Optionally narrowed to one role or to the roles of one company.
+    """
+    sql = """
+        SELECT r.id as role_id, r.company_id, r.title, r.skills,
+               r.location, r.remote_policy,
+               c.name as company_name,
+               ds.scores, ds.vector, ds.consistency
+        FROM roles r
+        JOIN companies c ON c.id = r.company_id
+        JOIN dna_scores ds ON ds.entity_id = r.company_id
+                          AND ds.entity_type = 'company'
+        WHERE r.is_active = 1
+    """
+    params: list = []
+    if role_id is not None:
+        sql += " AND r.id = ?"
+        params.append(role_id)
+    if company_id is not None:
+        sql += " AND r.company_id = ?"
+        params.append(company_id)
+
+    rows = await db.fetchall(sql, params)
+    return [
+        {
+            "role_id": r["role_id"],
+            "company_id": r["company_id"],
+            "company_name": r["company_name"],
+            "title": r["title"],
+            "skills": json.loads(r["skills"]) if r["skills"] else None,
+            "location": r["location"],
+            "remote_policy": r["remote_policy"],
+            "dna": _vector(r, "company", r["company_id"]),
+        }
+        for r in rows
+    ]
+
+
+async def fetch_existing_pairs(
+    db: Executor, week_label: str,
+) -> set[tuple[str, str]]:
+    """Fetch the (candidate_id, role_id) pairs already matched this week."""
+    rows = await db.fetchall(
+        "SELECT candidate_id, role_id FROM matches WHERE drop_week = ?",
+        (week_label,),
+    )
+    return {(r["candidate_id"], r["role_id"]) for r in rows}
@@ -1,7 +1,11 @@
 """L1-L2 matching engine — DNA compatibility scoring between candidate and role."""
 
+from collections import defaultdict
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+import numpy as np
+
 from src.models.dna_score import DIMENSIONS, DimensionScores
 
 
@@ -130,3 +134,197 @@ def run_matching(
         l1_total=l1_total,
         l1_passed=l1_total,  # demo: all pass L1
     )
+
+
+# ── Batch engine ────────────────────────────────────────────────────
+#
+# ``_l2_dna_compatibility`` / ``run_matching`` remain the reference
+# implementation for a single pair. The functions below compute the same
+# L2 scores for a whole population at once on (N, 8) / (M, 8) matrices.
+# ``select_top_k`` then trims the (N, M) result to the pairs a drop can use.
+
+
+def pack_dna(profiles: Sequence[DimensionScores]) -> np.ndarray:
+    """Pack DNA profiles into an (N, 8) float64 matrix in ``DIMENSIONS`` order."""
+    matrix = np.empty((len(profiles), len(DIMENSIONS)), dtype=np.float64)
+    for i, profile in enumerate(profiles):
+        matrix[i] = [getattr(profile, dim) for dim in DIMENSIONS]
+    return matrix
+
+
+class CandidateIndex:
+    """Inverted L1 index over a candidate population, built once per run.
+
+    Maps each lowercased skill and each location to the positions of the
+    candidates that have it. Candidates without skills (or without a
+    location) pass that check for every role, exactly as in
+    ``_l1_boolean_filter``, so they are kept in separate wildcard sets.
+    """
+
+    def __init__(self, candidates: Sequence[dict]) -> None:
+        self.size = len(candidates)
+        self._by_skill: dict[str, set[int]] = defaultdict(set)
+        self._by_location: dict[str, set[int]] = defaultdict(set)
+        self._no_skills: set[int] = set()
+        self._no_location: set[int] = set()
+        for i, cand in enumerate(candidates):
+            skills = cand.get("skills")
+            if skills:
+                for skill in skills:
+                    self._by_skill[skill.lower()].add(i)
+            else:
+                self._no_skills.add(i)
+            location = cand.get("location")
+            if location:
+                self._by_location[location].add(i)
+            else:
+                self._no_location.add(i)
+
+    def eligible(
+        self,
+        role_skills: list[str] | None,
+        role_location: str | None,
+        role_remote_policy: str | None,
+    ) -> np.ndarray:
+        """Positions of the candidates that pass L1 for one role."""
+        if role_remote_policy == "remote":
+            return np.arange(self.size)
+
+        passed: set[int] | None = None  # None: no constraint yet, everyone
+        if role_location and role_remote_policy == "onsite":
+            passed = self._by_location.get(role_location, set()) | self._no_location
+        if role_skills:
+            overlap = self._no_skills.union(
+                *(self._by_skill.get(skill.lower(), ()) for skill in role_skills)
+            )
+            passed = overlap if passed is None else passed & overlap
+
+        if passed is None:
+            return np.arange(self.size)
+        return np.fromiter(passed, dtype=np.intp, count=len(passed))
+
+
+def batch_l1_filter(
+    candidates: Sequence[dict],
+    roles: Sequence[dict],
+) -> np.ndarray:
+    """L1 for every candidate x role pair — (N, M) bool mask of passing pairs.
+
+    Candidates carry ``skills`` / ``location``; roles carry ``skills`` /
+    ``location`` / ``remote_policy`` (the dicts built by the matching API).
+    Each role's column is filled from a ``CandidateIndex`` lookup instead of
+    testing every pair; ``mask.sum()`` is the run's ``l1_passed`` count.
+    """
+    index = CandidateIndex(candidates)
+    mask = np.zeros((len(candidates), len(roles)), dtype=bool)
+    for j, role in enumerate(roles):
+        mask[index.eligible(
+            role.get("skills"), role.get("location"), role.get("remote_policy"),
+        ), j] = True
+    return mask
+
+
+def batch_l2_compatibility(
+    candidate_dna: np.ndarray,
+    company_dna: np.ndarray,
+    consistency: np.ndarray,
+) -> np.ndarray:
+    """L2 for every candidate x company pair — vectorised ``_l2_dna_compatibility``.
+
+    Args:
+        candidate_dna: (N, 8) candidate DNA matrix from ``pack_dna``.
+        company_dna: (M, 8) company DNA matrix (one row per role).
+        consistency: (N,) candidate consistency scores.
+
+    Returns:
+        (N, M) int64 matrix of overall match percentages (0-100).
+
+    Dimensions are accumulated one at a time, in ``DIMENSIONS`` order, so the
+    float arithmetic (and therefore the rounding) is identical to the
+    pairwise reference and memory stays at O(N·M).
+    """
+    total = np.zeros((candidate_dna.shape[0], company_dna.shape[0]))
+    for d in range(len(DIMENSIONS)):
+        diff = np.abs(candidate_dna[:, d, None] - company_dna[None, :, d])
+        total += 1.0 - diff / 100.0
+
+    final = (total / len(DIMENSIONS)) * consistency[:, None]
+    # np.rint rounds half to even, exactly like the built-in round()
+    return np.clip(np.rint(final * 100), 0, 100).astype(np.int64)
+
+
+def pair_compatibility(
+    candidate_dna: np.ndarray,
+    company_dna: np.ndarray,
+    consistency: np.ndarray | float,
+) -> np.ndarray:
+    """L2 for explicit pairs — element-wise ``batch_l2_compatibility``.
+
+    The inputs broadcast against each other, e.g. (P, 8) candidate rows with
+    (P, 8) company rows, or one (8,) profile against an (N, 8) matrix. The
+    same per-dimension accumulation gives bit-identical scores.
+    """
+    candidate_dna = np.asarray(candidate_dna, dtype=np.float64)
+    company_dna = np.asarray(company_dna, dtype=np.float64)
+    total = np.zeros(np.broadcast_shapes(candidate_dna.shape, company_dna.shape)[:-1])
+    for d in range(len(DIMENSIONS)):
+        total += 1.0 - np.abs(candidate_dna[..., d] - company_dna[..., d]) / 100.0
+
+    final = (total / len(DIMENSIONS)) * consistency
+    return np.clip(np.rint(final * 100), 0, 100).astype(np.int64)
+
+
+def dimension_breakdown(
+    candidate_vec: np.ndarray,
+    company_vec: np.ndarray,
+) -> dict[str, float]:
+    """Per-dimension compatibility for one pair, as stored in ``matches``.
+
+    Equivalent to ``_l2_dna_compatibility(...)[1].model_dump()`` without
+    building a ``DimensionScores`` model.
+    """
+    compat = 1.0 - np.abs(candidate_vec - company_vec) / 100.0
+    return {
+        dim: round(float(value) * 100, 2)
+        for dim, value in zip(DIMENSIONS, compat)
+    }
+
+
+def _top_k_along(scores: np.ndarray, k: int, axis: int) -> np.ndarray:
+    """Mask of the ``k`` highest entries along ``axis`` (all of them if fewer)."""
+    keep = np.zeros(scores.shape, dtype=bool)
+    if k <= 0:
+        return keep
+    if k >= scores.shape[axis]:
+        keep[:] = True
+        return keep
+    idx = np.argpartition(-scores, k - 1, axis=axis)
+    idx = idx[:, :k] if axis == 1 else idx[:k, :]
+    np.put_along_axis(keep, idx, True, axis=axis)
+    return keep
+
+
+def select_top_k(
+    scores: np.ndarray,
+    eligible: np.ndarray,
+    per_candidate: int,
+    per_role: int,
+) -> np.ndarray:
+    """Keep each candidate's and each role's best eligible pairs.
+
+    Args:
+        scores: (N, M) score matrix from ``batch_l2_compatibility``.
+        eligible: (N, M) L1 mask from ``batch_l1_filter``.
+        per_candidate: Pairs to keep per candidate (row); 0 keeps none.
+        per_role: Pairs to keep per role (column); 0 keeps none.
+
+    Returns:
+        (N, M) bool mask — the union of per-row and per-column top-K, limited
+        to eligible pairs, so at most ``per_candidate·N + per_role·M`` pairs.
+        Ties at the cut-off are broken arbitrarily.
+    """
+    # Ineligible pairs sort below every real score (0-100)
+    masked = np.where(eligible, scores, -1)
+    keep = _top_k_along(masked, per_candidate, axis=1)
+    keep |= _top_k_along(masked, per_role, axis=0)
+    return keep & eligible
@@ -0,0 +1,431 @@
+"""Matching jobs — full matching runs in the background, with progress and cancel.
+
+``POST /api/matching/run`` queues a job and returns at once; a single worker
+runs jobs one after another. Each job is a row in ``matching_jobs``, so a
+restart re-queues whatever was queued or half-finished. That is safe to
+repeat: a job's matches are committed in the same transaction that marks
+it completed, and pairs already matched in the job's week are skipped.
+
+A completed job also records each role's L1 funnel in ``role_funnels``,
+which the pipeline view reads instead of re-running the filter.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Literal
+
+import numpy as np
+from loguru import logger
+
+from src.core.config import settings
+from src.core.week import week_label
+from src.models.dna_score import unpack_dna
+from src.repositories.base import Executor, Storage
+from src.services.bulk_writer import MatchWriter
+from src.services.dna_index import top_k_pairs
+from src.services.match_inputs import (
+    fetch_candidates,
+    fetch_existing_pairs,
+    fetch_roles,
+)
+from src.services.matching import (
+    batch_l1_filter,
+    dimension_breakdown,
+    pair_compatibility,
+)
+from src.services.sharded_matching import sharded_top_k
+
+MatchingMode = Literal["top_k", "all", "sharded"]
+
+_ACTIVE = ("queued", "running")
+
+_UPSERT_FUNNEL = """
+    INSERT INTO role_funnels (role_id, total_candidates, l1_passed, job_id, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (role_id) DO UPDATE SET
+        total_candidates = excluded.total_candidates,
+        l1_passed = excluded.l1_passed,
+        job_id = excluded.job_id,
+        updated_at = excluded.updated_at
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once a cancel has been requested."""
+
+
+@dataclass
+class JobProgress:
+    """Live state of the running job, shared with the scoring thread."""
+
+    id: str
+    mode: MatchingMode
+    drop_week: str
+    status: str = "queued"
+    phase: str | None = None  # "scoring", then "writing"
+    pairs_total: int = 0
+    pairs_scored: int = 0
+    l1_passed: int = 0
+    role_l1_passed: list[int] = field(default_factory=list, repr=False)
+    rows_selected: int = 0
+    rows_written: int = 0
+    error: str | None = None
+    cancel_requested: bool = False
+    phase_started: float = field(default_factory=time.perf_counter)
+    finished: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def check_cancelled(self) -> None:
+        if self.cancel_requested:
+            raise JobCancelled(self.id)
+
+    def on_scoring(self, done: int, total: int) -> None:
+        """Progress callback for the selectors; doubles as the cancel point."""
+        self.pairs_scored = self.pairs_total * done // max(total, 1)
+        self.check_cancelled()
+
+    def start_phase(self, phase: str) -> None:
+        self.phase = phase
+        self.phase_started = time.perf_counter()
+
+    def eta_seconds(self) -> float | None:
+        """Remaining time of the current phase, extrapolated from its rate."""
+        if self.phase == "scoring":
+            done, total = self.pairs_scored, self.pairs_total
+        elif self.phase == "writing":
+            done, total = self.rows_written, self.rows_selected
+        else:
+            return None
+        if done <= 0:
+            return None
+        elapsed = time.perf_counter() - self.phase_started
+        return round(elapsed * (total - done) / done, 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "status": self.status,
+            "phase": self.phase,
+            "drop_week": self.drop_week,
+            "pairs_total": self.pairs_total,
+            "pairs_scored": self.pairs_scored,
+            "l1_passed": self.l1_passed,
+            "rows_selected": self.rows_selected,
+            "rows_written": self.rows_written,
+            "eta_seconds": self.eta_seconds(),
+            "error": self.error,
+        }
+
+
+def _select_pairs(
+    job: JobProgress,
+    candidates: list[dict],
+    roles: list[dict],
+    candidate_dna: np.ndarray,
+    consistency: np.ndarray,
+    role_dna: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pick the pairs to persist for ``job.mode``; runs in a worker thread.
+
+    ``top_k`` persists only each candidate's and each role's best pairs —
+    all a drop ever reads; ``all`` persists every L1-passing pair.
+    ``sharded`` selects the same top K as ``top_k`` in worker processes.
+
+    Returns:
+        ``(rows, cols, scores)`` of the selected pairs.
+    """
+    per_candidate = settings.matching_top_k_per_candidate
+    per_role = settings.matching_top_k_per_role
+    if job.mode == "sharded":
+        result = sharded_top_k(
+            candidates,
+            roles,
+            candidate_dna,
+            consistency,
+            role_dna,
+            per_candidate=per_candidate,
+            per_role=per_role,
+            workers=settings.matching_workers,
+            progress=job.on_scoring,
+        )
+        job.role_l1_passed = result.role_l1_passed.tolist()
+        job.l1_passed = result.l1_passed
+        return result.rows, result.cols, result.scores
+
+    eligible = batch_l1_filter(candidates, roles)
+    job.role_l1_passed = eligible.sum(axis=0).tolist()
+    job.l1_passed = sum(job.role_l1_passed)
+    if job.mode == "top_k":
+        # Top-K selection goes through the DNA index, so only the selected
+        # pairs get scored
+        selected = top_k_pairs(
+            candidate_dna,
+            consistency,
+            role_dna,
+            eligible,
+            per_candidate=per_candidate,
+            per_role=per_role,
+            progress=job.on_scoring,
+        )
+    else:
+        selected = eligible
+    rows, cols = np.nonzero(selected)
+    scores = pair_compatibility(candidate_dna[rows], role_dna[cols], consistency[rows])
+    job.on_scoring(1, 1)
+    return rows, cols, scores
+
+
+async def _save_state(db: Executor, job: JobProgress, **times: str) -> None:
+    """Write the job's counters and status (and any timestamps)."""
+    assignments = "".join(f", {column} = ?" for column in times)
+    await db.execute(
+        "UPDATE matching_jobs SET status = ?, pairs_total = ?, pairs_scored = ?, "
+        f"l1_passed = ?, rows_written = ?, error = ?{assignments} WHERE id = ?",
+        (
+            job.status, job.pairs_total, job.pairs_scored, job.l1_passed,
+            job.rows_written, job.error, *times.values(), job.id,
+        ),
+    )
+
+
+async def run_matching_job(storage: Storage, job: JobProgress) -> None:
+    """Score and persist one matching run, updating ``job`` as it goes.
+
+    Inputs are read outside any transaction and pairs are selected in a
+    thread, so a transaction is only open for the final write. Raises
+    ``JobCancelled`` if a cancel arrives first; nothing of the run is
+    written then.
+    """
+    candidates = await fetch_candidates(storage)
+    roles = await fetch_roles(storage)
+    existing = await fetch_existing_pairs(storage, job.drop_week)
+
+    job.pairs_total = len(candidates) * len(roles)
+    job.start_phase("scoring")
+    if candidates and roles:
+        candidate_dna = unpack_dna([c["dna"] for c in candidates])
+        role_dna = unpack_dna([r["dna"] for r in roles])
+        consistency = np.array([c["consistency"] for c in candidates], dtype=np.float64)
+        # Select before skipping existing pairs so a re-run in the same week
+        # picks the same pairs instead of the next best ones
+        rows, cols, scores = await asyncio.to_thread(
+            _select_pairs, job, candidates, roles, candidate_dna, consistency, role_dna,
+        )
+    else:
+        rows = cols = scores = np.empty(0, dtype=np.intp)
+
+    pending = [
+        (i, j, score)
+        for i, j, score in zip(rows.tolist(), cols.tolist(), scores.tolist())
+        if (candidates[i]["id"], roles[j]["role_id"]) not in existing
+    ]
+    job.rows_selected = len(pending)
+    job.check_cancelled()
+
+    job.start_phase("writing")
+    created_at = datetime.now(tz=timezone.utc).isoformat()
+    async with storage.transaction() as tx:
+        async with MatchWriter(tx, label=f"matching job {job.id}") as writer:
+            for n, (i, j, score) in enumerate(pending, 1):
+                cand, role = candidates[i], roles[j]
+                # Reports are rendered on first view (see services.report_cache)
+                await writer.add(
+                    candidate_id=cand["id"],
+                    company_id=role["company_id"],
+                    role_id=role["role_id"],
+                    score=score,
+                    dimension_scores=dimension_breakdown(candidate_dna[i], role_dna[j]),
+                    report=None,
+                    drop_week=job.drop_week,
+                    created_at=created_at,
+                )
+                if not n % settings.bulk_insert_chunk_size:
+                    job.rows_written = writer.rows_written
+                    job.check_cancelled()
+                    await asyncio.sleep(0)  # let status requests through
+            await writer.flush()
+            job.rows_written = writer.rows_written
+            await tx.executemany(_UPSERT_FUNNEL, [
+                (role["role_id"], len(candidates), passed, job.id, created_at)
+                for role, passed in zip(roles, job.role_l1_passed)
+            ])
+            job.status = "completed"
+            # Committed together with the matches
+            await _save_state(tx, job, finished_at=created_at)
+
+
+# ── Job runner ──────────────────────────────────────────────────────
+
+
+def _row_to_snapshot(row: dict) -> dict:
+    return {
+        "id": row["id"],
+        "mode": row["mode"],
+        "status": row["status"],
+        "phase": None,
+        "drop_week": row["drop_week"],
+        "pairs_total": row["pairs_total"],
+        "pairs_scored": row["pairs_scored"],
+        "l1_passed": row["l1_passed"],
+        "rows_selected": None,
+        "rows_written": row["rows_written"],
+        "eta_seconds": None,
+        "error": row["error"],
+    }
+
+
+class MatchingJobRunner:
+    """A single background worker that runs matching jobs in submission order.
+
+    Jobs are persisted on submit; ``start()`` re-queues any job a previous
+    process left queued or running.
+    """
+
+    def __init__(self, storage: Storage) -> None:
+        self._storage = storage
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._jobs: dict[str, JobProgress] = {}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        rows = await self._storage.fetchall(
+            "SELECT id, mode, drop_week FROM matching_jobs "
+            "WHERE status IN (?, ?) ORDER BY created_at",
+            _ACTIVE,
+        )
+        for row in rows:
+            self._enqueue(JobProgress(row["id"], row["mode"], row["drop_week"]))
+        if rows:
+            logger.info("Resuming {} unfinished matching job(s)", len(rows))
+        self._task = asyncio.create_task(self._run(), name="matching-jobs")
+
+    async def stop(self) -> None:
+        """Stop the worker; an interrupted job stays ``running`` and resumes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _enqueue(self, job: JobProgress) -> None:
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job.id)
+
+    async def submit(self, mode: MatchingMode) -> dict:
+        """Persist and queue a matching run for the current drop week."""
+        now = datetime.now(tz=timezone.utc)
+        job = JobProgress(str(uuid.uuid4()), mode, week_label(now))
+        await self._storage.execute(
+            "INSERT INTO matching_jobs (id, mode, status, drop_week, created_at) "
+            "VALUES (?, ?, 'queued', ?, ?)",
+            (job.id, job.mode, job.drop_week, now.isoformat()),
+        )
+        self._enqueue(job)
+        return job.snapshot()
+
+    async def get(self, job_id: str) -> dict | None:
+        """Live progress of a queued or running job, else its persisted state."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        row = await self._storage.fetchone(
+            "SELECT * FROM matching_jobs WHERE id = ?", (job_id,),
+        )
+        return _row_to_snapshot(row) if row else None
+
+    async def wait(self, job_id: str) -> dict | None:
+        """Wait for a job to finish and return its final state."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            await job.finished.wait()
+        return await self.get(job_id)
+
+    async def cancel(self, job_id: str) -> dict | None:
+        """Request cancellation; a queued job is dropped before it starts.
+
+        Returns:
+            The job's state, or None if there is no such job. Finished jobs
+            are returned unchanged.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self.get(job_id)
+        job.cancel_requested = True
+        if job.status == "queued":
+            await self._finish(job, "cancelled")
+        return job.snapshot()
+
+    async def _finish(self, job: JobProgress, job_status: str) -> None:
+        job.status = job_status
+        self._jobs.pop(job.id, None)
+        try:
+            finished_at = datetime.now(tz=timezone.utc).isoformat()
+            await _save_state(self._storage, job, finished_at=finished_at)
+        finally:
+            job.finished.set()
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            # Cancelled while queued
+            if job is None:
+                continue
+
+            try:
+                await self._run_job(job)
+            except Exception:
+                # Its row keeps the last saved status; an active one resumes
+                # on the next start
+                logger.exception("Could not record the state of matching job {}", job.id)
+            finally:
+                # Waiters (the weekly scheduler) must never hang on a job
+                self._jobs.pop(job.id, None)
+                job.finished.set()
+
+    async def _run_job(self, job: JobProgress) -> None:
+        job.status = "running"
+        started_at = datetime.now(tz=timezone.utc).isoformat()
+        await _save_state(self._storage, job, started_at=started_at)
+
+        try:
+            await run_matching_job(self._storage, job)
+            logger.info(
+                "Matching job {} ({}) completed: {} matches created",
+                job.id, job.mode, job.rows_written,
+            )
+        except JobCancelled:
+            job.rows_written = 0
+            await self._finish(job, "cancelled")
+            logger.info("Matching job {} cancelled", job.id)
+        except Exception as exc:
+            job.error = str(exc) or type(exc).__name__
+            job.rows_written = 0
+            await self._finish(job, "failed")
+            logger.exception("Matching job {} failed", job.id)
+
+
+_runner: MatchingJobRunner | None = None
+
+
+async def start_job_runner(storage: Storage) -> MatchingJobRunner:
+    global _runner
+    _runner = MatchingJobRunner(storage)
+    await _runner.start()
+    return _runner
+
+
+async def stop_job_runner() -> None:
+    global _runner
+    if _runner is not None:
+        await _runner.stop()
+        _runner = None
+
+
+def get_job_runner() -> MatchingJobRunner | None:
+    return _runner
@@ -0,0 +1,118 @@
+"""Lazy match reports — generated on first view and cached in ``matches.report``.
+
+A matching run stores matches without a report. The first read renders it
+with ``generate_simple_report`` and saves it next to ``report_key``, a hash
+of everything the report is built from; when either side's DNA (or a name,
+or the score) changes, the key no longer matches and the report is rebuilt.
+LLM reports written by ``report_pipeline`` are kept under the same key with
+``LLM_KEY_PREFIX``, so they survive reads until their inputs change.
+"""
+
+import hashlib
+import json
+
+from src.models.dna_score import DimensionScores
+from src.repositories.base import Storage
+from src.services.report import generate_simple_report
+
+# Bump when the report template changes to invalidate every cached report
+REPORT_VERSION = 1
+
+LLM_KEY_PREFIX = "llm:"
+
+
+def report_key(
+    candidate_name: str,
+    company_name: str,
+    score: float,
+    candidate_dna: DimensionScores,
+    company_dna: DimensionScores,
+    consistency: float,
+) -> str:
+    """Hash of a report's inputs."""
+    payload = json.dumps(
+        [
+            REPORT_VERSION,
+            candidate_name,
+            company_name,
+            score,
+            candidate_dna.model_dump(),
+            company_dna.model_dump(),
+            consistency,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def row_report_key(row: dict) -> str | None:
+    """``report_key`` of one row of report inputs; None without both DNA scores."""
+    if not row["candidate_scores"] or not row["company_scores"]:
+        return None
+    return report_key(
+        row["candidate_name"],
+        row["company_name"] or "Unknown",
+        int(row["score"]),
+        DimensionScores.model_validate_json(row["candidate_scores"]),
+        DimensionScores.model_validate_json(row["company_scores"]),
+        row["consistency"],
+    )
+
+
+def template_report(row: dict) -> str:
+    """The template report for one row of report inputs with both DNA scores."""
+    return generate_simple_report(
+        candidate_name=row["candidate_name"],
+        company_name=row["company_name"] or "Unknown",
+        match_score=int(row["score"]),
+        dimension_scores=json.loads(row["dimension_scores"]),
+        candidate_dna=DimensionScores.model_validate_json(row["candidate_scores"]),
+        company_dna=DimensionScores.model_validate_json(row["company_scores"]),
+        consistency=row["consistency"],
+    )
+
+
+def _refresh(row: dict) -> tuple[str | None, str | None]:
+    """A report for one row of report inputs (see ``get_match_report_inputs``).
+
+    Falls back to whatever is stored when the inputs are gone (e.g. a DNA
+    score was never computed), since the report cannot be rebuilt then.
+
+    Returns:
+        ``(report, key)`` — ``key`` is set only when the report was
+        (re)generated and needs saving.
+    """
+    key = row_report_key(row)
+    if key is None:
+        return row["report"], None
+    if row["report"] and row["report_key"] in (key, LLM_KEY_PREFIX + key):
+        return row["report"], None
+    return template_report(row), key
+
+
+async def ensure_report(storage: Storage, match_id: str) -> str | None:
+    """Return the match's report, generating and caching it if stale."""
+    row = await storage.get_match_report_inputs(match_id)
+    if not row:
+        return None
+    report, key = _refresh(row)
+    if key is not None:
+        await storage.save_match_report(match_id, report, key)
+    return report
+
+
+async def ensure_reports(storage: Storage, matches: list[dict]) -> None:
+    """Fill in ``report`` for match rows that already carry their report inputs.
+
+    Rows from ``get_latest_drop_matches`` qualify; stale reports are saved
+    in one batch.
+    """
+    stale: list[tuple[str, str, str]] = []
+    for match in matches:
+        report, key = _refresh(match)
+        if key is not None:
+            stale.append((match["id"], report, key))
+        match["report"] = report
+    if stale:
+        await storage.save_match_reports(stale)
@@ -0,0 +1,256 @@
+"""LLM report pipeline — generate reports for the matches in a week's drops.
+
+Every match that made it into a drop gets an LLM report, written back to
+``matches.report`` under ``LLM_KEY_PREFIX`` + its report key so reads keep
+it (see ``report_cache``). Requests run on a fixed pool of workers sharing
+one client and a per-minute token budget, and are retried with exponential
+backoff on rate limits, timeouts and server errors. Prompts already answered
+are served from the LLM response cache without touching the budget. A match
+whose request still fails gets the template report, saved under the plain
+key so the next run tries the LLM again.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+import openai
+from loguru import logger
+
+from src.core.config import settings
+from src.core.llm import LLMClient
+from src.core.week import week_label
+from src.models.dna_score import DimensionScores
+from src.repositories.base import Storage
+from src.services.llm_report import (
+    REPORT_MAX_TOKENS,
+    build_report_prompt,
+    complete_report,
+)
+from src.services.report_cache import LLM_KEY_PREFIX, row_report_key, template_report
+
+# Reports written back per batch
+_SAVE_EVERY = 20
+
+# Backoff before retry n is about _BACKOFF_BASE * 2**n seconds, capped
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 30.0
+
+_RETRYABLE = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes timeouts
+    openai.InternalServerError,
+)
+
+
+class TokenBudget:
+    """Token bucket refilled at ``tokens_per_minute``, shared by all workers.
+
+    A request reserves its estimated tokens before it is sent and settles
+    the difference once the API reports what it actually used, so an
+    underestimate delays the following requests instead of overrunning.
+    """
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        self._capacity = float(max(1, tokens_per_minute))
+        self._rate = self._capacity / 60
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate,
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until ``tokens`` are available, then take them."""
+        tokens = min(tokens, self._capacity)
+        # One waiter at a time, so requests are served in order
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= tokens
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Return the unused part of a reservation (or charge the overrun)."""
+        self._refill()
+        self._tokens = min(self._capacity, self._tokens + reserved - used)
+
+
+def _estimate_tokens(prompt: str) -> int:
+    # The prompt is mostly CJK, about one token per character; assume the
+    # full completion until the API says otherwise
+    return len(prompt) + REPORT_MAX_TOKENS
+
+
+def _backoff(attempt: int, exc: Exception) -> float:
+    delay = min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** attempt)
+    delay *= 0.5 + random.random() / 2
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(delay, float(retry_after)) if retry_after else delay
+    except ValueError:
+        return delay
+
+
+def _skills(value: str | None) -> list[str] | None:
+    return json.loads(value) if value else None
+
+
+def _prompt(row: dict) -> str:
+    return build_report_prompt(
+        candidate_name=row["candidate_name"],
+        company_name=row["company_name"] or "Unknown",
+        match_score=int(row["score"]),
+        candidate_dna=DimensionScores.model_validate_json(row["candidate_scores"]),
+        company_dna=DimensionScores.model_validate_json(row["company_scores"]),
+        candidate_title=row["candidate_title"],
+        candidate_skills=_skills(row["candidate_skills"]),
+        candidate_bio=row["candidate_bio"],
+        role_title=row["role_title"],
+        role_skills=_skills(row["role_skills"]),
+        role_description=row["role_description"],
+    )
+
+
+async def _generate(
+    llm: LLMClient,
+    budget: TokenBudget,
+    row: dict,
+    key: str,
+    stats: dict[str, int],
+) -> tuple[str, str]:
+    """One match's ``(report, report_key)`` — the LLM's, or the template's."""
+    try:
+        prompt = _prompt(row)
+    except Exception as exc:
+        # Inputs the prompt cannot be built from (e.g. malformed skills)
+        # get the template report like any other failed request
+        logger.warning("LLM report for match {} failed: {}", row["id"], exc)
+        stats["fallback"] += 1
+        return template_report(row), key
+    reserved = _estimate_tokens(prompt)
+    sent = False
+
+    async def reserve() -> None:
+        # Only requests that actually go out (not cache hits) take budget
+        nonlocal sent
+        await budget.acquire(reserved)
+        sent = True
+
+    for attempt in range(settings.llm_report_max_retries + 1):
+        sent = False
+        try:
+            # Retried here rather than by the client, within the token budget
+            report, used = await complete_report(
+                llm, prompt, retries=False, before_send=reserve,
+            )
+        except _RETRYABLE as exc:
+            if sent:
+                budget.settle(reserved, 0)
+            if attempt == settings.llm_report_max_retries:
+                logger.warning("LLM report for match {} failed: {}", row["id"], exc)
+                break
+            stats["retries"] += 1
+            await asyncio.sleep(_backoff(attempt, exc))
+        except Exception as exc:
+            # Anything else (a rejected request, a bad response) is not
+            # retried, and must not cancel the other workers
+            if sent:
+                budget.settle(reserved, 0)
+            logger.warning("LLM report for match {} failed: {}", row["id"], exc)
+            break
+        else:
+            stats["generated"] += 1
+            if not sent:
+                stats["cached"] += 1
+                return report, LLM_KEY_PREFIX + key
+            used = reserved if used is None else used
+            budget.settle(reserved, used)
+            stats["tokens"] += used
+            return report, LLM_KEY_PREFIX + key
+
+    stats["fallback"] += 1
+    return template_report(row), key
+
+
+async def generate_drop_reports(
+    storage: Storage,
+    llm: LLMClient | None,
+    week: str | None = None,
+) -> dict[str, int]:
+    """Generate LLM reports for the matches in ``week``'s drops (default: this week).
+
+    Matches whose LLM report is still current are skipped, as are matches
+    missing either DNA score (their report cannot be built). Nothing is
+    generated without an LLM client.
+
+    Returns:
+        Counts: ``matches`` in the drops, ``current`` / ``missing_dna``
+        skipped, ``generated`` by the LLM (``cached`` of them answered from
+        the response cache), ``fallback`` template reports, ``retries`` and
+        ``tokens`` used.
+    """
+    week = week or week_label()
+    rows = await storage.get_drop_report_inputs(week)
+    stats = {
+        "matches": len(rows), "current": 0, "missing_dna": 0,
+        "generated": 0, "cached": 0, "fallback": 0, "retries": 0, "tokens": 0,
+    }
+
+    queue: asyncio.Queue[tuple[dict, str]] = asyncio.Queue()
+    for row in rows:
+        key = row_report_key(row)
+        if key is None:
+            stats["missing_dna"] += 1
+        elif row["report"] and row["report_key"] == LLM_KEY_PREFIX + key:
+            stats["current"] += 1
+        else:
+            queue.put_nowait((row, key))
+    if queue.empty():
+        return stats
+    if llm is None:
+        logger.info("No OpenAI API key configured, skipping LLM reports")
+        return stats
+
+    budget = TokenBudget(settings.llm_report_tokens_per_minute)
+    done: list[tuple[str, str, str]] = []
+
+    async def save() -> None:
+        nonlocal done
+        batch, done = done, []
+        if batch:
+            await storage.save_match_reports(batch)
+
+    async def worker() -> None:
+        while not queue.empty():
+            row, key = queue.get_nowait()
+            report, saved_key = await _generate(llm, budget, row, key, stats)
+            done.append((row["id"], report, saved_key))
+            if len(done) >= _SAVE_EVERY:
+                await save()
+
+    started = time.perf_counter()
+    workers = min(max(1, settings.llm_report_concurrency), queue.qsize())
+    try:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(workers):
+                group.create_task(worker())
+    finally:
+        # Keep the reports finished so far even if the run is cut short
+        await save()
+
+    logger.info(
+        "LLM reports for {}: {} generated ({} cached), {} fallback, "
+        "{} retries, {} tokens in {:.1f}s",
+        week, stats["generated"], stats["cached"], stats["fallback"], stats["retries"],
+        stats["tokens"], time.perf_counter() - started,
+    )
+    return stats
@@ -3,9 +3,7 @@
 import json
 import re
 
-from openai import AsyncOpenAI
-
-from src.core.config import settings
+from src.core.llm import LLMClient
 
 PARSE_PROMPT = """从以下简历文本中提取结构化信息，以 JSON 格式返回：
 
@@ -25,17 +23,18 @@ PARSE_PROMPT = """从以下简历文本中提取结构化信息，以 JSON 格
 """
 
 
-async def parse_resume_text(text: str) -> dict:
+async def parse_resume_text(text: str, llm: LLMClient | None) -> dict:
     """Parse resume text into structured profile data.
 
-    Uses OpenAI if API key is available, otherwise falls back to regex extraction.
+    Uses OpenAI if API key is available (``llm`` set), otherwise falls back
+    to regex extraction.
     """
-    if not settings.openai_api_key:
+    if llm is None:
         return _regex_extract(text)
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-    response = await client.chat.completions.create(
-        model=settings.openai_model,
+    response = await llm.chat(
+        "resume",
+        cache=True,
         messages=[
             {"role": "system", "content": "你是一个简历解析助手。只输出 JSON。"},
             {"role": "user", "content": PARSE_PROMPT + text[:3000]},
@@ -0,0 +1,227 @@
+"""Weekly scheduler — matching run, drop generation, LLM reports, once per drop week.
+
+The cycle runs at ``weekly_run_weekday`` / ``weekly_run_time`` (UTC) so the
+heavy work happens off peak, and catches up on start-up when that moment
+passed while the server was down. Several server processes may share one
+database: a lease on the ``scheduled_jobs`` row lets only one of them run
+the cycle, and the row records the last run so a restart does not repeat it.
+"""
+
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+
+from src.core.config import settings
+from src.core.llm import LLMClient
+from src.core.week import week_label, week_start
+from src.repositories.base import Storage
+from src.services.drop import generate_weekly_drops
+from src.services.matching_jobs import MatchingJobRunner
+from src.services.report_pipeline import generate_drop_reports
+
+JOB_NAME = "weekly_cycle"
+
+# Upper bound on one sleep, so a changed clock or a lost lease is noticed
+_POLL_SECONDS = 60
+
+
+def scheduled_at(now: datetime) -> datetime:
+    """This week's run time — possibly already in the past."""
+    hour, minute = (int(part) for part in settings.weekly_run_time.split(":"))
+    return week_start(now) + timedelta(
+        days=settings.weekly_run_weekday, hours=hour, minutes=minute,
+    )
+
+
+class WeeklyScheduler:
+    """Runs the weekly cycle in the background, at most once per drop week.
+
+    A week is identified by the label of its scheduled moment. A failed run
+    keeps its lease until the lease expires, which doubles as the retry
+    back-off.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        runner: MatchingJobRunner,
+        llm: LLMClient | None = None,
+    ) -> None:
+        self._storage = storage
+        self._runner = runner
+        self._llm = llm
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: asyncio.Task | None = None
+        self._state: dict = {}
+
+    async def start(self) -> None:
+        await self._storage.execute(
+            "INSERT INTO scheduled_jobs (name) VALUES (?) "
+            "ON CONFLICT (name) DO NOTHING",
+            (JOB_NAME,),
+        )
+        await self._load_state()
+        self._task = asyncio.create_task(self._run(), name="weekly-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _load_state(self) -> None:
+        row = await self._storage.fetchone(
+            "SELECT * FROM scheduled_jobs WHERE name = ?", (JOB_NAME,),
+        )
+        self._state = row or {}
+
+    async def _run(self) -> None:
+        while True:
+            now = datetime.now(tz=timezone.utc)
+            due_at = scheduled_at(now)
+            if now >= due_at and self._state.get("last_week") != week_label(due_at):
+                try:
+                    await self.run_once(week_label(due_at))
+                except Exception:
+                    logger.exception("Weekly cycle scheduling failed")
+                await self._load_state()
+                now = datetime.now(tz=timezone.utc)
+            wake_at = due_at if now < due_at else due_at + timedelta(weeks=1)
+            await asyncio.sleep(
+                min(max((wake_at - now).total_seconds(), 1), _POLL_SECONDS),
+            )
+
+    async def _acquire(self, week: str) -> bool:
+        """Take the lease for ``week`` unless it already ran or is leased."""
+        now = datetime.now(tz=timezone.utc)
+        expires = now + timedelta(seconds=settings.weekly_run_lease_seconds)
+        # RETURNING reports whether the row was taken; run in a transaction
+        # so it goes to the writer
+        async with self._storage.transaction() as tx:
+            taken = await tx.fetchall(
+                """
+                UPDATE scheduled_jobs
+                SET lease_owner = ?, lease_expires_at = ?, last_started_at = ?
+                WHERE name = ?
+                    AND (last_week IS NULL OR last_week != ?)
+                    AND (lease_owner IS NULL OR lease_expires_at < ?)
+                RETURNING name
+                """,
+                (
+                    self._owner, expires.isoformat(), now.isoformat(),
+                    JOB_NAME, week, now.isoformat(),
+                ),
+            )
+        return len(taken) == 1
+
+    async def _renew(self) -> None:
+        """Keep extending the lease while the cycle runs."""
+        while True:
+            await asyncio.sleep(settings.weekly_run_lease_seconds / 3)
+            expires = datetime.now(tz=timezone.utc) + timedelta(
+                seconds=settings.weekly_run_lease_seconds,
+            )
+            await self._storage.execute(
+                "UPDATE scheduled_jobs SET lease_expires_at = ? "
+                "WHERE name = ? AND lease_owner = ?",
+                (expires.isoformat(), JOB_NAME, self._owner),
+            )
+
+    async def run_once(self, week: str) -> dict | None:
+        """Run the weekly cycle for ``week`` if this process gets the lease.
+
+        Returns:
+            The run's result, or None when another process holds the lease
+            or ``week`` has already run.
+        """
+        if not await self._acquire(week):
+            return None
+
+        logger.info("Weekly cycle {} started", week)
+        renew = asyncio.create_task(self._renew())
+        try:
+            job = await self._runner.submit("top_k")
+            job = await self._runner.wait(job["id"])
+            if job["status"] != "completed":
+                msg = f"Matching job {job['id']} {job['status']}: {job['error']}"
+                raise RuntimeError(msg)
+            drops = await generate_weekly_drops(self._storage)
+            reports = (
+                await generate_drop_reports(self._storage, self._llm)
+                if self._llm is not None else None
+            )
+        except Exception as exc:
+            finished_at = datetime.now(tz=timezone.utc).isoformat()
+            await self._storage.execute(
+                "UPDATE scheduled_jobs SET last_status = 'failed', last_error = ?, "
+                "last_finished_at = ? WHERE name = ? AND lease_owner = ?",
+                (str(exc) or type(exc).__name__, finished_at, JOB_NAME, self._owner),
+            )
+            logger.exception("Weekly cycle {} failed", week)
+            return None
+        finally:
+            renew.cancel()
+
+        result = {
+            "matching_job": job["id"],
+            "matches_created": job["rows_written"],
+            **drops,
+            "reports": reports,
+        }
+        finished_at = datetime.now(tz=timezone.utc).isoformat()
+        await self._storage.execute(
+            """
+            UPDATE scheduled_jobs
+            SET last_week = ?, last_status = 'completed', last_error = NULL,
+                last_finished_at = ?, last_result = ?,
+                lease_owner = NULL, lease_expires_at = NULL
+            WHERE name = ? AND lease_owner = ?
+            """,
+            (week, finished_at, json.dumps(result), JOB_NAME, self._owner),
+        )
+        logger.info("Weekly cycle {} completed: {}", week, result)
+        return result
+
+    def metrics(self) -> dict:
+        now = datetime.now(tz=timezone.utc)
+        due_at = scheduled_at(now)
+        if now >= due_at and self._state.get("last_week") == week_label(due_at):
+            due_at += timedelta(weeks=1)
+        return {
+            "next_run_at": due_at.isoformat(),
+            "last_week": self._state.get("last_week"),
+            "last_status": self._state.get("last_status"),
+            "last_finished_at": self._state.get("last_finished_at"),
+        }
+
+
+_scheduler: WeeklyScheduler | None = None
+
+
+async def start_scheduler(
+    storage: Storage,
+    runner: MatchingJobRunner,
+    llm: LLMClient | None = None,
+) -> WeeklyScheduler:
+    global _scheduler
+    _scheduler = WeeklyScheduler(storage, runner, llm)
+    await _scheduler.start()
+    return _scheduler
+
+
+async def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
+
+
+def get_scheduler() -> WeeklyScheduler | None:
+    return _scheduler
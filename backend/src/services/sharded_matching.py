@@ -0,0 +1,232 @@
+"""Sharded matching — score candidate shards in worker processes, keep only top K.
+
+For populations too large for one core (or one (N, M) matrix), candidates are
+cut into shards and each shard is scored by a ``ProcessPoolExecutor`` worker.
+DNA matrices travel through ``multiprocessing.shared_memory`` rather than
+being pickled per task, and a worker returns just its shard's top-K pairs:
+
+- each candidate's best ``per_candidate`` roles — final, since a candidate
+  lives in exactly one shard;
+- each role's best ``per_role`` candidates within the shard — merged into the
+  global per-role top K by the parent.
+"""
+
+import multiprocessing
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.services.matching import (
+    batch_l1_filter,
+    batch_l2_compatibility,
+    select_top_k,
+)
+
+# Upper bound on shard x roles cells a worker scores at once (~8 bytes each)
+_SHARD_CELLS = 4_000_000
+
+
+@dataclass(frozen=True)
+class ShardedResult:
+    """Selected pairs of a sharded run, as parallel arrays."""
+
+    rows: np.ndarray     # candidate positions
+    cols: np.ndarray     # role positions
+    scores: np.ndarray   # int64 match scores
+    role_l1_passed: np.ndarray  # candidates passing L1, per role position
+
+    @property
+    def l1_passed(self) -> int:
+        return int(self.role_l1_passed.sum())
+
+
+# ── Worker side ─────────────────────────────────────────────────────
+
+_worker: dict = {}
+
+
+def _attach(name: str, shape: tuple[int, ...]) -> tuple[SharedMemory, np.ndarray]:
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _init_worker(
+    role_dna: tuple[str, tuple[int, ...]],
+    candidate_dna: tuple[str, tuple[int, ...]],
+    consistency: tuple[str, tuple[int, ...]],
+    roles: list[dict],
+) -> None:
+    """Attach the shared matrices once per worker process."""
+    for key, spec in (
+        ("role_dna", role_dna),
+        ("candidate_dna", candidate_dna),
+        ("consistency", consistency),
+    ):
+        shm, array = _attach(*spec)
+        _worker[f"{key}_shm"] = shm  # keep the mapping alive
+        _worker[key] = array
+    _worker["roles"] = roles
+
+
+def _score_shard(
+    start: int,
+    candidates: list[dict],
+    per_candidate: int,
+    per_role: int,
+) -> tuple[np.ndarray, ...]:
+    """Score candidates ``start:start+len(candidates)`` against every role.
+
+    Returns:
+        ``(rows, cols, scores, is_candidate_pick, is_role_pick, role_l1_passed)``
+        with global rows; the flags tell which top K each pair came from.
+    """
+    end = start + len(candidates)
+    eligible = batch_l1_filter(candidates, _worker["roles"])
+    scores = batch_l2_compatibility(
+        _worker["candidate_dna"][start:end],
+        _worker["role_dna"],
+        _worker["consistency"][start:end],
+    )
+    by_candidate = select_top_k(scores, eligible, per_candidate, 0)
+    by_role = select_top_k(scores, eligible, 0, per_role)
+    rows, cols = np.nonzero(by_candidate | by_role)
+    return (
+        rows + start,
+        cols,
+        scores[rows, cols],
+        by_candidate[rows, cols],
+        by_role[rows, cols],
+        eligible.sum(axis=0),
+    )
+
+
+# ── Parent side ─────────────────────────────────────────────────────
+
+
+def _share(array: np.ndarray) -> tuple[SharedMemory, tuple[str, tuple[int, ...]]]:
+    array = np.ascontiguousarray(array, dtype=np.float64)
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape)
+
+
+def _merge_role_picks(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    scores: np.ndarray,
+    per_role: int,
+) -> np.ndarray:
+    """Indices of each role's global top ``per_role`` among the shard picks."""
+    order = np.lexsort((-scores, cols))
+    sorted_cols = cols[order]
+    # Rank of each pick within its role: position minus the role's first index
+    first = np.searchsorted(sorted_cols, sorted_cols, side="left")
+    rank = np.arange(len(order)) - first
+    return order[rank < per_role]
+
+
+def sharded_top_k(
+    candidates: Sequence[dict],
+    roles: Sequence[dict],
+    candidate_dna: np.ndarray,
+    consistency: np.ndarray,
+    role_dna: np.ndarray,
+    per_candidate: int,
+    per_role: int,
+    workers: int,
+    shard_size: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> ShardedResult:
+    """Top-K selection over all candidate x role pairs using worker processes.
+
+    Selects the same pairs as ``select_top_k`` on the full score matrix (up
+    to ties at the cut-off) without ever materialising it.
+
+    Args:
+        candidates: Dicts with ``skills`` / ``location`` for L1.
+        roles: Dicts with ``skills`` / ``location`` / ``remote_policy``.
+        candidate_dna: (N, 8) matrix from ``pack_dna``.
+        consistency: (N,) candidate consistency scores.
+        role_dna: (M, 8) company DNA matrix, one row per role.
+        per_candidate: Pairs to keep per candidate.
+        per_role: Pairs to keep per role.
+        workers: Worker processes.
+        shard_size: Candidates per task; by default sized so a shard's
+            score matrix stays around ``_SHARD_CELLS`` cells.
+        progress: Optional ``(shards_done, shards_total)`` callback, called
+            as shards finish. It may raise to abort the run; queued shards
+            are then cancelled.
+    """
+    n_candidates, n_roles = len(candidates), len(roles)
+    if not n_candidates or not n_roles:
+        empty = np.empty(0, dtype=np.intp)
+        return ShardedResult(
+            empty, empty, np.empty(0, dtype=np.int64), np.zeros(n_roles, dtype=np.intp),
+        )
+
+    shard_size = shard_size or max(1, _SHARD_CELLS // n_roles)
+    l1_candidates = [
+        {"skills": c.get("skills"), "location": c.get("location")}
+        for c in candidates
+    ]
+    l1_roles = [
+        {
+            "skills": r.get("skills"),
+            "location": r.get("location"),
+            "remote_policy": r.get("remote_policy"),
+        }
+        for r in roles
+    ]
+
+    shared = [_share(role_dna), _share(candidate_dna), _share(consistency)]
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max(1, workers),
+            # spawn: the parent runs an event loop and database threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(*(spec for _, spec in shared), l1_roles),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _score_shard, start, l1_candidates[start:start + shard_size],
+                    per_candidate, per_role,
+                )
+                for start in range(0, n_candidates, shard_size)
+            ]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    if progress is not None:
+                        progress(done, len(futures))
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+            parts = [future.result() for future in futures]
+    finally:
+        for shm, _ in shared:
+            shm.close()
+            shm.unlink()
+
+    rows = np.concatenate([p[0] for p in parts])
+    cols = np.concatenate([p[1] for p in parts])
+    scores = np.concatenate([p[2] for p in parts])
+    is_candidate_pick = np.concatenate([p[3] for p in parts])
+    is_role_pick = np.concatenate([p[4] for p in parts])
+
+    # A shard's per-candidate picks are final; per-role picks compete globally
+    keep = is_candidate_pick.copy()
+    role_picks = np.flatnonzero(is_role_pick)
+    keep[role_picks[_merge_role_picks(
+        rows[role_picks], cols[role_picks], scores[role_picks], per_role,
+    )]] = True
+
+    return ShardedResult(
+        rows=rows[keep],
+        cols=cols[keep],
+        scores=scores[keep],
+        role_l1_passed=np.sum([p[5] for p in parts], axis=0),
+    )
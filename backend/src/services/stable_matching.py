@@ -0,0 +1,104 @@
+"""L5 stable matching — capacity-constrained deferred acceptance over scored pairs.
+
+Greedy drops (each candidate's top 3, each role's top 5) let a popular role
+appear in every candidate's drop while weaker roles reach nobody. Deferred
+acceptance (Gale–Shapley, candidates proposing) allocates the drop slots
+instead: every candidate holds at most ``candidate_capacity`` roles, every
+role at most ``role_capacity`` candidates, and no candidate and role both
+prefer each other to what they were given.
+
+Pairs are passed as parallel arrays — one entry per scored (candidate, role)
+pair, e.g. this week's pending matches — so only pairs that exist are ever
+considered. Candidates' preference lists are one array sorted by candidate,
+then score; each role keeps a min-heap of the candidates it tentatively
+holds, so a proposal is compared against the weakest of them in O(1) and
+replaces it in O(log capacity).
+"""
+
+import heapq
+
+import numpy as np
+
+
+def deferred_acceptance(
+    candidates: np.ndarray,
+    roles: np.ndarray,
+    candidate_scores: np.ndarray,
+    role_scores: np.ndarray | None = None,
+    *,
+    candidate_capacity: int,
+    role_capacity: int,
+) -> np.ndarray:
+    """Candidate-proposing many-to-many deferred acceptance.
+
+    Args:
+        candidates: (P,) candidate position of each pair, in ``0..N-1``.
+        roles: (P,) role position of each pair, in ``0..M-1``. A (candidate,
+            role) pair must appear at most once.
+        candidate_scores: (P,) how much the candidate wants the role.
+        role_scores: (P,) how much the role wants the candidate; defaults to
+            ``candidate_scores`` (both sides rank by the match score).
+        candidate_capacity: Most roles a candidate is assigned.
+        role_capacity: Most candidates a role is assigned.
+
+    Returns:
+        (P,) bool mask of the assigned pairs — a stable assignment that is
+        the best one for every candidate. Ties on either side go to the
+        pair that comes first in the input.
+    """
+    n_pairs = len(candidates)
+    assigned = np.zeros(n_pairs, dtype=bool)
+    if not n_pairs or candidate_capacity <= 0 or role_capacity <= 0:
+        return assigned
+
+    candidates = np.asarray(candidates, dtype=np.intp)
+    roles = np.asarray(roles, dtype=np.intp)
+    if role_scores is None:
+        role_scores = candidate_scores
+
+    # Preference lists: pairs grouped by candidate, best role first
+    order = np.lexsort((np.arange(n_pairs), -np.asarray(candidate_scores), candidates))
+    n_candidates = int(candidates.max()) + 1
+    bounds = np.searchsorted(candidates[order], np.arange(n_candidates + 1))
+
+    # Plain lists: the loop below is per proposal, NumPy scalars would dominate
+    prefs = order.tolist()
+    nxt = bounds[:-1].tolist()
+    end = bounds[1:].tolist()
+    owner = candidates.tolist()
+    target = roles.tolist()
+    # Heap key: (role's score, -pair) so earlier pairs win ties
+    key = list(zip(np.asarray(role_scores).tolist(), (-np.arange(n_pairs)).tolist()))
+
+    held = [0] * n_candidates
+    heaps: list[list[tuple[float, int]]] = [[] for _ in range(int(roles.max()) + 1)]
+    free = [c for c in range(n_candidates) if nxt[c] < end[c]]
+    queued = [False] * n_candidates
+    for c in free:
+        queued[c] = True
+
+    while free:
+        c = free.pop()
+        queued[c] = False
+        while held[c] < candidate_capacity and nxt[c] < end[c]:
+            pair = prefs[nxt[c]]
+            nxt[c] += 1
+            heap = heaps[target[pair]]
+            if len(heap) < role_capacity:
+                heapq.heappush(heap, key[pair])
+            elif key[pair] > heap[0]:
+                # The role drops its weakest candidate, who proposes again
+                rejected = -heapq.heapreplace(heap, key[pair])[1]
+                loser = owner[rejected]
+                held[loser] -= 1
+                if not queued[loser] and nxt[loser] < end[loser]:
+                    queued[loser] = True
+                    free.append(loser)
+            else:
+                continue
+            held[c] += 1
+
+    for heap in heaps:
+        for _, neg_pair in heap:
+            assigned[-neg_pair] = True
+    return assigned
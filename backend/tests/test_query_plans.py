@@ -0,0 +1,225 @@
+"""No query the storage layer runs may fall back to a full table scan.
+
+Every statement a ``SQLiteStorage`` executes goes through its connection
+executor, which is patched here to run ``EXPLAIN QUERY PLAN`` on the same
+connection first. The seed script and the services are then driven over a
+scratch database, so the plans checked are those of the SQL that actually
+runs — not copies of it.
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from src.core.config import settings
+from src.core.deps import close_db, close_storage, init_db, init_storage
+from src.core.week import week_label
+from src.models.database import create_tables
+from src.models.dna_score import DimensionScores, encode_dna
+from src.repositories import sqlite
+from src.repositories.base import Storage
+from src.seed import seed
+from src.services.chat_context import load_context
+from src.services.drop import (
+    generate_candidate_drop,
+    generate_company_drop,
+    generate_weekly_drops,
+    get_current_drop,
+    slot_new_matches,
+)
+from src.services.incremental import rescore
+from src.services.matching_jobs import MatchingJobRunner
+from src.services.report_cache import ensure_report
+from src.services.scheduler import WeeklyScheduler
+
+# Statements that read a whole table by design, and why
+FULL_READS = {
+    "WHERE r.is_active = 1\n": "every active role, for the weekly matching run",
+    "FROM users WHERE role = 'candidate'": "funnel fallback before a matching run",
+    "SUM(size) OVER": "eviction walks the cache oldest first",
+    "COUNT(*) AS entries": "cache totals left after an eviction",
+}
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b)(\w+)", re.I)
+
+
+class PlanLog:
+    """The plans of every statement run, keyed by SQL."""
+
+    def __init__(self) -> None:
+        self.plans: dict[str, list[str]] = {}
+
+    async def explain(self, conn, sql: str, params) -> None:
+        if sql in self.plans or not sql.lstrip().upper().startswith(
+            ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT"),
+        ):
+            return
+        cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        self.plans[sql] = [row[3] for row in await cursor.fetchall()]
+
+    def table_scans(self, tables: set[str]) -> dict[str, list[str]]:
+        """Statements whose plan scans one of ``tables`` (by name or alias)."""
+        scans = {}
+        for sql, plan in self.plans.items():
+            names = {table: table for table in tables}
+            for table, alias in _ALIAS.findall(sql):
+                names.setdefault(alias, table)
+            found = [
+                line for line in plan
+                if (m := _SCAN.match(line)) and names.get(m.group(1)) in tables
+            ]
+            if found:
+                scans[sql] = found
+        return scans
+
+
+@pytest.fixture
+def plan_log(monkeypatch, tmp_path: Path) -> PlanLog:
+    log = PlanLog()
+    executor = sqlite._ConnectionExecutor
+
+    def explained(method):
+        async def run(self, sql, params=()):
+            first = params[0] if method.__name__ == "executemany" and params else params
+            await log.explain(self._conn, sql, first)
+            return await method(self, sql, params)
+        return run
+
+    for name in ("fetchone", "fetchall", "execute", "executemany"):
+        monkeypatch.setattr(executor, name, explained(getattr(executor, name)))
+    monkeypatch.setattr(settings, "database_url", str(tmp_path / "plans.db"))
+    monkeypatch.setattr(settings, "log_dir", str(tmp_path / "logs"))
+    return log
+
+
+async def _exercise(storage: Storage) -> None:
+    """Run the storage methods and the services that issue SQL of their own."""
+    week = week_label()
+    candidate = (await storage.get_user_by_email("alex@example.com"))["id"]
+    hr = await storage.get_user_by_email("hr@velocity-labs.example.com")
+    company = hr["company_id"]
+    await storage.get_user(candidate)
+    await storage.get_company(company)
+
+    # Matching: a full run, then incremental rescores of each kind
+    runner = MatchingJobRunner(storage)
+    await runner.start()
+    job = await runner.submit("top_k")
+    await runner.wait(job["id"])
+    await runner.get(job["id"])
+    await runner.stop()
+
+    role_id = await storage.create_role(company, {
+        "title": "Backend", "level": "senior",
+        "skills": json.dumps(["Python"]), "nice_to_have": json.dumps([]),
+        "salary_range": json.dumps({}), "location": "Remote",
+        "remote_policy": "remote", "description": "",
+    })
+    await storage.update_role(role_id, {"location": "Remote"})
+    await storage.get_role(role_id)
+    await storage.list_active_roles(company)
+    await storage.get_role_funnel(role_id)
+    for kind, entity_id in (
+        ("candidate", candidate), ("role", role_id), ("company", company),
+    ):
+        async with storage.transaction() as tx:
+            await rescore(tx, kind, entity_id)
+
+    # Answers, DNA and profiles
+    scores = DimensionScores(
+        pace=50, collab=50, decision=50, expression=50, unc=50,
+        growth=50, motiv=50, execution=50,
+    )
+    await storage.save_dna_score(
+        "candidate", candidate, scores.model_dump_json(), encode_dna(scores), 1.0,
+    )
+    await storage.get_dna_score("candidate", candidate)
+    await storage.add_career_answers(candidate, "[]")
+    await storage.add_company_answers(hr["id"], company, "[]")
+    await storage.list_company_answers(company)
+    await storage.get_profile(candidate)
+    await storage.save_profile(candidate, {"title": "Engineer"}, add_skills=["Go"])
+
+    # Chat
+    for i in range(4):
+        await storage.add_chat_message(candidate, "user", f"message {i}")
+    context = await load_context(storage, candidate)
+    await storage.list_chat_messages(candidate)
+    await storage.list_chat_messages_after(candidate, None, 2)
+    await storage.save_chat_summary(candidate, "summary", "0")
+    del context
+
+    # Drops: the weekly run, then lazy drops and new matches slotted in
+    await generate_weekly_drops(storage)
+    await storage.week_drop_targets(week)
+    await slot_new_matches(storage, week)
+    for target_type, target_id in (("candidate", candidate), ("company", company)):
+        drop = await get_current_drop(storage, target_id, target_type)
+        assert drop is not None
+    other = (await storage.get_user_by_email("maria@example.com"))
+    if other:
+        try:
+            await generate_candidate_drop(storage, other["id"])
+        except ValueError:
+            pass
+    try:
+        await generate_company_drop(storage, company)
+    except ValueError:
+        pass
+
+    # Matches and their reports
+    [match] = (await storage.list_company_matches(company))[:1]
+    await storage.get_match(match["id"])
+    await ensure_report(storage, match["id"])
+    await storage.get_drop_report_inputs(week)
+    await storage.save_match_reports([("report", "key", match["id"])])
+    await storage.set_match_action(match["id"], "candidate", "accept", "candidate_accepted")
+    await storage.pending_matches(week)
+    await storage.list_drop_slots(week, candidate_id=candidate)
+
+    # LLM response cache
+    await storage.save_llm_response("key", "model", "{}", 1)
+    await storage.get_llm_response("key", "")
+    await storage.mark_llm_responses_used([("now", 1, "key")])
+    await storage.evict_llm_responses("", 1 << 20)
+
+    # Weekly scheduler lease
+    scheduler = WeeklyScheduler(storage, MatchingJobRunner(storage))
+    await scheduler.start()
+    await scheduler.stop()
+    await scheduler._acquire(week)
+
+
+async def _run() -> set[str]:
+    await seed()
+    await create_tables(await init_db(settings.database_url))
+    storage = await init_storage(settings.database_url)
+    try:
+        await _exercise(storage)
+        rows = await storage.fetchall("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return {row["name"] for row in rows}
+    finally:
+        await close_storage()
+        await close_db()
+
+
+def test_no_service_query_scans_a_table(plan_log: PlanLog) -> None:
+    scans = plan_log.table_scans(asyncio.run(_run()))
+
+    unexpected = {
+        sql: plan for sql, plan in scans.items()
+        if not any(marker in sql for marker in FULL_READS)
+    }
+    assert not unexpected, "\n\n".join(
+        f"{sql.strip()}\n  -> {'; '.join(plan)}" for sql, plan in unexpected.items()
+    )
+    # Each allowance must still match a statement that ran
+    unused = [
+        marker for marker in FULL_READS
+        if not any(marker in sql for sql in plan_log.plans)
+    ]
+    assert not unused, f"FULL_READS entries no longer used: {unused}"
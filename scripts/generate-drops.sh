@@ -0,0 +1,9 @@
+#!/bin/bash
+set -e
+
+cd "$(dirname "$0")/../backend"
+
+echo "Generating this week's drops..."
+uv run python -m src.drops
+
+echo "Drops generated successfully!"